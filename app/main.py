@@ -10,6 +10,8 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from .routers.audit import router as audit_router
+from .routers.finops import router as finops_router
 from .routers.memory import router as memory_router
 from .routers.metrics import router as metrics_router
 from .routers.pii import router as pii_router
@@ -38,14 +40,89 @@ logger = get_logger(level=LOG_LEVEL)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info({"event": "startup", "env": APP_ENV})
-    # Initialize DB tables
+    # Create/migrate the audit schema once; requests never touch DDL
     try:
         from db.session import init_db
 
         init_db()
     except Exception as e:
         logger.error({"event": "db_init_error", "error": str(e)})
+    # Batched audit writer (AUDIT_ASYNC); requests write audit rows inline without it
+    try:
+        from app.utils.audit import start_audit_writer
+
+        start_audit_writer()
+    except Exception as e:
+        logger.error({"event": "audit_writer_start_error", "error": str(e)})
+    # Memory background workers, only for the memory kinds that are enabled: their
+    # first tick would otherwise create and sweep stores nobody uses
+    try:
+        from app.memory.long_memory import (
+            get_long_memory_enabled,
+            start_backfill_worker,
+            start_sweep_worker,
+        )
+
+        if get_long_memory_enabled():
+            # embedding backfill and retention sweep
+            start_backfill_worker()
+            start_sweep_worker()
+    except Exception as e:
+        logger.error({"event": "memory_workers_start_error", "error": str(e)})
+    try:
+        from app.memory.short_memory import (
+            get_short_memory_enabled,
+            start_compaction_worker,
+            start_write_behind,
+        )
+        from app.memory.short_memory import start_sweep_worker as start_short_sweep
+
+        if get_short_memory_enabled():
+            start_short_sweep()
+            start_write_behind()
+            start_compaction_worker()
+    except Exception as e:
+        logger.error({"event": "memory_workers_start_error", "error": str(e)})
     yield
+    try:
+        from app.memory.long_memory import stop_backfill_worker, stop_sweep_worker
+
+        stop_backfill_worker()
+        stop_sweep_worker()
+    except Exception as e:
+        logger.error({"event": "memory_workers_stop_error", "error": str(e)})
+    try:
+        from app.memory.short_memory import (
+            close_short_memory,
+            stop_compaction_worker,
+            stop_write_behind,
+        )
+        from app.memory.short_memory import stop_sweep_worker as stop_short_sweep
+        from app.memory.short_memory_async import shutdown_async_short_memory
+
+        # let in-flight async memory calls finish before stopping the workers
+        shutdown_async_short_memory()
+        stop_compaction_worker()
+        stop_short_sweep()
+        # drain buffered turns before the connections go away
+        stop_write_behind()
+        close_short_memory()
+    except Exception as e:
+        logger.error({"event": "short_memory_close_error", "error": str(e)})
+    try:
+        from app.services.llm_pool import aclose_llm_clients, close_llm_clients
+
+        close_llm_clients()
+        await aclose_llm_clients()
+    except Exception as e:
+        logger.error({"event": "llm_clients_close_error", "error": str(e)})
+    try:
+        from app.utils.audit import stop_audit_writer
+
+        # drain queued audit rows last, after every request has finished
+        stop_audit_writer()
+    except Exception as e:
+        logger.error({"event": "audit_writer_stop_error", "error": str(e)})
     logger.info({"event": "shutdown"})
 
 
@@ -130,6 +207,8 @@ app.include_router(predict_router)
 app.include_router(pii_router)
 app.include_router(risk_router)
 app.include_router(memory_router)
+app.include_router(finops_router)
+app.include_router(audit_router)
 app.include_router(policy_router)
 app.include_router(pii_remediation_router)
 app.include_router(architect_router)
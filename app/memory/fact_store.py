@@ -0,0 +1,282 @@
+"""
+Compact per-user storage for long-term memory facts.
+
+Facts are slotted records; embeddings live as rows of one numpy matrix per user
+(float32 by default, optionally float16 or int8-quantized) instead of per-fact
+lists of Python floats. Vectors are L2-normalized on insert so cosine similarity
+is a single matrix-vector product. A small inverted index over fact text provides
+lexical candidates for hybrid search.
+"""
+import bisect
+import heapq
+import math
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+_DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was "
+    "were will with you your we our can should".split()
+)
+
+
+def tokenize(text: str) -> Set[str]:
+    """Lowercased word tokens; compound ids like ``ABC-123`` also yield their parts."""
+    tokens: Set[str] = set()
+    for m in _TOKEN_RE.findall((text or "").lower()):
+        tokens.add(m)
+        if not m.isalnum():
+            tokens.update(p for p in re.split(r"[-_.]", m) if p)
+    return {t for t in tokens if len(t) > 1 and t not in _STOPWORDS}
+
+
+def get_embedding_dtype() -> str:
+    name = os.getenv("MEMORY_LONG_EMBEDDING_DTYPE", "float32").lower()
+    return name if name in _DTYPES else "float32"
+
+
+class Fact:
+    __slots__ = ("id", "text", "created_at", "metadata", "row")
+
+    def __init__(
+        self,
+        id: str,
+        text: str,
+        created_at: float,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.id = id
+        self.text = text
+        self.created_at = created_at
+        # empty metadata is stored as None to avoid one dict per fact
+        self.metadata = metadata or None
+        # row in the owning store's embedding matrix, None while vectorless
+        self.row: Optional[int] = None
+
+    def to_dict(self, embedding: Optional[List[float]] = None) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "text": self.text,
+            "metadata": dict(self.metadata or {}),
+            "embedding": embedding,
+            "created_at": self.created_at,
+        }
+
+
+class UserFactStore:
+    """Facts of a single user in creation-time order plus their embedding matrix."""
+
+    _INITIAL_ROWS = 16
+
+    def __init__(self, dtype: Optional[str] = None):
+        self.dtype = dtype or get_embedding_dtype()
+        self.facts: List[Fact] = []
+        self.by_id: Dict[str, Fact] = {}
+        self.dim: Optional[int] = None
+        self._matrix: Optional[np.ndarray] = None
+        # per-row dequantization scale (int8 only)
+        self._scales: Optional[np.ndarray] = None
+        self._used = np.zeros(0, dtype=bool)
+        self._free: List[int] = []
+        self._high = 0  # rows [0, _high) have ever been allocated
+        # token -> facts containing it
+        self._postings: Dict[str, Set[Fact]] = {}
+        # matrix row -> fact owning it
+        self._row_facts: Dict[int, Fact] = {}
+
+    def __len__(self) -> int:
+        return len(self.facts)
+
+    def __iter__(self) -> Iterator[Fact]:
+        return iter(list(self.facts))
+
+    def __bool__(self) -> bool:
+        return bool(self.facts)
+
+    def get(self, fact_id: str) -> Optional[Fact]:
+        return self.by_id.get(fact_id)
+
+    def append(self, fact: Fact, vec: Optional[List[float]] = None) -> None:
+        # keep facts sorted by created_at so expiry is a prefix of the list
+        if self.facts and fact.created_at < self.facts[-1].created_at:
+            fact.created_at = self.facts[-1].created_at
+        self.facts.append(fact)
+        self.by_id[fact.id] = fact
+        for tok in tokenize(fact.text):
+            self._postings.setdefault(tok, set()).add(fact)
+        if vec is not None:
+            self.set_vector(fact, vec)
+
+    def touch(self, fact: Fact, created_at: float) -> None:
+        """Refresh a fact's timestamp, moving it to the end of the time order."""
+        self.facts.remove(fact)
+        fact.created_at = created_at
+        if self.facts and fact.created_at < self.facts[-1].created_at:
+            fact.created_at = self.facts[-1].created_at
+        self.facts.append(fact)
+
+    def expired_count(self, cutoff: float) -> int:
+        """Number of facts created before ``cutoff`` (binary search over the time order)."""
+        return bisect.bisect_left(self.facts, cutoff, key=lambda f: f.created_at)
+
+    def remove(self, fact: Fact) -> None:
+        self.facts.remove(fact)
+        self._drop(fact)
+
+    def pop_oldest(self, count: int = 1) -> List[Fact]:
+        dropped = self.facts[:count]
+        del self.facts[:count]
+        for f in dropped:
+            self._drop(f)
+        return dropped
+
+    def _drop(self, fact: Fact) -> None:
+        self.by_id.pop(fact.id, None)
+        for tok in tokenize(fact.text):
+            posting = self._postings.get(tok)
+            if posting is not None:
+                posting.discard(fact)
+                if not posting:
+                    del self._postings[tok]
+        if fact.row is not None:
+            self._used[fact.row] = False
+            self._row_facts.pop(fact.row, None)
+            self._free.append(fact.row)
+            fact.row = None
+
+    def _grow(self, dim: int) -> None:
+        np_dtype = _DTYPES[self.dtype]
+        if self._matrix is None:
+            cap = self._INITIAL_ROWS
+            self._matrix = np.zeros((cap, dim), dtype=np_dtype)
+            self._scales = np.ones(cap, dtype=np.float32) if self.dtype == "int8" else None
+            self._used = np.zeros(cap, dtype=bool)
+            self.dim = dim
+            return
+        cap = self._matrix.shape[0] * 2
+        matrix = np.zeros((cap, dim), dtype=np_dtype)
+        matrix[: self._high] = self._matrix[: self._high]
+        self._matrix = matrix
+        used = np.zeros(cap, dtype=bool)
+        used[: self._high] = self._used[: self._high]
+        self._used = used
+        if self._scales is not None:
+            scales = np.ones(cap, dtype=np.float32)
+            scales[: self._high] = self._scales[: self._high]
+            self._scales = scales
+
+    def _alloc_row(self, dim: int) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._matrix is None or self._high >= self._matrix.shape[0]:
+            self._grow(dim)
+        row = self._high
+        self._high += 1
+        return row
+
+    def set_vector(self, fact: Fact, vec: List[float]) -> bool:
+        v = np.asarray(vec, dtype=np.float32)
+        if v.ndim != 1 or not v.size:
+            return False
+        if self.dim is not None and v.size != self.dim:
+            # provider/model changed dimension; keep the fact vectorless
+            return False
+        norm = float(np.linalg.norm(v))
+        if norm:
+            v = v / norm
+        if fact.row is None:
+            fact.row = self._alloc_row(v.size)
+            self._row_facts[fact.row] = fact
+        assert self._matrix is not None
+        if self.dtype == "int8":
+            scale = float(np.abs(v).max()) / 127.0 or 1.0
+            self._matrix[fact.row] = np.round(v / scale).astype(np.int8)
+            assert self._scales is not None
+            self._scales[fact.row] = scale
+        else:
+            self._matrix[fact.row] = v
+        self._used[fact.row] = True
+        return True
+
+    def vector(self, fact: Fact) -> Optional[List[float]]:
+        """Dequantized (unit-length) vector of a fact, or None when vectorless."""
+        if fact.row is None or self._matrix is None:
+            return None
+        row = self._matrix[fact.row].astype(np.float32)
+        if self._scales is not None:
+            row = row * self._scales[fact.row]
+        return row.tolist()
+
+    def scores(self, query_vec: List[float]) -> Dict[int, float]:
+        """Cosine similarity of ``query_vec`` against every stored vector, keyed by row."""
+        if self._matrix is None or not self._high:
+            return {}
+        q = np.asarray(query_vec, dtype=np.float32)
+        if q.size != self.dim:
+            return {}
+        qn = float(np.linalg.norm(q))
+        if not qn:
+            return {}
+        q = q / qn
+        rows = np.flatnonzero(self._used[: self._high])
+        if not rows.size:
+            return {}
+        sims = self._matrix[rows].astype(np.float32) @ q
+        if self._scales is not None:
+            sims = sims * self._scales[rows]
+        return dict(zip(rows.tolist(), sims.tolist()))
+
+    def nearest(self, query_vec: List[float]) -> Optional[Tuple[Fact, float]]:
+        """Most similar stored fact to ``query_vec`` and its cosine similarity."""
+        sims = self.scores(query_vec)
+        if not sims:
+            return None
+        row = max(sims, key=sims.__getitem__)
+        return self._row_facts[row], sims[row]
+
+    def scores_for(self, facts: List[Fact], query_vec: List[float]) -> List[float]:
+        """Cosine similarity for a shortlist of facts; vectorless facts score 0."""
+        out = [0.0] * len(facts)
+        if self._matrix is None or not facts:
+            return out
+        q = np.asarray(query_vec, dtype=np.float32)
+        qn = float(np.linalg.norm(q)) if q.size == self.dim else 0.0
+        if not qn:
+            return out
+        q = q / qn
+        idx = [i for i, f in enumerate(facts) if f.row is not None]
+        if not idx:
+            return out
+        rows = np.asarray([facts[i].row for i in idx], dtype=np.int64)
+        sims = self._matrix[rows].astype(np.float32) @ q
+        if self._scales is not None:
+            sims = sims * self._scales[rows]
+        for i, s in zip(idx, sims.tolist()):
+            out[i] = s
+        return out
+
+    def lexical_candidates(self, query: str, limit: int) -> List[Tuple[Fact, float]]:
+        """Facts sharing tokens with ``query`` ranked by an IDF-weighted overlap score."""
+        n = len(self.facts)
+        scores: Dict[Fact, float] = {}
+        for tok in tokenize(query):
+            posting = self._postings.get(tok)
+            if not posting:
+                continue
+            df = len(posting)
+            idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+            for f in posting:
+                scores[f] = scores.get(f, 0.0) + idf
+        return heapq.nlargest(limit, scores.items(), key=lambda x: x[1])
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the embedding matrix."""
+        if self._matrix is None:
+            return 0
+        extra = self._scales.nbytes if self._scales is not None else 0
+        return int(self._matrix.nbytes + extra + self._used.nbytes)
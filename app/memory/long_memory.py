@@ -1,18 +1,43 @@
+import base64
 import hashlib
 import os
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, Iterable, Iterator, List
 
+import numpy as np
+
+from app.memory.fact_store import Fact, UserFactStore, tokenize
 from app.services.rag_retriever import LocalEmbeddings, OpenAIEmbeddings, StubEmbeddings
+from app.utils.background import PeriodicWorker
 
 # Legacy embeddings removed; using simple cosine over in-process store
 from app.utils.logger import get_logger
+from app.utils.metrics import (
+    memory_long_dedup_merged,
+    memory_long_embedding_backlog,
+    memory_long_embeddings_backfilled,
+)
 
 logger = get_logger(__name__)
 
 PREFIX = os.getenv("MEMORY_COLLECTION_PREFIX", "memory")
 
 # Fallback in-memory store to avoid external dependency in tests/CI
-_FACT_STORE: dict[str, list[dict[str, Any]]] = {}
+_FACT_STORE: dict[str, UserFactStore] = {}
+# Guards _FACT_STORE mutations shared between request threads and the backfill worker
+_STORE_LOCK = threading.RLock()
+# (user_id, fact_id) pairs stored without a vector, awaiting the backfill worker
+_PENDING_EMBEDDINGS: set[tuple[str, str]] = set()
+_backfill_worker: PeriodicWorker | None = None
+_sweep_worker: PeriodicWorker | None = None
+# Stats of the background retention sweeper, surfaced by /memory/status
+_SWEEP_STATS: Dict[str, Any] = {
+    "sweeps": 0,
+    "pruned_total": 0,
+    "last_pruned": 0,
+    "last_duration_ms": None,
+    "last_run_at": None,
+}
 
 
 def _get_embedder():
@@ -24,52 +49,130 @@ def _get_embedder():
     return LocalEmbeddings()
 
 
-def retrieve_facts(user_id: str, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
-    # naive similarity via cosine on local embeddings if available
-    facts = _FACT_STORE.get(user_id, [])
-    if not facts:
-        retrieve_facts._last_pruned = 0  # type: ignore[attr-defined]
-        return []
-    # prune by retention days if configured
-    pruned = 0
-    retention_days = int(os.getenv("MEMORY_LONG_RETENTION_DAYS", "0"))
-    if retention_days and retention_days > 0:
+def get_long_memory_enabled() -> bool:
+    return os.getenv("MEMORY_LONG_ENABLED", "false").lower() in ("1", "true", "yes", "on")
+
+
+def get_backfill_interval() -> float:
+    return float(os.getenv("MEMORY_LONG_BACKFILL_INTERVAL_SEC", "30"))
+
+
+def get_backfill_batch_size() -> int:
+    return int(os.getenv("MEMORY_LONG_BACKFILL_BATCH", "64"))
+
+
+def _set_pending(user_id: str, fact_id: str, pending: bool) -> None:
+    key = (user_id, fact_id)
+    if pending:
+        _PENDING_EMBEDDINGS.add(key)
+    else:
+        _PENDING_EMBEDDINGS.discard(key)
+    memory_long_embedding_backlog.set(len(_PENDING_EMBEDDINGS))
+
+
+def _fact_dict(store: UserFactStore, fact: Fact) -> Dict[str, Any]:
+    return fact.to_dict(store.vector(fact))
+
+
+def get_retention_days() -> int:
+    return int(os.getenv("MEMORY_LONG_RETENTION_DAYS", "0"))
+
+
+def get_sweep_interval() -> float:
+    return float(os.getenv("MEMORY_LONG_SWEEP_INTERVAL_SEC", "300"))
+
+
+def _retention_cutoff() -> float | None:
+    days = get_retention_days()
+    if days and days > 0:
         import time
 
-        cutoff = time.time() - (retention_days * 86400)
-        before = len(facts)
-        facts = [f for f in facts if f.get("created_at", 0) >= cutoff]
-        pruned += before - len(facts)
-        _FACT_STORE[user_id] = facts
+        return time.time() - (days * 86400)
+    return None
+
+
+def get_search_mode() -> str:
+    mode = os.getenv("MEMORY_LONG_SEARCH_MODE", "hybrid").lower()
+    return mode if mode in ("hybrid", "vector") else "hybrid"
+
+
+def get_hybrid_alpha() -> float:
+    return float(os.getenv("MEMORY_LONG_HYBRID_ALPHA", "0.5"))
+
+
+def get_hybrid_shortlist() -> int:
+    return int(os.getenv("MEMORY_LONG_HYBRID_SHORTLIST", "100"))
+
+
+def get_dedup_threshold() -> float:
+    return float(os.getenv("MEMORY_LONG_DEDUP_THRESHOLD", "0"))
+
+
+def _shortlist(
+    store: UserFactStore, query: str, start: int, cutoff: float | None, size: int
+) -> Dict[Fact, float]:
+    """Candidates for dense scoring: lexical hits first, padded with the most recent facts."""
+    cands: Dict[Fact, float] = {}
+    for f, lex in store.lexical_candidates(query, size * 2):
+        if len(cands) >= size:
+            break
+        if cutoff is not None and f.created_at < cutoff:
+            continue  # expired, awaiting the retention sweeper
+        cands[f] = lex
+    for f in reversed(store.facts[start:]):
+        if len(cands) >= size:
+            break
+        cands.setdefault(f, 0.0)
+    return cands
+
+
+def retrieve_facts(user_id: str, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    # Hybrid search: candidates come from the user's inverted index (padded with
+    # recent facts), then only that shortlist is scored against the embedding
+    # matrix and the two scores are fused. MEMORY_LONG_SEARCH_MODE=vector scores all facts.
+    # Expired facts are skipped via a binary search on the time-ordered list;
+    # removing them is left to the background retention sweeper.
+    retrieve_facts._last_pruned = 0  # type: ignore[attr-defined]
+    store = _FACT_STORE.get(user_id)
+    if not store:
+        return []
+    cutoff = _retention_cutoff()
     emb = _get_embedder()
     try:
         qvec = emb.embed([query])[0]
     except Exception:
-        retrieve_facts._last_pruned = pruned  # type: ignore[attr-defined]
-        # If embeddings fail, just return recent facts
-        return facts[:top_k]
-
-    def cos(a, b):
-        import math
-
-        num = sum(x * y for x, y in zip(a, b))
-        da = math.sqrt(sum(x * x for x in a))
-        db = math.sqrt(sum(y * y for y in b))
-        return (num / (da * db)) if da and db else 0.0
-
-    scored = []
-    for f in facts:
-        vec = f.get("embedding")
-        if not vec:
-            try:
-                vec = emb.embed([f["text"]])[0]
-            except Exception:
-                vec = None
-        score = cos(qvec, vec) if vec else 0.0
-        scored.append((score, f))
-    scored.sort(key=lambda x: x[0], reverse=True)
-    retrieve_facts._last_pruned = pruned  # type: ignore[attr-defined]
-    return [f for _, f in scored[:top_k]]
+        qvec = None
+
+    mode = get_search_mode()
+    alpha = get_hybrid_alpha()
+    with _STORE_LOCK:
+        start = store.expired_count(cutoff) if cutoff is not None else 0
+        if mode == "vector":
+            cands = {f: 0.0 for f in store.facts[start:]}
+            alpha = 1.0
+        else:
+            size = max(top_k, get_hybrid_shortlist())
+            cands = _shortlist(store, query, start, cutoff, size)
+        facts = list(cands.keys())
+        if qvec is None:
+            # If embeddings fail, rank by lexical score (recent facts as tie-break)
+            dense = [0.0] * len(facts)
+            alpha = 0.0
+        else:
+            dense = store.scores_for(facts, qvec)
+        max_lex = max(cands.values(), default=0.0) or 1.0
+        scored = [
+            (alpha * d + (1.0 - alpha) * (cands[f] / max_lex), f)
+            for d, f in zip(dense, facts)
+        ]
+        missing = any(f.row is None for f in facts)
+        scored.sort(key=lambda x: x[0], reverse=True)
+        result = [_fact_dict(store, f) for _, f in scored[:top_k]]
+    # Facts still waiting on the backfill worker score 0 on the dense side
+    # instead of being embedded inline on the request path.
+    if missing and _backfill_worker is not None:
+        _backfill_worker.trigger()
+    return result
 
 
 def ingest_fact(
@@ -80,41 +183,68 @@ def ingest_fact(
         vec = emb.embed([fact])[0]
     except Exception:
         vec = None
-    lst = _FACT_STORE.setdefault(user_id, [])
+    with _STORE_LOCK:
+        return _upsert_fact(user_id, fact, metadata, vec)
+
+
+def _near_duplicate(store: UserFactStore, text: str, vec: List[float] | None) -> Fact | None:
+    threshold = get_dedup_threshold()
+    if vec is None or threshold <= 0:
+        return None
+    # A constant vector (stub embeddings, or a provider silently falling back to
+    # them) only encodes text length: after normalization every fact would match.
+    v = np.asarray(vec, dtype=np.float32)
+    if not v.size or float(np.ptp(v)) == 0.0:
+        return None
+    hit = store.nearest(vec)
+    if hit is None or hit[1] < threshold:
+        return None
+    # a paraphrase must also share words with the fact it replaces
+    return hit[0] if tokenize(text) & tokenize(hit[0].text) else None
+
+
+def _upsert_fact(
+    user_id: str, fact: str, metadata: Dict[str, Any] | None, vec: List[float] | None
+) -> bool:
+    store = _FACT_STORE.get(user_id)
+    if store is None:
+        store = _FACT_STORE[user_id] = UserFactStore()
     _id = hashlib.sha256(fact.encode("utf-8")).hexdigest()
-    # idempotent upsert by id
-    exists = None
-    for i, f in enumerate(lst):
-        if f.get("id") == _id:
-            exists = i
-            break
     import time
 
-    item = {
-        "id": _id,
-        "text": fact,
-        "metadata": metadata or {},
-        "embedding": vec,
-        "created_at": time.time(),
-    }
-    if exists is not None:
-        lst[exists] = item
+    # idempotent upsert by id
+    item = store.get(_id)
+    dup = _near_duplicate(store, fact, vec) if item is None else None
+    ingest_fact._last_merged = 0  # type: ignore[attr-defined]
+    if item is not None:
+        item.text = fact
+        item.metadata = metadata or None
+        store.touch(item, time.time())
     else:
-        lst.append(item)
+        if dup is not None:
+            # paraphrase of an existing fact: the newer text replaces it (metadata
+            # merged, newer keys win) instead of storing another copy
+            metadata = {**(dup.metadata or {}), **(metadata or {})}
+            store.remove(dup)
+            _set_pending(user_id, dup.id, False)
+            ingest_fact._last_merged = 1  # type: ignore[attr-defined]
+            memory_long_dedup_merged.inc()
+        item = Fact(_id, fact, time.time(), metadata)
+        store.append(item)
+    if vec is not None:
+        store.set_vector(item, vec)
+    _set_pending(user_id, _id, item.row is None)
     # enforce max facts per user if configured
     max_facts = int(os.getenv("MEMORY_LONG_MAX_FACTS", "0"))
-    if max_facts and max_facts > 0 and len(lst) > max_facts:
-        # evict oldest by created_at
-        before = len(lst)
-        lst.sort(key=lambda f: f.get("created_at", 0), reverse=False)
-        while len(lst) > max_facts:
-            lst.pop(0)
-        evicted = before - len(lst)
+    if max_facts and max_facts > 0 and len(store) > max_facts:
+        # evict oldest by created_at (facts are kept in creation-time order)
+        evicted = store.pop_oldest(len(store) - max_facts)
+        for f in evicted:
+            _set_pending(user_id, f.id, False)
         try:
-            ingest_fact._last_evicted = int(evicted)  # type: ignore[attr-defined]
+            ingest_fact._last_evicted = len(evicted)  # type: ignore[attr-defined]
         except Exception:
             pass
-        _FACT_STORE[user_id] = lst
     else:
         try:
             ingest_fact._last_evicted = 0  # type: ignore[attr-defined]
@@ -124,5 +254,246 @@ def ingest_fact(
 
 
 def clear_long_memory(user_id: str) -> None:
-    if user_id in _FACT_STORE:
-        del _FACT_STORE[user_id]
+    with _STORE_LOCK:
+        for f in _FACT_STORE.pop(user_id, UserFactStore()).facts:
+            _set_pending(user_id, f.id, False)
+
+
+def export_facts(user_id: str, min_created_at: float | None = None) -> List[Dict[str, Any]]:
+    """Snapshot of a user's facts as plain dicts (embedding dequantized to a list)."""
+    with _STORE_LOCK:
+        store = _FACT_STORE.get(user_id)
+        if store is None:
+            return []
+        start = store.expired_count(min_created_at) if min_created_at is not None else 0
+        return [_fact_dict(store, f) for f in store.facts[start:]]
+
+
+def get_import_batch_size() -> int:
+    return int(os.getenv("MEMORY_LONG_IMPORT_BATCH", "256"))
+
+
+def get_import_max_line_bytes() -> int:
+    return int(os.getenv("MEMORY_LONG_IMPORT_MAX_LINE_BYTES", str(1024 * 1024)))
+
+
+def encode_embedding(vec: List[float] | None, fmt: str) -> Any:
+    """Encode a vector for export: ``json`` (list), ``base64`` (float32 bytes) or ``none``."""
+    if vec is None or fmt == "none":
+        return None
+    if fmt == "base64":
+        return base64.b64encode(np.asarray(vec, dtype=np.float32).tobytes()).decode("ascii")
+    return vec
+
+
+def decode_embedding(value: Any) -> List[float] | None:
+    """Inverse of encode_embedding; accepts a list of floats or base64 float32 bytes."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return np.frombuffer(base64.b64decode(value), dtype=np.float32).tolist()
+    if isinstance(value, list):
+        return [float(x) for x in value]
+    return None
+
+
+def iter_export_records(
+    user_id: str,
+    embedding_format: str = "none",
+    min_created_at: float | None = None,
+    chunk_size: int = 500,
+) -> Iterator[Dict[str, Any]]:
+    """Yield a user's facts as export records, a chunk at a time.
+
+    The lock is held only while a chunk of records is built, so large exports
+    neither materialize every fact nor block ingest for the whole stream.
+    """
+    with _STORE_LOCK:
+        store = _FACT_STORE.get(user_id)
+        if store is None:
+            return
+        start = store.expired_count(min_created_at) if min_created_at is not None else 0
+        # references only; records are built lazily below
+        facts = store.facts[start:]
+    for i in range(0, len(facts), chunk_size):
+        chunk: List[Dict[str, Any]] = []
+        with _STORE_LOCK:
+            for f in facts[i : i + chunk_size]:
+                if store.get(f.id) is not f:
+                    continue  # removed since the export started
+                vec = store.vector(f)
+                rec = {
+                    "id": f.id,
+                    "text": f.text,
+                    "created_at": f.created_at,
+                    "metadata": dict(f.metadata or {}),
+                    "embedding_present": vec is not None,
+                    "embedding_dim": len(vec) if vec is not None else None,
+                }
+                if vec is not None and embedding_format != "none":
+                    rec["embedding"] = encode_embedding(vec, embedding_format)
+                    rec["embedding_encoding"] = (
+                        "base64-float32" if embedding_format == "base64" else "json"
+                    )
+                chunk.append(rec)
+        yield from chunk
+
+
+def ingest_facts(user_id: str, items: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """Ingest a batch of ``{"text", "metadata"?, "embedding"?}`` records.
+
+    Records that carry an embedding skip re-embedding; the rest are embedded
+    with a single embedder call for the whole batch. Records whose text is not a
+    non-empty string or whose metadata is not an object are ignored.
+    """
+    batch = [
+        it
+        for it in items
+        if isinstance(it, dict)
+        and isinstance(it.get("text"), str)
+        and it["text"]
+        and isinstance(it.get("metadata"), (dict, type(None)))
+    ]
+    vecs: List[List[float] | None] = []
+    for it in batch:
+        try:
+            vecs.append(decode_embedding(it.get("embedding")))
+        except Exception:
+            vecs.append(None)
+    todo = [i for i, v in enumerate(vecs) if v is None]
+    if todo:
+        try:
+            embedded = _get_embedder().embed([batch[i]["text"] for i in todo])
+            for i, v in zip(todo, embedded):
+                vecs[i] = v
+        except Exception:
+            pass  # stored vectorless; the backfill worker embeds them later
+    evicted = 0
+    merged = 0
+    with _STORE_LOCK:
+        for it, vec in zip(batch, vecs):
+            _upsert_fact(user_id, it["text"], it.get("metadata") or {}, vec)
+            evicted += int(getattr(ingest_fact, "_last_evicted", 0) or 0)
+            merged += int(getattr(ingest_fact, "_last_merged", 0) or 0)
+    return {"imported": len(batch), "evicted": evicted, "merged": merged}
+
+
+def sweep_expired_facts(cutoff: float | None = None) -> int:
+    """Drop facts older than the retention window for every user.
+
+    Facts are time-ordered, so each user's expired facts are a prefix located by
+    binary search. Returns the number of facts removed.
+    """
+    import time
+
+    cutoff = cutoff if cutoff is not None else _retention_cutoff()
+    if cutoff is None:
+        return 0
+    start = time.perf_counter()
+    pruned = 0
+    for user_id in list(_FACT_STORE.keys()):
+        with _STORE_LOCK:
+            store = _FACT_STORE.get(user_id)
+            if store is None:
+                continue
+            n = store.expired_count(cutoff)
+            if n:
+                for f in store.pop_oldest(n):
+                    _set_pending(user_id, f.id, False)
+                pruned += n
+            if not store:
+                del _FACT_STORE[user_id]
+    _SWEEP_STATS["sweeps"] += 1
+    _SWEEP_STATS["pruned_total"] += pruned
+    _SWEEP_STATS["last_pruned"] = pruned
+    _SWEEP_STATS["last_duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    _SWEEP_STATS["last_run_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    return pruned
+
+
+def get_sweep_stats() -> Dict[str, Any]:
+    return dict(_SWEEP_STATS)
+
+
+def store_stats(top: int) -> Dict[str, Any]:
+    """User/fact totals plus the ``top`` users holding the most facts."""
+    import heapq
+
+    sizes = [(u, len(store)) for u, store in list(_FACT_STORE.items())]
+    heavy = heapq.nlargest(top, sizes, key=lambda x: x[1]) if top > 0 else []
+    return {
+        "users_total": len(sizes),
+        "facts_total": sum(n for _, n in sizes),
+        "heavy_users": [{"user_id": u, "facts": n} for u, n in heavy],
+    }
+
+
+def backfill_embeddings(batch_size: int | None = None) -> int:
+    """Embed up to ``batch_size`` vectorless facts and attach the vectors.
+
+    The embedding call runs without holding the store lock; vectors are attached
+    afterwards only if the fact is still present and still lacks a vector.
+    Returns the number of facts that received an embedding.
+    """
+    size = batch_size or get_backfill_batch_size()
+    with _STORE_LOCK:
+        keys = list(_PENDING_EMBEDDINGS)[:size]
+        texts: Dict[tuple[str, str], str] = {}
+        for user_id, fact_id in keys:
+            store = _FACT_STORE.get(user_id)
+            f = store.get(fact_id) if store is not None else None
+            if f is not None:
+                texts[(user_id, fact_id)] = f.text
+            else:
+                _set_pending(user_id, fact_id, False)
+    if not texts:
+        return 0
+    try:
+        vecs = _get_embedder().embed(list(texts.values()))
+    except Exception as e:  # noqa: BLE001
+        logger.warning({"event": "memory_long_backfill_failed", "error": str(e)})
+        return 0
+    attached = 0
+    with _STORE_LOCK:
+        for (user_id, fact_id), vec in zip(texts.keys(), vecs):
+            store = _FACT_STORE.get(user_id)
+            f = store.get(fact_id) if store is not None else None
+            if f is not None and f.row is None and store.set_vector(f, vec):
+                attached += 1
+            _set_pending(user_id, fact_id, False)
+    memory_long_embeddings_backfilled.inc(attached)
+    return attached
+
+
+def start_backfill_worker() -> bool:
+    global _backfill_worker
+    if _backfill_worker is not None and _backfill_worker.running:
+        return False
+    _backfill_worker = PeriodicWorker(
+        "memory-long-backfill", get_backfill_interval(), backfill_embeddings
+    )
+    return _backfill_worker.start()
+
+
+def stop_backfill_worker() -> None:
+    global _backfill_worker
+    if _backfill_worker is not None:
+        _backfill_worker.stop()
+        _backfill_worker = None
+
+
+def start_sweep_worker() -> bool:
+    global _sweep_worker
+    if _sweep_worker is not None and _sweep_worker.running:
+        return False
+    _sweep_worker = PeriodicWorker(
+        "memory-long-retention", get_sweep_interval(), sweep_expired_facts
+    )
+    return _sweep_worker.start()
+
+
+def stop_sweep_worker() -> None:
+    global _sweep_worker
+    if _sweep_worker is not None:
+        _sweep_worker.stop()
+        _sweep_worker = None
@@ -0,0 +1,198 @@
+"""
+Bounded in-process LRU cache of recent short-term memory per session.
+
+Entries hold a session's newest turns (role, content, epoch ts) and its summary,
+keyed by (db_path, user_id, session_id). Writes update cached entries in place and
+clears invalidate them, so hot conversations are served without touching SQLite.
+The cache is bounded by an approximate byte budget rather than an entry count.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from app.utils.metrics import memory_short_cache_bytes, memory_short_cache_requests
+
+Key = Tuple[str, str, str]
+Turn = Tuple[str, str, int]
+
+# rough per-object overhead so many tiny turns still count against the budget
+_TURN_OVERHEAD = 64
+_ENTRY_OVERHEAD = 256
+
+
+def get_cache_budget() -> int:
+    return int(os.getenv("MEMORY_SHORT_CACHE_BYTES", str(8 * 1024 * 1024)))
+
+
+class _Entry:
+    __slots__ = ("turns", "cap", "summary", "nbytes")
+
+    def __init__(self):
+        # None means "not loaded"; an empty list/string is a cached empty value
+        self.turns: Optional[List[Turn]] = None
+        self.cap = 0
+        self.summary: Optional[str] = None
+        self.nbytes = _ENTRY_OVERHEAD
+
+    def size(self) -> int:
+        n = _ENTRY_OVERHEAD + len(self.summary or "")
+        for role, content, _ in self.turns or ():
+            n += _TURN_OVERHEAD + len(role) + len(content)
+        return n
+
+
+class SessionCache:
+    """LRU of per-session turns and summaries, bounded by MEMORY_SHORT_CACHE_BYTES.
+
+    Consistency with concurrent writers: a loader reads ``epoch(key)`` before going
+    to the database and only populates the cache if no write touched that key in
+    between. Writers call ``begin_append`` before and ``end_write`` after their
+    commit, which keeps the cached entry they appended to and drops any entry a
+    racing loader may have populated meanwhile.
+    """
+
+    _EPOCH_STRIPES = 64
+
+    def __init__(self):
+        self._entries: "OrderedDict[Key, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self._epochs = [0] * self._EPOCH_STRIPES
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def epoch(self, key: Key) -> int:
+        return self._epochs[hash(key) % self._EPOCH_STRIPES]
+
+    def _bump(self, key: Key) -> None:
+        self._epochs[hash(key) % self._EPOCH_STRIPES] += 1
+
+    def get_turns(
+        self, key: Key, cutoff: Optional[int], cap: int
+    ) -> Optional[List[Turn]]:
+        if get_cache_budget() <= 0:
+            return None
+        with self._lock:
+            e = self._entries.get(key)
+            if e is None or e.turns is None or e.cap != cap:
+                memory_short_cache_requests.labels(result="miss").inc()
+                return None
+            self._entries.move_to_end(key)
+            turns = list(e.turns)
+        memory_short_cache_requests.labels(result="hit").inc()
+        return [t for t in turns if cutoff is None or t[2] >= cutoff]
+
+    def get_summary(self, key: Key) -> Optional[str]:
+        if get_cache_budget() <= 0:
+            return None
+        with self._lock:
+            e = self._entries.get(key)
+            if e is None or e.summary is None:
+                memory_short_cache_requests.labels(result="miss").inc()
+                return None
+            self._entries.move_to_end(key)
+            summary = e.summary
+        memory_short_cache_requests.labels(result="hit").inc()
+        return summary
+
+    def put_turns(self, key: Key, turns: List[Turn], cap: int, epoch: int) -> None:
+        with self._lock:
+            if epoch != self.epoch(key) or get_cache_budget() <= 0:
+                return
+            e = self._entry(key)
+            e.turns = list(turns)
+            e.cap = cap
+            self._resize(e)
+
+    def put_summary(self, key: Key, summary: str, epoch: int) -> None:
+        with self._lock:
+            if epoch != self.epoch(key) or get_cache_budget() <= 0:
+                return
+            e = self._entry(key)
+            e.summary = summary
+            self._resize(e)
+
+    def begin_append(self, key: Key, turn: Turn) -> Tuple[Optional[_Entry], object]:
+        """Append ``turn`` to a cached session ahead of its commit.
+
+        Returns a token identifying what was touched, to pass to ``end_write``.
+        """
+        with self._lock:
+            e = self._entries.get(key)
+            if e is None:
+                return None, None
+            if e.turns is not None:
+                e.turns.append(turn)
+                if e.cap > 0 and len(e.turns) > e.cap:
+                    del e.turns[: len(e.turns) - e.cap]
+                self._entries.move_to_end(key)
+                self._resize(e)
+            return e, e.turns
+
+    def end_write(self, key: Key, token: Tuple[Optional[_Entry], object]) -> None:
+        """Finish a write begun with ``begin_append`` once it is committed."""
+        entry, turns = token
+        with self._lock:
+            self._bump(key)
+            current = self._entries.get(key)
+            if current is None:
+                return
+            # anything a loader populated while the write was in flight may or
+            # may not include the new turn, so drop it
+            if current is not entry:
+                self._pop(key)
+            elif current.turns is not turns:
+                current.turns = None
+                self._resize(current)
+
+    def set_summary(self, key: Key, summary: str) -> None:
+        """Record a committed summary write."""
+        with self._lock:
+            self._bump(key)
+            e = self._entries.get(key)
+            if e is not None:
+                e.summary = summary
+                self._resize(e)
+
+    def invalidate(self, key: Key) -> None:
+        with self._lock:
+            self._bump(key)
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epochs = [n + 1 for n in self._epochs]
+            self._entries.clear()
+            self._nbytes = 0
+            memory_short_cache_bytes.set(0)
+
+    def _pop(self, key: Key) -> None:
+        e = self._entries.pop(key, None)
+        if e is not None:
+            self._nbytes -= e.nbytes
+        memory_short_cache_bytes.set(self._nbytes)
+
+    def _entry(self, key: Key) -> _Entry:
+        e = self._entries.get(key)
+        if e is None:
+            e = self._entries[key] = _Entry()
+            self._nbytes += e.nbytes
+        self._entries.move_to_end(key)
+        return e
+
+    def _resize(self, e: _Entry) -> None:
+        size = e.size()
+        self._nbytes += size - e.nbytes
+        e.nbytes = size
+        budget = get_cache_budget()
+        # evict least recently used entries until back under budget; an entry
+        # larger than the whole budget is not kept either
+        while self._entries and self._nbytes > budget:
+            _, old = self._entries.popitem(last=False)
+            self._nbytes -= old.nbytes
+        memory_short_cache_bytes.set(self._nbytes)
@@ -1,12 +1,63 @@
 import os
+import re
 import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
 
+from app.memory.session_cache import SessionCache
+from app.memory.summary import RollingSummary, compact_summary, get_summary_mode
+from app.utils.background import PeriodicWorker
 from app.utils.logger import get_logger
+from app.utils.metrics import (
+    memory_short_flushed_turns,
+    memory_short_pruned,
+    memory_short_write_buffer,
+)
 
 logger = get_logger(__name__)
 
+# Per-thread pool of persistent connections, keyed by DB path. Connections are
+# opened once per (thread, path) and reused; the schema is created once per path.
+# A thread's connections are closed when the thread exits (worker threads of the
+# server threadpool come and go with load), so they do not accumulate.
+_local = threading.local()
+_POOL_LOCK = threading.Lock()
+_ALL_CONNS: set[sqlite3.Connection] = set()
+_SCHEMA_READY: set[str] = set()
+# bumped by close_short_memory() so threads drop their stale connections
+_POOL_GENERATION = 0
+_sweep_worker: PeriodicWorker | None = None
+# Write-behind buffer: (db_path, user_id, session_id, role, content, timestamp, ts)
+# rows in insertion order. Rows stay buffered until their transaction commits;
+# _FLUSH_LOCK is held from commit until they leave the buffer so readers never
+# see a row twice or not at all.
+_PENDING_TURNS: List[Tuple[str, str, str, str, str, str, int]] = []
+_PENDING_LOCK = threading.Lock()
+_FLUSH_LOCK = threading.Lock()
+_flush_worker: PeriodicWorker | None = None
+# Recent turns and summary of hot sessions, kept current by writes in this module
+_SESSION_CACHE = SessionCache()
+# Incremental summary state per (db_path, user_id, session_id); evicted states are
+# rebuilt from the newest turns on demand
+_SUMMARY_STATES: "OrderedDict[Tuple[str, str, str], RollingSummary]" = OrderedDict()
+_SUMMARY_LOCK = threading.Lock()
+_MAX_SUMMARY_STATES = 4096
+# sessions whose summary awaits LLM compaction (MEMORY_SHORT_SUMMARY_MODE=llm)
+_COMPACTION_PENDING: set[Tuple[str, str, str]] = set()
+_compaction_worker: PeriodicWorker | None = None
+# Stats of the background retention/cap sweeper, surfaced by /memory/status
+_SWEEP_STATS: Dict[str, Any] = {
+    "sweeps": 0,
+    "pruned_total": 0,
+    "last_pruned": 0,
+    "last_duration_ms": None,
+    "last_run_at": None,
+}
+
 
 def get_db_path() -> str:
     return os.getenv("MEMORY_DB_PATH", "./data/memory_short.db")
@@ -24,11 +75,142 @@ def get_max_turns_per_session() -> int:
     return int(os.getenv("SHORT_MEMORY_MAX_TURNS_PER_SESSION", "0"))
 
 
-def init_short_memory(db_path: str | None = None):
-    path = db_path or get_db_path()
+def get_sweep_interval() -> float:
+    return float(os.getenv("MEMORY_SHORT_SWEEP_INTERVAL_SEC", "300"))
+
+
+def get_sweep_batch_size() -> int:
+    return int(os.getenv("MEMORY_SHORT_SWEEP_BATCH", "500"))
+
+
+def get_short_memory_enabled() -> bool:
+    return os.getenv("MEMORY_SHORT_ENABLED", "false").lower() in ("1", "true", "yes", "on")
+
+
+def get_write_behind_enabled() -> bool:
+    return os.getenv("MEMORY_SHORT_WRITE_BEHIND", "false").lower() in (
+        "1",
+        "true",
+        "yes",
+        "on",
+    )
+
+
+def get_flush_interval_ms() -> int:
+    return int(os.getenv("MEMORY_SHORT_FLUSH_INTERVAL_MS", "50"))
+
+
+def get_flush_max_rows() -> int:
+    return int(os.getenv("MEMORY_SHORT_FLUSH_MAX_ROWS", "256"))
+
+
+def get_compaction_interval() -> float:
+    return float(os.getenv("MEMORY_SHORT_COMPACTION_INTERVAL_SEC", "30"))
+
+
+def _retention_cutoff() -> int | None:
+    rd = get_retention_days()
+    return int(time.time() - (rd * 86400)) if rd and rd > 0 else None
+
+
+def get_mmap_size() -> int:
+    return int(os.getenv("MEMORY_DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+
+def get_cache_size() -> int:
+    # negative values are KiB, as in PRAGMA cache_size
+    return int(os.getenv("MEMORY_DB_CACHE_SIZE", "-20000"))
+
+
+def _connect(path: str) -> sqlite3.Connection:
     dir_ = os.path.dirname(path) or "."
     os.makedirs(dir_, exist_ok=True)
     conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA mmap_size={get_mmap_size()}")
+    conn.execute(f"PRAGMA cache_size={get_cache_size()}")
+    conn.execute("PRAGMA busy_timeout=5000")
+    with _POOL_LOCK:
+        _ALL_CONNS.add(conn)
+    return conn
+
+
+class _ThreadConns(dict):
+    """A thread's connections by path; closed once the thread's locals are released."""
+
+    def __init__(self):
+        super().__init__()
+        # the finalizer must not reference the dict itself, only its connections
+        self._opened: List[sqlite3.Connection] = []
+        weakref.finalize(self, _release_conns, self._opened)
+
+    def open(self, path: str) -> sqlite3.Connection:
+        conn = self[path] = _connect(path)
+        self._opened.append(conn)
+        return conn
+
+
+def _release_conns(conns: List[sqlite3.Connection]) -> None:
+    with _POOL_LOCK:
+        # connections already closed by close_short_memory() are gone from the set
+        live = [c for c in conns if c in _ALL_CONNS]
+        _ALL_CONNS.difference_update(live)
+    for conn in live:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def get_conn(db_path: str | None = None) -> sqlite3.Connection:
+    """Return this thread's pooled connection for ``db_path``, initializing the schema once."""
+    path = db_path or get_db_path()
+    if getattr(_local, "generation", None) != _POOL_GENERATION:
+        _local.conns = _ThreadConns()
+        _local.generation = _POOL_GENERATION
+    conns: _ThreadConns = _local.conns
+    conn = conns.get(path)
+    if conn is None:
+        conn = conns.open(path)
+    if path not in _SCHEMA_READY:
+        _init_schema(conn, path)
+    return conn
+
+
+def close_short_memory() -> None:
+    """Close every pooled connection (called on shutdown)."""
+    global _POOL_GENERATION
+    with _POOL_LOCK:
+        _POOL_GENERATION += 1
+        conns = list(_ALL_CONNS)
+        _ALL_CONNS.clear()
+        _SCHEMA_READY.clear()
+    for conn in conns:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    _SESSION_CACHE.clear()
+    with _SUMMARY_LOCK:
+        _SUMMARY_STATES.clear()
+        _COMPACTION_PENDING.clear()
+
+
+def init_short_memory(db_path: str | None = None):
+    get_conn(db_path)
+
+
+def _init_schema(conn: sqlite3.Connection, path: str) -> None:
+    with _POOL_LOCK:
+        if path in _SCHEMA_READY:
+            return
+        _create_schema(conn)
+        _SCHEMA_READY.add(path)
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
     c = conn.cursor()
     c.execute(
         """
@@ -38,7 +220,8 @@ def init_short_memory(db_path: str | None = None):
         session_id TEXT,
         role TEXT,
         content TEXT,
-        timestamp TEXT
+        timestamp TEXT,
+        ts INTEGER
       )
     """
     )
@@ -54,91 +237,158 @@ def init_short_memory(db_path: str | None = None):
     """
     )
     conn.commit()
-    conn.close()
+    _migrate(conn)
 
 
-def load_turns(user_id: str, session_id: str) -> List[Tuple[str, str]]:
-    init_short_memory()
-    conn = sqlite3.connect(get_db_path(), check_same_thread=False)
-    c = conn.cursor()
-    pruned = 0
-    # Optional retention by days
-    rd = get_retention_days()
-    if rd and rd > 0:
-        cutoff = datetime.utcnow().timestamp() - (rd * 86400)
-        # count and delete old rows
-        c.execute(
-            "SELECT COUNT(1) FROM turns WHERE user_id=? AND session_id=? AND strftime('%s', timestamp) < ?",
-            (user_id, session_id, int(cutoff)),
-        )
-        n_old = c.fetchone()[0] or 0
-        if n_old:
-            pruned += int(n_old)
-            c.execute(
-                "DELETE FROM turns WHERE user_id=? AND session_id=? AND strftime('%s', timestamp) < ?",
-                (user_id, session_id, int(cutoff)),
-            )
-            conn.commit()
-    # Optional cap per session: enforce by deleting oldest beyond cap, then select
-    cap = get_max_turns_per_session()
-    if cap and cap > 0:
-        c.execute(
-            "SELECT id FROM turns WHERE user_id=? AND session_id=? ORDER BY id DESC",
-            (user_id, session_id),
-        )
-        ids_desc = [r[0] for r in c.fetchall()]
-        if len(ids_desc) > cap:
-            drop_ids = ids_desc[cap:]
-            pruned += len(drop_ids)
-            if drop_ids:
-                qmarks = ",".join(["?"] * len(drop_ids))
-                c.execute(f"DELETE FROM turns WHERE id IN ({qmarks})", drop_ids)
-                conn.commit()
-    # Now fetch up to cap (or all if cap disabled)
-    cap = get_max_turns_per_session()
-    if cap and cap > 0:
+def _migration_1_epoch_ts_and_indexes(c: sqlite3.Cursor) -> None:
+    # integer epoch column so retention filters can use an index (strftime() cannot)
+    cols = {r[1] for r in c.execute("PRAGMA table_info(turns)").fetchall()}
+    if "ts" not in cols:
+        c.execute("ALTER TABLE turns ADD COLUMN ts INTEGER")
+    c.execute(
+        "UPDATE turns SET ts = CAST(strftime('%s', timestamp) AS INTEGER) WHERE ts IS NULL"
+    )
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_turns_session ON turns(user_id, session_id, id)"
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_turns_ts ON turns(ts)")
+
+
+def _migration_2_turns_fts(c: sqlite3.Cursor) -> None:
+    # external-content FTS5 index over turns.content, kept in sync by triggers
+    try:
         c.execute(
             """
-          SELECT role, content FROM turns
-          WHERE user_id=? AND session_id=?
-          ORDER BY id ASC
-        """,
-            (user_id, session_id),
+          CREATE VIRTUAL TABLE IF NOT EXISTS turns_fts USING fts5(
+            content, content='turns', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+          )
+        """
         )
-        rows = c.fetchall()
-        if len(rows) > cap:
-            rows = rows[-cap:]
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5: search stays unavailable, everything else works
+        logger.warning({"event": "short_memory_fts_unavailable", "error": str(e)})
+        return
+    c.execute(
+        """
+      CREATE TRIGGER IF NOT EXISTS turns_fts_ai AFTER INSERT ON turns BEGIN
+        INSERT INTO turns_fts(rowid, content) VALUES (new.id, new.content);
+      END
+    """
+    )
+    c.execute(
+        """
+      CREATE TRIGGER IF NOT EXISTS turns_fts_ad AFTER DELETE ON turns BEGIN
+        INSERT INTO turns_fts(turns_fts, rowid, content) VALUES ('delete', old.id, old.content);
+      END
+    """
+    )
+    c.execute(
+        """
+      CREATE TRIGGER IF NOT EXISTS turns_fts_au AFTER UPDATE OF content ON turns BEGIN
+        INSERT INTO turns_fts(turns_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO turns_fts(rowid, content) VALUES (new.id, new.content);
+      END
+    """
+    )
+    # index turns written before this migration
+    c.execute("INSERT INTO turns_fts(turns_fts) VALUES ('rebuild')")
+
+
+# Ordered schema migrations; PRAGMA user_version records how many have been applied
+_MIGRATIONS: List[Callable[[sqlite3.Cursor], None]] = [
+    _migration_1_epoch_ts_and_indexes,
+    _migration_2_turns_fts,
+]
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    c = conn.cursor()
+    version = c.execute("PRAGMA user_version").fetchone()[0]
+    for i, migration in enumerate(_MIGRATIONS[version:], start=version + 1):
+        migration(c)
+        c.execute(f"PRAGMA user_version={i}")
+        conn.commit()
+        logger.info({"event": "short_memory_migrated", "version": i})
+
+
+def load_turns(user_id: str, session_id: str) -> List[Tuple[str, str]]:
+    """Newest turns of a session in chronological order.
+
+    A pure read: turns past the retention window or beyond the per-session cap are
+    filtered out here and deleted later by the background sweeper.
+    """
+    # pruning moved to sweep_short_memory(); kept for callers that audit this field
+    load_turns._last_pruned = 0  # type: ignore[attr-defined]
+    return [(r, c) for r, c, _ in _session_turns(user_id, session_id)]
+
+
+def _session_turns(user_id: str, session_id: str) -> List[Tuple[str, str, int]]:
+    """load_turns with each turn's epoch ts."""
+    key = (get_db_path(), user_id, session_id)
+    cutoff = _retention_cutoff()
+    cap = get_max_turns_per_session()
+    cached = _SESSION_CACHE.get_turns(key, cutoff, cap)
+    if cached is not None:
+        return cached
+    epoch = _SESSION_CACHE.epoch(key)
+    if _has_pending():
+        # a flush may be committing this session's rows; read DB + buffer atomically
+        with _FLUSH_LOCK:
+            rows = _load_turns(key, cutoff, cap)
     else:
-        c.execute(
-            """
-          SELECT role, content FROM turns
-          WHERE user_id=? AND session_id=?
-          ORDER BY id ASC
-        """,
-            (user_id, session_id),
-        )
-        rows = c.fetchall()
-    conn.close()
-    # stash pruned count on logger for visibility (no global state)
-    try:
-        logger.debug(
-            {
-                "event": "short_memory_pruned",
-                "count": pruned,
-                "user_id": user_id,
-                "session_id": session_id,
-            }
-        )
-    except Exception:
-        pass
-    # monkeypatch: attach attribute on function for router to read (simple approach)
-    load_turns._last_pruned = pruned  # type: ignore[attr-defined]
+        rows = _load_turns(key, cutoff, cap)
+    _SESSION_CACHE.put_turns(key, rows, cap, epoch)
+    return rows
+
+
+def _has_pending() -> bool:
+    # Checked under the buffer lock: turns buffered before this returns False have
+    # already been committed, so a plain DB read cannot miss them.
+    with _PENDING_LOCK:
+        return bool(_PENDING_TURNS)
+
+
+def _load_turns(
+    key: Tuple[str, str, str], cutoff: int | None, cap: int
+) -> List[Tuple[str, str, int]]:
+    path, user_id, session_id = key
+    conn = get_conn(path)
+    c = conn.cursor()
+    # Fetch only the newest turns (up to cap, or all if cap disabled) via the
+    # (user_id, session_id, id) index, then restore chronological order
+    c.execute(
+        """
+      SELECT role, content, ts FROM (
+        SELECT id, role, content, ts FROM turns
+        WHERE user_id=? AND session_id=? AND (? IS NULL OR ts >= ?)
+        ORDER BY id DESC LIMIT ?
+      ) ORDER BY id ASC
+    """,
+        (user_id, session_id, cutoff, cutoff, cap if cap and cap > 0 else -1),
+    )
+    rows = [(role, content, ts or 0) for role, content, ts in c.fetchall()]
+    with _PENDING_LOCK:
+        buffered = [
+            (t[3], t[4], t[6])
+            for t in _PENDING_TURNS
+            if t[0] == path and t[1] == user_id and t[2] == session_id
+        ]
+    if buffered:
+        # buffered turns are newer than anything committed
+        rows = rows + buffered
+        if cap and cap > 0:
+            rows = rows[-cap:]
     return rows
 
 
 def load_summary(user_id: str, session_id: str) -> str:
-    init_short_memory()
-    conn = sqlite3.connect(get_db_path(), check_same_thread=False)
+    key = (get_db_path(), user_id, session_id)
+    cached = _SESSION_CACHE.get_summary(key)
+    if cached is not None:
+        return cached
+    epoch = _SESSION_CACHE.epoch(key)
+    conn = get_conn()
     c = conn.cursor()
     c.execute(
         """
@@ -148,59 +398,452 @@ def load_summary(user_id: str, session_id: str) -> str:
         (user_id, session_id),
     )
     row = c.fetchone()
-    conn.close()
-    return row[0] if row else ""
+    summary = (row[0] if row else "") or ""
+    _SESSION_CACHE.put_summary(key, summary, epoch)
+    return summary
+
+
+_INSERT_TURN = """
+  INSERT INTO turns (user_id, session_id, role, content, timestamp, ts)
+  VALUES (?, ?, ?, ?, ?, ?)
+"""
 
 
 def save_turn(user_id: str, session_id: str, role: str, content: str):
-    init_short_memory()
-    conn = sqlite3.connect(get_db_path(), check_same_thread=False)
-    c = conn.cursor()
-    c.execute(
-        """
-      INSERT INTO turns (user_id, session_id, role, content, timestamp)
-      VALUES (?, ?, ?, ?, ?)
-    """,
-        (user_id, session_id, role, content, datetime.utcnow().isoformat()),
+    path = get_db_path()
+    ts = int(time.time())
+    row = (user_id, session_id, role, content, datetime.utcnow().isoformat(), ts)
+    key = (path, user_id, session_id)
+    token = _SESSION_CACHE.begin_append(key, (role, content, ts))
+    try:
+        if (
+            get_write_behind_enabled()
+            and _flush_worker is not None
+            and _flush_worker.running
+        ):
+            with _PENDING_LOCK:
+                _PENDING_TURNS.append((path, *row))
+                size = len(_PENDING_TURNS)
+            memory_short_write_buffer.set(size)
+            if size >= get_flush_max_rows():
+                _flush_worker.trigger()
+        else:
+            conn = get_conn(path)
+            conn.execute(_INSERT_TURN, row)
+            conn.commit()
+    except Exception:
+        _SESSION_CACHE.invalidate(key)
+        raise
+    _SESSION_CACHE.end_write(key, token)
+    with _SUMMARY_LOCK:
+        state = _SUMMARY_STATES.get(key)
+        if state is not None:
+            state.push(role, content, ts)
+
+
+def flush_short_memory() -> int:
+    """Commit buffered write-behind turns, one transaction per DB path.
+
+    Returns the number of turns flushed. On error the rows stay buffered and are
+    retried on the next flush.
+    """
+    with _FLUSH_LOCK:
+        with _PENDING_LOCK:
+            batch = list(_PENDING_TURNS)
+        if not batch:
+            return 0
+        by_path: Dict[str, List[Tuple[str, str, str, str, str, int]]] = {}
+        for path, *row in batch:
+            by_path.setdefault(path, []).append(tuple(row))  # type: ignore[arg-type]
+        for path, rows in by_path.items():
+            conn = get_conn(path)
+            try:
+                conn.executemany(_INSERT_TURN, rows)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        with _PENDING_LOCK:
+            # only this function removes rows, so the batch is still the prefix
+            del _PENDING_TURNS[: len(batch)]
+            size = len(_PENDING_TURNS)
+    memory_short_write_buffer.set(size)
+    memory_short_flushed_turns.inc(len(batch))
+    return len(batch)
+
+
+def start_write_behind() -> bool:
+    """Start the flusher when MEMORY_SHORT_WRITE_BEHIND is on.
+
+    Until it runs, save_turn writes through with one commit per turn.
+    """
+    global _flush_worker
+    if not get_write_behind_enabled():
+        return False
+    if _flush_worker is not None and _flush_worker.running:
+        return False
+    _flush_worker = PeriodicWorker(
+        "memory-short-flush",
+        get_flush_interval_ms() / 1000.0,
+        flush_short_memory,
+        drain_on_stop=True,
+        run_at_start=False,  # nothing is buffered before it starts
     )
-    conn.commit()
-    conn.close()
+    return _flush_worker.start()
+
+
+def stop_write_behind() -> None:
+    """Stop the flusher, committing everything still buffered."""
+    global _flush_worker
+    if _flush_worker is not None:
+        _flush_worker.stop()
+        _flush_worker = None
+    if _has_pending():
+        flush_short_memory()
 
 
 def summarize_context(turns: List[Tuple[str, str]]) -> str:
-    snippet = "\n".join(f"{r}: {c}" for r, c in turns)
-    return snippet if len(snippet) <= 500 else snippet[-500:]
+    return RollingSummary(len(turns), ((r, c, 0) for r, c in turns)).text()
+
+
+def _summary_state(key: Tuple[str, str, str], max_turns: int) -> RollingSummary:
+    with _SUMMARY_LOCK:
+        state = _SUMMARY_STATES.get(key)
+        if state is not None and state.max_turns == max_turns:
+            _SUMMARY_STATES.move_to_end(key)
+            return state
+    # cold session (or window size changed): seed from the newest turns once
+    _, user_id, session_id = key
+    state = RollingSummary(
+        max_turns, _session_turns(user_id, session_id), load_summary(user_id, session_id)
+    )
+    with _SUMMARY_LOCK:
+        _SUMMARY_STATES[key] = state
+        while len(_SUMMARY_STATES) > _MAX_SUMMARY_STATES:
+            _SUMMARY_STATES.popitem(last=False)
+    return state
+
+
+def _write_summary(key: Tuple[str, str, str], summary: str) -> None:
+    path, user_id, session_id = key
+    conn = get_conn(path)
+    conn.execute(
+        """
+      REPLACE INTO summaries(user_id, session_id, summary, updated_at)
+      VALUES(?,?,?,?)
+    """,
+        (user_id, session_id, summary, datetime.utcnow().isoformat()),
+    )
+    conn.commit()
+    _SESSION_CACHE.set_summary(key, summary)
 
 
 def update_summary_if_needed(user_id: str, session_id: str) -> bool:
-    turns = load_turns(user_id, session_id)
+    """Refresh the session summary once it has more than MEMORY_SHORT_MAX_TURNS turns.
+
+    The rolling window is maintained by save_turn, so this costs O(window) and writes
+    only when the summary text changed. In ``llm`` summary mode the session is queued
+    for the compaction worker instead and nothing is written on the request path.
+    Returns True when a summary was written.
+    """
+    key = (get_db_path(), user_id, session_id)
     max_turns = get_summary_max_turns()
-    if len(turns) > max_turns:
-        summary = summarize_context(turns[-max_turns:])
-        conn = sqlite3.connect(get_db_path(), check_same_thread=False)
+    state = _summary_state(key, max_turns)
+    if not state.over_threshold(_retention_cutoff(), get_max_turns_per_session()):
+        return False
+    if (
+        get_summary_mode() == "llm"
+        and _compaction_worker is not None
+        and _compaction_worker.running
+    ):
+        with _SUMMARY_LOCK:
+            _COMPACTION_PENDING.add(key)
+        return False
+    summary = state.text()
+    if summary == state.written:
+        return False
+    _write_summary(key, summary)
+    state.written = summary
+    return True
+
+
+def compact_summaries() -> int:
+    """LLM-compact the summaries of queued sessions; returns how many were rewritten."""
+    with _SUMMARY_LOCK:
+        keys = list(_COMPACTION_PENDING)
+        _COMPACTION_PENDING.clear()
+    written = 0
+    for key in keys:
+        with _SUMMARY_LOCK:
+            state = _SUMMARY_STATES.get(key)
+        if state is None:
+            continue
+        summary = compact_summary(state.written, state.text())
+        if summary and summary != state.written:
+            _write_summary(key, summary)
+            state.written = summary
+            written += 1
+    return written
+
+
+def start_compaction_worker() -> bool:
+    global _compaction_worker
+    if get_summary_mode() != "llm":
+        return False
+    if _compaction_worker is not None and _compaction_worker.running:
+        return False
+    _compaction_worker = PeriodicWorker(
+        "memory-short-compaction",
+        get_compaction_interval(),
+        compact_summaries,
+        run_at_start=False,  # sessions are only queued while it runs
+    )
+    return _compaction_worker.start()
+
+
+def stop_compaction_worker() -> None:
+    global _compaction_worker
+    if _compaction_worker is not None:
+        _compaction_worker.stop()
+        _compaction_worker = None
+
+
+def clear_short_memory(user_id: str, session_id: str) -> None:
+    path = get_db_path()
+    with _FLUSH_LOCK:
+        with _PENDING_LOCK:
+            _PENDING_TURNS[:] = [
+                t
+                for t in _PENDING_TURNS
+                if not (t[0] == path and t[1] == user_id and t[2] == session_id)
+            ]
+            memory_short_write_buffer.set(len(_PENDING_TURNS))
+        conn = get_conn()
         c = conn.cursor()
         c.execute(
-            """
-          REPLACE INTO summaries(user_id, session_id, summary, updated_at)
-          VALUES(?,?,?,?)
-        """,
-            (user_id, session_id, summary, datetime.utcnow().isoformat()),
+            "DELETE FROM turns WHERE user_id=? AND session_id=?", (user_id, session_id)
+        )
+        c.execute(
+            "DELETE FROM summaries WHERE user_id=? AND session_id=?", (user_id, session_id)
         )
         conn.commit()
-        conn.close()
-        return True
-    return False
+        _SESSION_CACHE.invalidate((path, user_id, session_id))
+    with _SUMMARY_LOCK:
+        _SUMMARY_STATES.pop((path, user_id, session_id), None)
+        _COMPACTION_PENDING.discard((path, user_id, session_id))
 
 
-def clear_short_memory(user_id: str, session_id: str) -> None:
-    init_short_memory()
-    conn = sqlite3.connect(get_db_path(), check_same_thread=False)
-    c = conn.cursor()
-    c.execute(
-        "DELETE FROM turns WHERE user_id=? AND session_id=?", (user_id, session_id)
-    )
-    c.execute(
-        "DELETE FROM summaries WHERE user_id=? AND session_id=?", (user_id, session_id)
+_LIST_SESSIONS = """
+      SELECT t.user_id, t.session_id, COUNT(1), MAX(s.user_id IS NOT NULL)
+      FROM turns t
+      LEFT JOIN summaries s ON s.user_id = t.user_id AND s.session_id = t.session_id
+      {where}
+      GROUP BY t.user_id, t.session_id
+      ORDER BY t.user_id, t.session_id
+      LIMIT ?
+"""
+
+
+def list_sessions(
+    limit: int, after: Tuple[str, str] | None = None
+) -> List[Dict[str, Any]]:
+    """One page of sessions ordered by (user_id, session_id), starting after ``after``.
+
+    A single aggregate query over the (user_id, session_id, id) index with the summary
+    flag joined in, instead of one summaries lookup per session.
+    """
+    conn = get_conn()
+    # separate statements for the first and later pages: an "? IS NULL OR ..." guard
+    # would keep the planner from seeking to the cursor
+    if after is None:
+        rows = conn.execute(_LIST_SESSIONS.format(where=""), (limit,)).fetchall()
+    else:
+        rows = conn.execute(
+            _LIST_SESSIONS.format(where="WHERE (t.user_id, t.session_id) > (?, ?)"),
+            (after[0], after[1], limit),
+        ).fetchall()
+    return [
+        {"user_id": u, "session_id": s_, "turns": int(n), "summary": bool(has)}
+        for u, s_, n, has in rows
+    ]
+
+
+def session_stats(top: int) -> Dict[str, Any]:
+    """Totals plus the ``top`` sessions with the most turns, aggregated in SQLite."""
+    conn = get_conn()
+    sessions, turns = conn.execute(
+        """
+      SELECT COUNT(1), COALESCE(SUM(n), 0)
+      FROM (SELECT COUNT(1) AS n FROM turns GROUP BY user_id, session_id)
+    """
+    ).fetchone()
+    heavy = (
+        conn.execute(
+            """
+      SELECT user_id, session_id, COUNT(1) AS n FROM turns
+      GROUP BY user_id, session_id
+      ORDER BY n DESC, user_id, session_id
+      LIMIT ?
+    """,
+            (top,),
+        ).fetchall()
+        if top > 0
+        else []
     )
+    return {
+        "sessions_total": int(sessions),
+        "turns_total": int(turns),
+        "heavy_sessions": [
+            {"user_id": u, "session_id": s_, "turns": int(n)} for u, s_, n in heavy
+        ],
+    }
+
+
+class SearchUnavailable(RuntimeError):
+    """Raised when the DB has no full-text index (SQLite built without FTS5)."""
+
+
+_FTS_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_query(text: str) -> str:
+    # quote every word so user input can never be parsed as FTS5 query syntax;
+    # OR lets bm25 rank partial matches instead of requiring every term
+    terms = dict.fromkeys(t.lower() for t in _FTS_TERM_RE.findall(text or ""))
+    return " OR ".join(f'"{t}"' for t in terms)
+
+
+def search_turns(
+    user_id: str, query: str, session_id: str | None = None, limit: int = 10
+) -> List[Dict[str, Any]]:
+    """Turns of ``user_id`` matching ``query``, best bm25 match first.
+
+    Only committed turns inside the retention window are searched; each hit carries
+    a highlighted snippet. Raises SearchUnavailable when the DB has no FTS index.
+    """
+    match = _fts_query(query)
+    if not match:
+        return []
+    conn = get_conn()
+    if conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='turns_fts'"
+    ).fetchone() is None:
+        raise SearchUnavailable("full-text search is not available")
+    cutoff = _retention_cutoff()
+    rows = conn.execute(
+        """
+      SELECT t.id, t.session_id, t.role, t.content, t.timestamp,
+             snippet(turns_fts, 0, '[', ']', '...', 16), bm25(turns_fts)
+      FROM turns_fts
+      JOIN turns t ON t.id = turns_fts.rowid
+      WHERE turns_fts MATCH ? AND t.user_id = ?
+        AND (? IS NULL OR t.session_id = ?)
+        AND (? IS NULL OR t.ts >= ?)
+      ORDER BY bm25(turns_fts)
+      LIMIT ?
+    """,
+        (match, user_id, session_id, session_id, cutoff, cutoff, limit),
+    ).fetchall()
+    return [
+        {
+            "id": int(tid),
+            "session_id": sid,
+            "role": role,
+            "content": content,
+            "timestamp": ts,
+            "snippet": snip,
+            # bm25() is lower-is-better; flip it so higher scores rank first
+            "score": round(-float(rank), 6),
+        }
+        for tid, sid, role, content, ts, snip, rank in rows
+    ]
+
+
+def _delete_batched(
+    conn: sqlite3.Connection, where: str, params: Tuple[Any, ...], batch: int
+) -> int:
+    # short transactions so request threads are never blocked behind one large DELETE
+    deleted = 0
+    while True:
+        cur = conn.execute(
+            f"DELETE FROM turns WHERE id IN (SELECT id FROM turns WHERE {where} LIMIT ?)",
+            (*params, batch),
+        )
+        conn.commit()
+        n = max(cur.rowcount, 0)
+        deleted += n
+        if n < batch:
+            return deleted
+
+
+def sweep_short_memory(batch_size: int | None = None) -> Dict[str, int]:
+    """Delete expired and over-cap turns across all sessions in batches.
+
+    Returns the number of turns removed per reason (``retention`` and ``cap``).
+    """
+    start = time.perf_counter()
+    batch = batch_size or get_sweep_batch_size()
+    conn = get_conn()
+    pruned = {"retention": 0, "cap": 0}
+    cutoff = _retention_cutoff()
+    if cutoff is not None:
+        pruned["retention"] = _delete_batched(conn, "ts < ?", (cutoff,), batch)
+    cap = get_max_turns_per_session()
+    if cap and cap > 0:
+        over = conn.execute(
+            """
+          SELECT user_id, session_id FROM turns
+          GROUP BY user_id, session_id HAVING COUNT(1) > ?
+        """,
+            (cap,),
+        ).fetchall()
+        for user_id, session_id in over:
+            # id of the newest turn that no longer fits under the cap
+            row = conn.execute(
+                """
+              SELECT id FROM turns WHERE user_id=? AND session_id=?
+              ORDER BY id DESC LIMIT 1 OFFSET ?
+            """,
+                (user_id, session_id, cap),
+            ).fetchone()
+            if row is not None:
+                pruned["cap"] += _delete_batched(
+                    conn,
+                    "user_id=? AND session_id=? AND id <= ?",
+                    (user_id, session_id, row[0]),
+                    batch,
+                )
     conn.commit()
-    conn.close()
+    for reason, n in pruned.items():
+        if n:
+            memory_short_pruned.labels(reason=reason).inc(n)
+    total = pruned["retention"] + pruned["cap"]
+    _SWEEP_STATS["sweeps"] += 1
+    _SWEEP_STATS["pruned_total"] += total
+    _SWEEP_STATS["last_pruned"] = total
+    _SWEEP_STATS["last_duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    _SWEEP_STATS["last_run_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    if total:
+        logger.info({"event": "short_memory_swept", **pruned})
+    return pruned
+
+
+def get_sweep_stats() -> Dict[str, Any]:
+    return dict(_SWEEP_STATS)
+
+
+def start_sweep_worker() -> bool:
+    global _sweep_worker
+    if _sweep_worker is not None and _sweep_worker.running:
+        return False
+    _sweep_worker = PeriodicWorker(
+        "memory-short-retention", get_sweep_interval(), sweep_short_memory
+    )
+    return _sweep_worker.start()
+
+
+def stop_sweep_worker() -> None:
+    global _sweep_worker
+    if _sweep_worker is not None:
+        _sweep_worker.stop()
+        _sweep_worker = None
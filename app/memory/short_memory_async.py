@@ -0,0 +1,84 @@
+"""
+Awaitable short-term memory API for async request handlers.
+
+Each coroutine runs the matching function of app.memory.short_memory on a dedicated
+DB thread, so SQLite I/O never blocks the event loop. The thread keeps its own pooled
+connection, and serializing calls onto it matches SQLite's single-writer model.
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Tuple, TypeVar
+
+from app.memory import short_memory
+
+T = TypeVar("T")
+
+_EXECUTOR: ThreadPoolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_async_threads() -> int:
+    return max(1, int(os.getenv("MEMORY_SHORT_ASYNC_THREADS", "1")))
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=get_async_threads(), thread_name_prefix="short-memory-db"
+            )
+        return _EXECUTOR
+
+
+async def _run(fn: Callable[..., T], *args: Any) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor(), functools.partial(fn, *args))
+
+
+async def init_short_memory(db_path: str | None = None) -> None:
+    await _run(short_memory.init_short_memory, db_path)
+
+
+async def load_turns(user_id: str, session_id: str) -> List[Tuple[str, str]]:
+    return await _run(short_memory.load_turns, user_id, session_id)
+
+
+async def load_summary(user_id: str, session_id: str) -> str:
+    return await _run(short_memory.load_summary, user_id, session_id)
+
+
+async def save_turn(user_id: str, session_id: str, role: str, content: str) -> None:
+    await _run(short_memory.save_turn, user_id, session_id, role, content)
+
+
+async def save_turns(
+    user_id: str, session_id: str, turns: List[Tuple[str, str]]
+) -> None:
+    """Save several turns of one session in a single hop to the DB thread."""
+
+    def _save_all() -> None:
+        for role, content in turns:
+            short_memory.save_turn(user_id, session_id, role, content)
+
+    await _run(_save_all)
+
+
+async def update_summary_if_needed(user_id: str, session_id: str) -> bool:
+    return await _run(short_memory.update_summary_if_needed, user_id, session_id)
+
+
+async def clear_short_memory(user_id: str, session_id: str) -> None:
+    await _run(short_memory.clear_short_memory, user_id, session_id)
+
+
+def shutdown_async_short_memory() -> None:
+    """Wait for queued calls and stop the DB thread (called on shutdown)."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        ex, _EXECUTOR = _EXECUTOR, None
+    if ex is not None:
+        ex.shutdown(wait=True)
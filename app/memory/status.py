@@ -0,0 +1,101 @@
+"""
+Cached aggregate snapshot of short- and long-term memory for /memory/status.
+
+Whole-store aggregates (totals, heaviest sessions and users) are computed off the
+request path and served from cache. A request that finds the snapshot older than
+MEMORY_STATUS_TTL_SEC gets the stale one and starts a single background rebuild, so
+nothing runs while /memory/status is not used. Only a request with no snapshot at
+all (first call, or MEMORY_DB_PATH changed) computes it inline.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SNAPSHOT: Dict[str, Any] | None = None
+_SNAPSHOT_AT = 0.0
+_SNAPSHOT_LOCK = threading.Lock()
+# held by the background rebuild; at most one runs at a time
+_REFRESH_LOCK = threading.Lock()
+_refresh_thread: threading.Thread | None = None
+
+
+def get_status_ttl() -> float:
+    return float(os.getenv("MEMORY_STATUS_TTL_SEC", "30"))
+
+
+def get_status_top_n() -> int:
+    return int(os.getenv("MEMORY_STATUS_TOP_N", "10"))
+
+
+def refresh_status_snapshot() -> Dict[str, Any]:
+    global _SNAPSHOT, _SNAPSHOT_AT
+    start = time.perf_counter()
+    top = get_status_top_n()
+    snap: Dict[str, Any] = {"short_memory": {}, "long_memory": {}}
+    try:
+        from app.memory.short_memory import get_db_path, session_stats
+
+        snap["db_path"] = get_db_path()
+        snap["short_memory"] = session_stats(top)
+    except Exception as e:  # noqa: BLE001
+        logger.warning({"event": "memory_status_short_error", "error": str(e)})
+    try:
+        from app.memory.long_memory import store_stats
+
+        snap["long_memory"] = store_stats(top)
+    except Exception as e:  # noqa: BLE001
+        logger.warning({"event": "memory_status_long_error", "error": str(e)})
+    snap["computed_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    snap["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOT = snap
+        _SNAPSHOT_AT = time.monotonic()
+    return snap
+
+
+def get_status_snapshot() -> Dict[str, Any]:
+    """Latest snapshot with its age in seconds; rebuilt only when older than the TTL."""
+    from app.memory.short_memory import get_db_path
+
+    with _SNAPSHOT_LOCK:
+        snap, at = _SNAPSHOT, _SNAPSHOT_AT
+    stale = snap is None or time.monotonic() - at > get_status_ttl()
+    if snap is not None and snap.get("db_path") != get_db_path():
+        snap = None  # DB switched (MEMORY_DB_PATH changed); never serve the old one
+    if snap is None:
+        snap = refresh_status_snapshot()
+        at = _SNAPSHOT_AT
+    elif stale:
+        refresh_status_in_background()
+    return {**snap, "age_sec": round(time.monotonic() - at, 3)}
+
+
+def refresh_status_in_background() -> bool:
+    """Rebuild the snapshot on a daemon thread unless a rebuild is already running."""
+    global _refresh_thread
+    if not _REFRESH_LOCK.acquire(blocking=False):
+        return False
+
+    def run() -> None:
+        try:
+            refresh_status_snapshot()
+        except Exception as e:  # noqa: BLE001
+            logger.error({"event": "memory_status_refresh_error", "error": str(e)})
+        finally:
+            _REFRESH_LOCK.release()
+
+    _refresh_thread = threading.Thread(target=run, name="memory-status-snapshot", daemon=True)
+    _refresh_thread.start()
+    return True
+
+
+def invalidate_status_snapshot() -> None:
+    global _SNAPSHOT
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOT = None
+
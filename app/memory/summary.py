@@ -0,0 +1,81 @@
+"""
+Incremental summary state for short-term memory sessions.
+
+A session's summary is a rolling window over its last MEMORY_SHORT_MAX_TURNS turns,
+trimmed to a character budget. The window is updated as turns are saved, so producing
+the summary never reloads the conversation. Optionally, an LLM compacts the window
+into a shorter summary off the request path.
+"""
+import os
+from collections import deque
+from typing import Deque, Iterable, Optional, Tuple
+
+
+def get_summary_char_budget() -> int:
+    return int(os.getenv("MEMORY_SHORT_SUMMARY_CHARS", "500"))
+
+
+def get_summary_mode() -> str:
+    mode = os.getenv("MEMORY_SHORT_SUMMARY_MODE", "rolling").lower()
+    return mode if mode in ("rolling", "llm") else "rolling"
+
+
+class RollingSummary:
+    """Last ``max_turns`` turns of a session plus the summary last written for it."""
+
+    __slots__ = ("max_turns", "lines", "stamps", "written")
+
+    def __init__(
+        self,
+        max_turns: int,
+        turns: Iterable[Tuple[str, str, int]] = (),
+        written: str = "",
+    ):
+        self.max_turns = max_turns
+        self.lines: Deque[str] = deque(maxlen=max(1, max_turns))
+        # timestamps of the newest max_turns + 1 turns, enough to apply the threshold
+        self.stamps: Deque[int] = deque(maxlen=max(0, max_turns) + 1)
+        for role, content, ts in turns:
+            self.push(role, content, ts)
+        self.written = written
+
+    def push(self, role: str, content: str, ts: int) -> None:
+        self.lines.append(f"{role}: {content}")
+        self.stamps.append(ts)
+
+    def over_threshold(self, cutoff: Optional[int], cap: int) -> bool:
+        """Whether more than ``max_turns`` turns are retained, counted like load_turns.
+
+        Retained turns are the newest ``cap`` (all when cap <= 0) not older than
+        ``cutoff``. Timestamps never decrease, so the oldest kept stamp decides.
+        """
+        if 0 < cap <= self.max_turns or len(self.stamps) < self.stamps.maxlen:
+            return False
+        return cutoff is None or self.stamps[0] >= cutoff
+
+    def text(self, budget: int | None = None) -> str:
+        budget = get_summary_char_budget() if budget is None else budget
+        snippet = "\n".join(self.lines)
+        return snippet if len(snippet) <= budget else snippet[-budget:]
+
+
+def compact_summary(previous: str, window: str) -> str:
+    """Ask the configured LLM to fold the recent window into the previous summary."""
+    from app.services.llm_client import LLMClient
+
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "You maintain a running summary of a conversation. Merge the recent turns "
+                "into the existing summary. Keep facts, decisions and open questions; be brief."
+            ),
+        },
+        {
+            "role": "user",
+            "content": f"Existing summary:\n{previous or '(none)'}\n\nRecent turns:\n{window}",
+        },
+    ]
+    text = (LLMClient().call(messages).get("text") or "").strip()
+    budget = get_summary_char_budget()
+    return text if len(text) <= budget else text[:budget]
@@ -3,7 +3,7 @@ import time
 from pathlib import Path
 from typing import List, Optional, Any, Dict
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 
 from app.routers.query import Citation
@@ -11,8 +11,8 @@ from app.services.langchain_rag import answer_with_citations
 from app.services.architect_agent import run_architect_agent
 from app.utils.rbac import is_allowed_grounded_query, parse_role
 from app.utils.prompts import load_prompt
-from app.utils.audit import make_hash, write_audit
-from db.session import get_session
+from app.utils.audit import audit_extras, make_hash, record_audit
+from app.utils.idempotency import idempotent
 
 router = APIRouter()
 
@@ -35,7 +35,12 @@ class ArchitectResponse(BaseModel):
 
 
 @router.post("/architect", response_model=ArchitectResponse, tags=["Architect"])
-def post_architect(request: Request, payload: ArchitectRequest):
+def post_architect(request: Request, response: Response, payload: ArchitectRequest):
+    # retries with the same X-Request-ID replay the first response
+    return idempotent(request, response, "/architect", payload, lambda: _post_architect(request, payload))
+
+
+def _post_architect(request: Request, payload: ArchitectRequest):
     # feature flag guard
     if os.getenv("PROJECT_GUIDE_ENABLED", "").lower() not in ("1", "true", "yes", "on"):
         raise HTTPException(status_code=404, detail="Architect mode not enabled")
@@ -182,21 +187,18 @@ def post_architect(request: Request, payload: ArchitectRequest):
     latency_ms = int((time.perf_counter() - start) * 1000)
     audit["latency_ms"] = latency_ms
 
-    db = get_session()
-    try:
-        write_audit(
-            db,
-            request_id=audit["request_id"],
-            endpoint=audit["endpoint"],
-            user_id=audit["user_id"],
-            tokens_prompt=None,
-            tokens_completion=None,
-            cost_usd=None,
-            latency_ms=latency_ms,
-            compliance_flag=False,
-        )
-    finally:
-        db.close()
+    record_audit(
+        request_id=audit["request_id"],
+        endpoint=audit["endpoint"],
+        user_id=audit["user_id"],
+        tokens_prompt=audit.get("llm_tokens_prompt"),
+        tokens_completion=audit.get("llm_tokens_completion"),
+        cost_usd=audit.get("llm_cost_usd"),
+        latency_ms=latency_ms,
+        compliance_flag=False,
+        model=audit.get("llm_model"),
+        extras=audit_extras(audit),
+    )
 
     # Ensure llm audit fields exposed in response when present (already merged, keep for safety)
     for k in ("llm_provider", "llm_model", "llm_tokens_prompt", "llm_tokens_completion", "llm_cost_usd"):
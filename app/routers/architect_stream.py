@@ -3,7 +3,7 @@ from typing import AsyncGenerator, Dict, Any
 from fastapi import APIRouter, Request, Query
 from fastapi.responses import StreamingResponse
 
-from app.services.architect_agent import run_architect_agent
+from app.services.architect_agent import arun_architect_agent
 
 router = APIRouter()
 
@@ -61,7 +61,8 @@ async def stream_architect(request: Request, question: str | None = None, sessio
             yield b"event: meta\ndata: {}\n\n"
         return StreamingResponse(_empty(), media_type="text/event-stream")
 
-    plan_obj, audit = run_architect_agent(q, session_id=session_id, user_id=user_id)
+    # memory, retrieval and LLM work run off the event loop
+    plan_obj, audit = await arun_architect_agent(q, session_id=session_id, user_id=user_id)
     # Convert plan to dict for streaming
     plan: Dict[str, Any] = plan_obj.model_dump() if hasattr(plan_obj, "model_dump") else dict(plan_obj)
     return StreamingResponse(_gen_sse(plan, audit), media_type="text/event-stream")
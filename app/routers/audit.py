@@ -0,0 +1,34 @@
+import time
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from app.utils.rbac import parse_role
+
+router = APIRouter()
+
+
+@router.post("/audit/export", response_model=dict)
+def post_audit_export(
+    req: Request,
+    chunk_rows: int | None = Query(None, ge=1, le=1_000_000),
+):
+    """Export audit rows added since the last export to day-partitioned Parquet (admin only)."""
+    role = parse_role(req)
+    if role != "admin":
+        raise HTTPException(status_code=403, detail="forbidden")
+    from app.utils.audit_export import EXPORT_LOCK, ExportUnavailable, export_audit
+
+    if not EXPORT_LOCK.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="an audit export is already running")
+    try:
+        stats = export_audit(chunk_rows=chunk_rows)
+    except ExportUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    finally:
+        EXPORT_LOCK.release()
+    audit = {
+        "request_id": getattr(req.state, "request_id", "unknown"),
+        "endpoint": "/audit/export",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    return {"export": stats, "audit": audit}
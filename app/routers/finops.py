@@ -0,0 +1,77 @@
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from pydantic import BaseModel
+
+from app.utils.rbac import parse_role
+
+router = APIRouter()
+
+_GROUP_COLUMNS = ("day", "user_id", "endpoint", "model")
+
+
+class FinopsUsageResponse(BaseModel):
+    usage: List[Dict[str, Any]]
+    totals: Dict[str, Any]
+    audit: dict
+
+
+@router.get("/finops/usage", response_model=FinopsUsageResponse)
+def get_finops_usage(
+    req: Request,
+    user_id: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    endpoint: Optional[str] = None,
+    model: Optional[str] = None,
+    group_by: str = Query("day,user_id", description="comma-separated: day,user_id,endpoint,model"),
+    limit: int = Query(1000, ge=1, le=10000),
+):
+    role = parse_role(req)
+    if role not in ("analyst", "admin"):
+        raise HTTPException(status_code=403, detail="forbidden")
+    keys = [k.strip() for k in group_by.split(",") if k.strip()]
+    bad = [k for k in keys if k not in _GROUP_COLUMNS]
+    if bad:
+        raise HTTPException(status_code=400, detail=f"unsupported group_by: {', '.join(bad)}")
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    from db.rollups import METRIC_COLUMNS, query_usage
+    from db.session import get_session
+
+    t0 = time.perf_counter()
+    db = get_session()
+    try:
+        usage = query_usage(
+            db,
+            start,
+            end,
+            user_id=user_id,
+            endpoint=endpoint,
+            model=model,
+            group_by=keys,
+            limit=limit,
+        )
+        # totals cover the whole filter, not just the rows that fit in ``limit``
+        grand = query_usage(
+            db, start, end, user_id=user_id, endpoint=endpoint, model=model, group_by=()
+        )
+    finally:
+        db.close()
+    totals: Dict[str, Any] = grand[0] if grand else {c: 0 for c in METRIC_COLUMNS}
+    totals["cost_usd"] = float(totals["cost_usd"])
+    audit = {
+        "request_id": getattr(req.state, "request_id", "unknown"),
+        "endpoint": "/finops/usage",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "rows": len(usage),
+        "duration_ms": round((time.perf_counter() - t0) * 1000, 3),
+    }
+    return {"usage": usage, "totals": totals, "audit": audit}
@@ -1,9 +1,13 @@
+import base64
+import json
 import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
 from app.utils.rbac import parse_role
 
@@ -20,6 +24,11 @@ class MemoryShortResponse(BaseModel):
     audit: dict
 
 
+class MemoryShortSearchResponse(BaseModel):
+    results: list
+    audit: dict
+
+
 class MemoryLongResponse(BaseModel):
     facts: list
     audit: dict
@@ -83,6 +92,41 @@ def get_short_memory(req: Request, user_id: str, session_id: str):
     return {"turns": turns, "summary": summary, "audit": audit}
 
 
+@router.get("/memory/short/search", response_model=MemoryShortSearchResponse)
+def search_short_memory(
+    req: Request,
+    user_id: str,
+    q: str = Query(..., min_length=1),
+    session_id: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+):
+    role = parse_role(req)
+    if role not in ("analyst", "admin"):
+        raise HTTPException(status_code=403, detail="forbidden")
+    enabled = os.getenv("MEMORY_SHORT_ENABLED", "false").lower() in (
+        "1",
+        "true",
+        "yes",
+        "on",
+    )
+    results: List[Dict[str, Any]] = []
+    if enabled:
+        from app.memory.short_memory import SearchUnavailable, search_turns
+
+        try:
+            results = search_turns(user_id, q, session_id=session_id, limit=limit)
+        except SearchUnavailable as e:
+            raise HTTPException(status_code=503, detail=str(e))
+    audit = {
+        "request_id": getattr(req.state, "request_id", "unknown"),
+        "endpoint": "/memory/short/search",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "memory_short_reads": len(results) if enabled else None,
+    }
+    audit = {k: v for k, v in audit.items() if v is not None}
+    return {"results": results, "audit": audit}
+
+
 @router.delete("/memory/short", response_model=dict)
 def delete_short_memory(req: Request, user_id: str, session_id: str):
     role = parse_role(req)
@@ -202,11 +246,29 @@ def delete_long_memory(req: Request, user_id: str):
     return {"cleared": bool(cleared), "audit": audit}
 
 
+def _encode_cursor(user_id: str, session_id: str) -> str:
+    raw = json.dumps([user_id, session_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        u, s = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(u), str(s)
+    except Exception:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+
 @router.get("/memory/status", response_model=dict)
-def get_memory_status(req: Request):
+def get_memory_status(
+    req: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+):
     role = parse_role(req)
     if role != "admin":
         raise HTTPException(status_code=403, detail="forbidden")
+    after = _decode_cursor(cursor) if cursor else None
     # collect config
     cfg = {
         "MEMORY_SHORT_ENABLED": os.getenv("MEMORY_SHORT_ENABLED", "false"),
@@ -215,17 +277,30 @@ def get_memory_status(req: Request):
         "SHORT_MEMORY_MAX_TURNS_PER_SESSION": os.getenv(
             "SHORT_MEMORY_MAX_TURNS_PER_SESSION", "0"
         ),
+        "MEMORY_SHORT_SWEEP_INTERVAL_SEC": os.getenv("MEMORY_SHORT_SWEEP_INTERVAL_SEC", "300"),
         "MEMORY_LONG_ENABLED": os.getenv("MEMORY_LONG_ENABLED", "false"),
         "MEMORY_LONG_RETENTION_DAYS": os.getenv("MEMORY_LONG_RETENTION_DAYS", "0"),
         "MEMORY_LONG_MAX_FACTS": os.getenv("MEMORY_LONG_MAX_FACTS", "0"),
+        "MEMORY_LONG_SWEEP_INTERVAL_SEC": os.getenv("MEMORY_LONG_SWEEP_INTERVAL_SEC", "300"),
+        "MEMORY_STATUS_TTL_SEC": os.getenv("MEMORY_STATUS_TTL_SEC", "30"),
         "MEMORY_COLLECTION_PREFIX": os.getenv("MEMORY_COLLECTION_PREFIX", "memory"),
     }
-    # short memory status
-    short = {"sessions": [], "db_ok": False}
+    # whole-store aggregates come from a TTL-cached snapshot
+    snapshot: Dict[str, Any] = {}
+    try:
+        from app.memory.status import get_status_snapshot
+
+        snapshot = get_status_snapshot()
+    except Exception:
+        pass
+    # short memory status: one page of sessions plus cached aggregates
+    short: Dict[str, Any] = {"sessions": [], "next_cursor": None, "db_ok": False}
+    short_swept_total = 0
     try:
-        import sqlite3
+        from app.memory.short_memory import get_db_path, get_sweep_stats, list_sessions
 
-        from app.memory.short_memory import get_db_path
+        short["retention_sweep"] = get_sweep_stats()
+        short_swept_total = int(short["retention_sweep"].get("pruned_total", 0))
 
         dbp = get_db_path()
         # health: file exists or directory writable
@@ -234,42 +309,34 @@ def get_memory_status(req: Request):
             short["db_ok"] = True
         except Exception:
             short["db_ok"] = False
-        # collect sessions and counts
-        conn = sqlite3.connect(dbp, check_same_thread=False)
-        c = conn.cursor()
-        c.execute(
-            "SELECT user_id, session_id, COUNT(1) FROM turns GROUP BY user_id, session_id"
-        )
-        for u, s, n in c.fetchall():
-            # check summary presence
-            c2 = conn.cursor()
-            c2.execute(
-                "SELECT 1 FROM summaries WHERE user_id=? AND session_id=?", (u, s)
+        # fetch one extra row to know whether another page follows
+        page = list_sessions(limit + 1, after=after)
+        if len(page) > limit:
+            page = page[:limit]
+            short["next_cursor"] = _encode_cursor(
+                page[-1]["user_id"], page[-1]["session_id"]
             )
-            has_sum = c2.fetchone() is not None
-            short["sessions"].append(
-                {
-                    "user_id": u,
-                    "session_id": s,
-                    "turns": int(n),
-                    "summary": bool(has_sum),
-                }
-            )
-        conn.close()
+        short["sessions"] = page
     except Exception:
         pass
-    # long memory status
-    long = {"users": [], "store_ok": True}
+    short.update(snapshot.get("short_memory") or {})
+    # long memory status: totals and heaviest users from the snapshot
+    long: Dict[str, Any] = {"users": [], "store_ok": True}
+    long_swept_total = 0
     try:
-        from app.memory.long_memory import _FACT_STORE
-
-        for u, facts in _FACT_STORE.items():
-            long["users"].append({"user_id": u, "facts": len(facts)})
+        from app.memory.long_memory import get_sweep_stats
+
+        stats = snapshot.get("long_memory") or {}
+        long["users"] = stats.get("heavy_users", [])
+        long["users_total"] = stats.get("users_total", 0)
+        long["facts_total"] = stats.get("facts_total", 0)
+        long["retention_sweep"] = get_sweep_stats()
+        long_swept_total = int(long["retention_sweep"].get("pruned_total", 0))
     except Exception:
         long["store_ok"] = False
     counters = {
-        "memory_short_pruned_total": _memory_short_pruned_total,
-        "memory_long_pruned_total": _memory_long_pruned_total,
+        "memory_short_pruned_total": _memory_short_pruned_total + short_swept_total,
+        "memory_long_pruned_total": _memory_long_pruned_total + long_swept_total,
     }
     audit = {
         "request_id": getattr(req.state, "request_id", "unknown"),
@@ -281,6 +348,11 @@ def get_memory_status(req: Request):
         "short_memory": short,
         "long_memory": long,
         "counters": counters,
+        "snapshot": {
+            "computed_at": snapshot.get("computed_at"),
+            "age_sec": snapshot.get("age_sec"),
+            "duration_ms": snapshot.get("duration_ms"),
+        },
         "audit": audit,
     }
 
@@ -301,17 +373,12 @@ def export_long_memory(req: Request, user_id: str):
     pruned_long = 0
     if enabled:
         try:
-            import time as _t
+            from app.memory.long_memory import _FACT_STORE, _retention_cutoff, export_facts
 
-            from app.memory.long_memory import _FACT_STORE, MEMORY_LONG_RETENTION_DAYS
-
-            facts = list(_FACT_STORE.get(user_id, []))
-            # apply retention pruning for export view, count how many would be pruned
-            if MEMORY_LONG_RETENTION_DAYS and MEMORY_LONG_RETENTION_DAYS > 0:
-                cutoff = _t.time() - (MEMORY_LONG_RETENTION_DAYS * 86400)
-                before = len(facts)
-                facts = [f for f in facts if f.get("created_at", 0) >= cutoff]
-                pruned_long = before - len(facts)
+            # hide expired facts from the export view, count how many the sweeper will prune
+            before = len(_FACT_STORE.get(user_id) or ())
+            facts = export_facts(user_id, min_created_at=_retention_cutoff())
+            pruned_long = max(0, before - len(facts))
             # enrich with export extras
             for f in facts:
                 vec = f.get("embedding")
@@ -380,3 +447,163 @@ def import_long_memory(req: Request, user_id: str, payload: MemoryImportPayload)
     }
     audit = {k: v for k, v in audit.items() if v is not None}
     return {"imported": imported, "audit": audit}
+
+
+@router.get(
+    "/memory/long/export/ndjson",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            }
+        }
+    },
+)
+def export_long_memory_ndjson(
+    req: Request,
+    user_id: str,
+    embeddings: Literal["none", "json", "base64"] = "none",
+):
+    role = parse_role(req)
+    if role not in ("analyst", "admin"):
+        raise HTTPException(status_code=403, detail="forbidden")
+    enabled = os.getenv("MEMORY_LONG_ENABLED", "false").lower() in (
+        "1",
+        "true",
+        "yes",
+        "on",
+    )
+    request_id = getattr(req.state, "request_id", "unknown")
+
+    def _lines():
+        # one fact per line, generated lazily; the final line carries the audit counters
+        exported = 0
+        if enabled:
+            from app.memory.long_memory import _retention_cutoff, iter_export_records
+            from app.utils.metrics import memory_long_export_facts
+
+            for rec in iter_export_records(
+                user_id, embeddings, min_created_at=_retention_cutoff()
+            ):
+                exported += 1
+                memory_long_export_facts.inc()
+                yield (json.dumps(rec) + "\n").encode()
+        audit = {
+            "request_id": request_id,
+            "endpoint": "/memory/long/export/ndjson",
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "memory_long_reads": exported if enabled else None,
+        }
+        audit = {k: v for k, v in audit.items() if v is not None}
+        yield (json.dumps({"audit": audit}) + "\n").encode()
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
+@router.post("/memory/long/import/ndjson", response_model=dict)
+async def import_long_memory_ndjson(req: Request, user_id: str):
+    role = parse_role(req)
+    if role not in ("analyst", "admin"):
+        raise HTTPException(status_code=403, detail="forbidden")
+    enabled = os.getenv("MEMORY_LONG_ENABLED", "false").lower() in (
+        "1",
+        "true",
+        "yes",
+        "on",
+    )
+    imported = 0
+    skipped = 0
+    batches = 0
+    pruned_long = 0
+    if enabled:
+        from app.memory.long_memory import (
+            get_import_batch_size,
+            get_import_max_line_bytes,
+            ingest_facts,
+        )
+        from app.utils.metrics import memory_long_import_facts
+
+        batch_size = get_import_batch_size()
+        max_line = get_import_max_line_bytes()
+        batch: List[Dict[str, Any]] = []
+        buf = bytearray()
+        # set while discarding the rest of a line that outgrew max_line
+        overlong = False
+
+        async def _flush():
+            nonlocal imported, batches, pruned_long, batch
+            if not batch:
+                return
+            res = await run_in_threadpool(ingest_facts, user_id, batch)
+            imported += res["imported"]
+            pruned_long += res["evicted"]
+            batches += 1
+            memory_long_import_facts.inc(res["imported"])
+            batch = []
+
+        def _parse(line: bytes):
+            nonlocal skipped
+            line = line.strip()
+            if not line:
+                return
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                skipped += 1
+                return
+            if isinstance(rec, dict) and "audit" in rec and "text" not in rec:
+                return  # trailer line written by the NDJSON export
+            if (
+                not isinstance(rec, dict)
+                or not isinstance(rec.get("text"), str)
+                or not rec["text"]
+                or not isinstance(rec.get("metadata"), (dict, type(None)))
+            ):
+                skipped += 1
+                return
+            batch.append(rec)
+
+        # parse line by line as the body arrives; ingest in bounded batches.
+        # Only the new bytes are searched for newlines, and a pending line is held
+        # up to max_line bytes; longer lines are dropped and counted as skipped.
+        async for chunk in req.stream():
+            pos = len(buf)  # the pending partial line has no newline
+            buf += chunk
+            start = 0
+            while True:
+                nl = buf.find(b"\n", pos)
+                if nl < 0:
+                    break
+                if overlong:
+                    overlong = False
+                elif nl - start > max_line:
+                    skipped += 1
+                else:
+                    _parse(bytes(buf[start:nl]))
+                start = pos = nl + 1
+                if len(batch) >= batch_size:
+                    await _flush()
+            del buf[:start]
+            if len(buf) > max_line:
+                if not overlong:
+                    skipped += 1
+                    overlong = True
+                buf.clear()
+        if not overlong:
+            _parse(bytes(buf))
+        await _flush()
+        try:
+            global _memory_long_pruned_total
+            _memory_long_pruned_total += pruned_long
+        except Exception:
+            pass
+    audit = {
+        "request_id": getattr(req.state, "request_id", "unknown"),
+        "endpoint": "/memory/long/import/ndjson",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "memory_long_writes": imported if enabled else None,
+        "memory_long_pruned": pruned_long if enabled else None,
+    }
+    audit = {k: v for k, v in audit.items() if v is not None}
+    return {"imported": imported, "skipped": skipped, "batches": batches, "audit": audit}
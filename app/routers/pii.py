@@ -6,7 +6,7 @@ from fastapi import APIRouter, Request
 from pydantic import BaseModel, Field
 
 from app.services.pii_detector import detect_pii
-from app.utils.audit import make_hash, write_audit
+from app.utils.audit import audit_extras, make_hash, record_audit
 from app.utils.cost import estimate_tokens_and_cost
 from app.utils.rbac import parse_role
 
@@ -83,26 +83,20 @@ def post_pii(req: Request, payload: PiiRequest):
 
     # Persist audit
     try:
-        from db.session import get_session, init_db
-
-        init_db()
-        db = get_session()
-        try:
-            write_audit(
-                db,
-                request_id=audit.get("request_id"),
-                endpoint=audit.get("endpoint"),
-                user_id=None,
-                tokens_prompt=audit.get("tokens_prompt"),
-                tokens_completion=audit.get("tokens_completion"),
-                cost_usd=audit.get("cost_usd"),
-                latency_ms=audit.get("latency_ms"),
-                compliance_flag=False,
-                prompt_hash=audit.get("prompt_hash"),
-                response_hash=audit.get("response_hash"),
-            )
-        finally:
-            db.close()
+        record_audit(
+            request_id=audit.get("request_id"),
+            endpoint=audit.get("endpoint"),
+            user_id=None,
+            tokens_prompt=audit.get("tokens_prompt"),
+            tokens_completion=audit.get("tokens_completion"),
+            cost_usd=audit.get("cost_usd"),
+            latency_ms=audit.get("latency_ms"),
+            compliance_flag=False,
+            prompt_hash=audit.get("prompt_hash"),
+            response_hash=audit.get("response_hash"),
+            model=model,
+            extras=audit_extras(audit),
+        )
     except Exception:
         pass
 
@@ -5,10 +5,9 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 
 from app.schemas.predict import PredictRequest, PredictResponse
 from app.services.mlflow_client import MLflowClientWrapper
-from app.utils.audit import make_hash, write_audit
+from app.utils.audit import audit_extras, make_hash, record_audit
 from app.utils.cost import estimate_tokens_and_cost
 from app.utils.rbac import require_role
-from db.session import get_session, init_db
 
 router = APIRouter()
 
@@ -105,27 +104,20 @@ def post_predict(
         "model_uri": model_uri,
     }
 
-    try:
-        init_db()
-    except Exception:
-        pass
-    db = get_session()
-    try:
-        write_audit(
-            db,
-            request_id=audit["request_id"],
-            endpoint=audit["endpoint"],
-            user_id=audit["user_id"],
-            tokens_prompt=audit["tokens_prompt"],
-            tokens_completion=audit["tokens_completion"],
-            cost_usd=audit["cost_usd"],
-            latency_ms=audit["latency_ms"],
-            compliance_flag=audit["compliance_flag"],
-            prompt_hash=audit["prompt_hash"],
-            response_hash=audit["response_hash"],
-        )
-    finally:
-        db.close()
+    record_audit(
+        request_id=audit["request_id"],
+        endpoint=audit["endpoint"],
+        user_id=audit["user_id"],
+        tokens_prompt=audit["tokens_prompt"],
+        tokens_completion=audit["tokens_completion"],
+        cost_usd=audit["cost_usd"],
+        latency_ms=audit["latency_ms"],
+        compliance_flag=audit["compliance_flag"],
+        prompt_hash=audit["prompt_hash"],
+        response_hash=audit["response_hash"],
+        model=model_name,
+        extras=audit_extras(audit),
+    )
 
     return PredictResponse(
         prediction=str(pred),
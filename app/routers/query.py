@@ -2,15 +2,15 @@ import os
 import time
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 
 # legacy RAGRetriever removed; using LangChain-only path
 from app.utils.rbac import is_allowed_grounded_query, parse_role
-from db.session import get_session
 
-from ..utils.audit import make_hash, write_audit
+from ..utils.audit import audit_extras, make_hash, record_audit
 from ..utils.cost import estimate_tokens_and_cost
+from ..utils.idempotency import idempotent
 
 router = APIRouter()
 
@@ -28,7 +28,7 @@ class AuditMeta(BaseModel):
     compliance_flag: bool = False
     prompt_hash: Optional[str] = None
     response_hash: Optional[str] = None
-    # Optional extras (not persisted to DB today)
+    # Optional extras (persisted in the audit extras JSON column)
     rag_backend: Optional[str] = None
     router_backend: Optional[str] = None
     router_intent: Optional[str] = None
@@ -67,7 +67,12 @@ class QueryResponse(BaseModel):
 
 
 @router.post("/query", response_model=QueryResponse)
-def post_query(req: Request, payload: QueryRequest):
+def post_query(req: Request, response: Response, payload: QueryRequest):
+    # retries with the same X-Request-ID replay the first response
+    return idempotent(req, response, "/query", payload, lambda: _post_query(req, payload))
+
+
+def _post_query(req: Request, payload: QueryRequest):
     start = time.perf_counter()
 
     # Denylist (Phase 1: env-based)
@@ -536,37 +541,21 @@ def post_query(req: Request, payload: QueryRequest):
         for k in ("memory_long_reads", "memory_long_writes", "memory_long_pruned"):
             response_audit.pop(k, None)
 
-    # Persist audit row, ensuring DB is initialized for current DB_URL
-    try:
-        from db.session import init_db
-
-        init_db()
-    except Exception:
-        pass
-
-    # Ensure DB is initialized for current DB_URL before getting session
-    try:
-        from db.session import init_db as _init_db
-        _init_db()
-    except Exception:
-        pass
-    db = get_session()
-    try:
-        write_audit(
-            db,
-            request_id=audit.request_id,
-            endpoint=audit.endpoint,
-            user_id=audit.user_id,
-            tokens_prompt=audit.tokens_prompt,
-            tokens_completion=audit.tokens_completion,
-            cost_usd=audit.cost_usd,
-            latency_ms=audit.latency_ms,
-            compliance_flag=audit.compliance_flag,
-            prompt_hash=audit.prompt_hash,
-            response_hash=audit.response_hash,
-        )
-    finally:
-        db.close()
+    # Persist audit row (schema is created once at startup)
+    record_audit(
+        request_id=audit.request_id,
+        endpoint=audit.endpoint,
+        user_id=audit.user_id,
+        tokens_prompt=audit.tokens_prompt,
+        tokens_completion=audit.tokens_completion,
+        cost_usd=audit.cost_usd,
+        latency_ms=audit.latency_ms,
+        compliance_flag=audit.compliance_flag,
+        prompt_hash=audit.prompt_hash,
+        response_hash=audit.response_hash,
+        model=llm_model or model,
+        extras=audit_extras(response_audit),
+    )
 
     # Update metrics
     try:
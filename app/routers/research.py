@@ -6,10 +6,9 @@ from fastapi import APIRouter, HTTPException, Request
 
 from app.schemas.research import AgentStep, Finding, ResearchRequest, ResearchResponse
 from app.services.agent import Agent
-from app.utils.audit import make_hash, write_audit
+from app.utils.audit import audit_extras, make_hash, record_audit
 from app.utils.cost import estimate_tokens_and_cost
 from app.utils.rbac import is_allowed_agent_step, parse_role
-from db.session import get_session, init_db
 
 router = APIRouter()
 
@@ -73,27 +72,20 @@ def post_research(req: Request, payload: ResearchRequest):
     }
 
     # Persist audit row
-    try:
-        init_db()
-    except Exception:
-        pass
-    db = get_session()
-    try:
-        write_audit(
-            db,
-            request_id=audit["request_id"],
-            endpoint=audit["endpoint"],
-            user_id=audit["user_id"],
-            tokens_prompt=audit["tokens_prompt"],
-            tokens_completion=audit["tokens_completion"],
-            cost_usd=audit["cost_usd"],
-            latency_ms=audit["latency_ms"],
-            compliance_flag=audit["compliance_flag"],
-            prompt_hash=audit["prompt_hash"],
-            response_hash=audit["response_hash"],
-        )
-    finally:
-        db.close()
+    record_audit(
+        request_id=audit["request_id"],
+        endpoint=audit["endpoint"],
+        user_id=audit["user_id"],
+        tokens_prompt=audit["tokens_prompt"],
+        tokens_completion=audit["tokens_completion"],
+        cost_usd=audit["cost_usd"],
+        latency_ms=audit["latency_ms"],
+        compliance_flag=audit["compliance_flag"],
+        prompt_hash=audit["prompt_hash"],
+        response_hash=audit["response_hash"],
+        model=model,
+        extras=audit_extras(audit),
+    )
 
     # Build response models
     out_findings: List[Finding] = [Finding(**f) for f in findings]
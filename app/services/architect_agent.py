@@ -2,7 +2,7 @@ import os
 from typing import Any, Dict, List, Tuple
 
 from langchain.output_parsers import PydanticOutputParser
-from app.services.llm_client import LLMClient
+from app.services.llm_client import AsyncLLMClient, LLMClient
 from app.services.architect_schema import ArchitectPlan
 from app.services.langchain_rag import answer_with_citations
 
@@ -25,68 +25,48 @@ def _build_messages(question: str, plan_parser: PydanticOutputParser, context_bl
     return messages
 
 
-def run_architect_agent(question: str, session_id: str | None = None, user_id: str | None = None) -> Tuple[ArchitectPlan, Dict[str, Any]]:
-    # Initialize memory flags and counters
+def _memory_debug(e: Exception) -> None:
+    if os.getenv("MEMORY_DEBUG", "").lower() in ("1","true","yes","on"):
+        try:
+            print(f"[MEMORY_DEBUG] memory op error: {e}")
+        except Exception:
+            pass
+
+
+def _flags() -> Tuple[bool, bool]:
     short_enabled = os.getenv("MEMORY_SHORT_ENABLED", "false").lower() in ("1", "true", "yes", "on")
     long_enabled = os.getenv("MEMORY_LONG_ENABLED", "false").lower() in ("1", "true", "yes", "on")
+    return short_enabled, long_enabled
 
-    memory_short_reads = 0
-    memory_short_writes = 0
-    memory_short_pruned = 0
-    summary_updated = False
-    memory_long_reads = 0
-    memory_long_writes = 0
-    memory_long_pruned = 0
 
-    uid = user_id or "anonymous"
-    sid = session_id or "default"
+def _short_context_block(turns: List[Tuple[str, str]], summary: str) -> str | None:
+    prefix = summary or "\n".join(f"{r}: {c}" for r, c in turns[-5:])  # last 5 turns
+    return f"Conversation context:\n{prefix}" if prefix else None
 
-    # Keep original question; build separate context blocks for memory
-    original_question = question
-    memory_context_block: str | None = None
-    facts_context_block: str | None = None
 
-    # 1a) Short-term memory: load conversation history
-    if short_enabled:
-        try:
-            from app.memory.short_memory import init_short_memory, load_summary, load_turns
+def _long_memory_context(uid: str, question: str) -> Tuple[str | None, int, int]:
+    """Relevant facts block plus (reads, pruned) counters for the audit."""
+    try:
+        from app.memory.long_memory import retrieve_facts
 
-            init_short_memory()
-            turns = load_turns(uid, sid)
-            memory_short_reads = len(turns)
-            memory_short_pruned = int(getattr(load_turns, "_last_pruned", 0))
-            prefix = load_summary(uid, sid) or "\n".join(f"{r}: {c}" for r, c in turns[-5:])  # last 5 turns
-            if prefix:
-                memory_context_block = f"Conversation context:\n{prefix}"
-            # Note: do not bump router-level globals from service; keep metrics in audit only
-        except Exception as e:
-            if os.getenv("MEMORY_DEBUG", "").lower() in ("1","true","yes","on"):
-                try:
-                    print(f"[MEMORY_DEBUG] memory op error: {e}")
-                except Exception:
-                    pass
-            pass
+        facts = retrieve_facts(uid, question, top_k=5)
+        pruned = int(getattr(retrieve_facts, "_last_pruned", 0))
+        block = None
+        if facts:
+            snippet = "\n".join(f"- {f['text']}" for f in facts)
+            block = f"Relevant background facts:\n{snippet}"
+        # Note: do not bump router-level globals from service; keep metrics in audit only
+        return block, len(facts), pruned
+    except Exception as e:
+        _memory_debug(e)
+        return None, 0, 0
 
-    # 1b) Long-term memory: retrieve relevant facts
-    if long_enabled:
-        try:
-            from app.memory.long_memory import retrieve_facts
-
-            facts = retrieve_facts(uid, original_question, top_k=5)
-            memory_long_reads = len(facts)
-            memory_long_pruned = int(getattr(retrieve_facts, "_last_pruned", 0))
-            if facts:
-                snippet = "\n".join(f"- {f['text']}" for f in facts)
-                facts_context_block = f"Relevant background facts:\n{snippet}"
-            # Note: do not bump router-level globals from service; keep metrics in audit only
-        except Exception as e:
-            if os.getenv("MEMORY_DEBUG", "").lower() in ("1","true","yes","on"):
-                try:
-                    print(f"[MEMORY_DEBUG] memory op error: {e}")
-                except Exception:
-                    pass
-            pass
 
+_Prepared = Tuple[List[Dict[str, str]], PydanticOutputParser, List[Dict[str, Any]], Dict[str, Any]]
+
+
+def _prepare(question: str, memory_context_block: str | None, facts_context_block: str | None) -> _Prepared:
+    """Retrieval and prompt building; returns (messages, parser, citations, rag meta)."""
     # 2) Retrieval
     citations: List[Dict[str, Any]] = []
     rag_meta: Dict[str, Any] = {}
@@ -121,12 +101,12 @@ def run_architect_agent(question: str, session_id: str | None = None, user_id: s
 
     # 2) Build messages with structured format instructions
     parser = PydanticOutputParser(pydantic_object=ArchitectPlan)
-    messages = _build_messages(original_question, parser, final_context if final_context else None)
+    messages = _build_messages(question, parser, final_context if final_context else None)
+    return messages, parser, citations, rag_meta
 
-    # 3) Call LLM
-    llm = LLMClient()
-    result = llm.call(messages)
 
+def _parse_plan(question: str, parser: PydanticOutputParser, result: Dict[str, Any], citations: List[Dict[str, Any]]) -> ArchitectPlan:
+    grounded_used = bool(citations)
     # 4) Parse structured output (fallback to defaults on error)
     text = result.get("text") or ""
     try:
@@ -158,74 +138,177 @@ def run_architect_agent(question: str, session_id: str | None = None, user_id: s
             )
             plan.tone_hint = plan.tone_hint or ("exploratory" if not grounded_used else "actionable")
     except Exception as e:
-            if os.getenv("MEMORY_DEBUG", "").lower() in ("1","true","yes","on"):
-                try:
-                    print(f"[MEMORY_DEBUG] memory op error: {e}")
-                except Exception:
-                    pass
-            pass
+        _memory_debug(e)
+
+    return plan
+
+
+def _plan(question: str, memory_context_block: str | None, facts_context_block: str | None) -> Tuple[ArchitectPlan, Dict[str, Any], Dict[str, Any]]:
+    """Retrieval, LLM call and structured parsing; returns (plan, llm result, rag meta)."""
+    messages, parser, citations, rag_meta = _prepare(question, memory_context_block, facts_context_block)
+    # 3) Call LLM
+    llm = LLMClient()
+    result = llm.call(messages)
+    return _parse_plan(question, parser, result, citations), result, rag_meta
+
+
+async def _aplan(question: str, memory_context_block: str | None, facts_context_block: str | None) -> Tuple[ArchitectPlan, Dict[str, Any], Dict[str, Any]]:
+    """_plan for async callers: retrieval in the threadpool, the LLM call awaited on the loop."""
+    from starlette.concurrency import run_in_threadpool
+
+    messages, parser, citations, rag_meta = await run_in_threadpool(
+        _prepare, question, memory_context_block, facts_context_block
+    )
+    result = await AsyncLLMClient().call(messages)
+    return _parse_plan(question, parser, result, citations), result, rag_meta
+
+
+def _ingest_plan_facts(uid: str, plan: ArchitectPlan) -> int:
+    writes = 0
+    try:
+        from app.memory.long_memory import ingest_fact
+
+        # Ingest summary
+        if plan.summary and len(plan.summary) > 50:
+            ingest_fact(uid, plan.summary)
+            writes += 1
+
+        # Ingest suggested steps
+        for step in (plan.suggested_steps or []):
+            if len(step) > 50:
+                ingest_fact(uid, step)
+                writes += 1
+
+        # Ingest feature request if present
+        if plan.feature_request and len(plan.feature_request) > 50:
+            ingest_fact(uid, plan.feature_request)
+            writes += 1
+    except Exception as e:
+        _memory_debug(e)
+    return writes
+
+
+def _assistant_turn(plan: ArchitectPlan) -> str:
+    # Save plan summary as assistant response
+    return plan.summary or "Generated architecture plan."
+
+
+def _build_audit(result: Dict[str, Any], rag_meta: Dict[str, Any], counters: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "llm_provider": result.get("provider"),
+        "llm_model": result.get("model"),
+        "llm_tokens_prompt": result.get("tokens_prompt"),
+        "llm_tokens_completion": result.get("tokens_completion"),
+        "llm_cost_usd": result.get("cost_usd"),
+        **rag_meta,
+        "memory_short_reads": int(counters.get("memory_short_reads") or 0),
+        "memory_short_writes": int(counters.get("memory_short_writes") or 0),
+        "memory_short_pruned": int(counters.get("memory_short_pruned") or 0),
+        "summary_updated": bool(counters.get("summary_updated")),
+        "memory_long_reads": int(counters.get("memory_long_reads") or 0),
+        "memory_long_writes": int(counters.get("memory_long_writes") or 0),
+        "memory_long_pruned": int(counters.get("memory_long_pruned") or 0),
+    }
+
+
+def run_architect_agent(question: str, session_id: str | None = None, user_id: str | None = None) -> Tuple[ArchitectPlan, Dict[str, Any]]:
+    short_enabled, long_enabled = _flags()
+    counters: Dict[str, Any] = {}
+    uid = user_id or "anonymous"
+    sid = session_id or "default"
+
+    # Keep original question; build separate context blocks for memory
+    memory_context_block: str | None = None
+    facts_context_block: str | None = None
+
+    # 1a) Short-term memory: load conversation history
+    if short_enabled:
+        try:
+            from app.memory.short_memory import init_short_memory, load_summary, load_turns
+
+            init_short_memory()
+            turns = load_turns(uid, sid)
+            counters["memory_short_reads"] = len(turns)
+            counters["memory_short_pruned"] = int(getattr(load_turns, "_last_pruned", 0))
+            memory_context_block = _short_context_block(turns, load_summary(uid, sid))
+        except Exception as e:
+            _memory_debug(e)
+
+    # 1b) Long-term memory: retrieve relevant facts
+    if long_enabled:
+        facts_context_block, reads, pruned = _long_memory_context(uid, question)
+        counters["memory_long_reads"] = reads
+        counters["memory_long_pruned"] = pruned
+
+    # 2-5) Retrieval, LLM call, parsing
+    plan, result, rag_meta = _plan(question, memory_context_block, facts_context_block)
 
     # 6) Save to memory after generating plan
     if short_enabled:
         try:
             from app.memory.short_memory import save_turn, update_summary_if_needed
 
-            save_turn(uid, sid, "user", original_question)
-            # Save plan summary as assistant response
-            assistant_response = plan.summary or "Generated architecture plan."
-            save_turn(uid, sid, "assistant", assistant_response)
-            memory_short_writes = 2
-            summary_updated = update_summary_if_needed(uid, sid)
+            save_turn(uid, sid, "user", question)
+            save_turn(uid, sid, "assistant", _assistant_turn(plan))
+            counters["memory_short_writes"] = 2
+            counters["summary_updated"] = update_summary_if_needed(uid, sid)
         except Exception as e:
-            if os.getenv("MEMORY_DEBUG", "").lower() in ("1","true","yes","on"):
-                try:
-                    print(f"[MEMORY_DEBUG] memory op error: {e}")
-                except Exception:
-                    pass
-            pass
+            _memory_debug(e)
+
+    if long_enabled:
+        counters["memory_long_writes"] = _ingest_plan_facts(uid, plan)
+
+    # 7) Build audit fields with memory counters
+    return plan, _build_audit(result, rag_meta, counters)
+
+
+async def arun_architect_agent(question: str, session_id: str | None = None, user_id: str | None = None) -> Tuple[ArchitectPlan, Dict[str, Any]]:
+    """Async variant of run_architect_agent for async handlers.
+
+    Short-term memory goes through the awaitable short-memory API (dedicated DB
+    thread) and the LLM call through AsyncLLMClient; long-term memory and retrieval
+    run in the threadpool, so the event loop is never blocked.
+    """
+    from starlette.concurrency import run_in_threadpool
+
+    short_enabled, long_enabled = _flags()
+    counters: Dict[str, Any] = {}
+    uid = user_id or "anonymous"
+    sid = session_id or "default"
+
+    memory_context_block: str | None = None
+    facts_context_block: str | None = None
+
+    if short_enabled:
+        try:
+            from app.memory import short_memory_async as sm
+
+            await sm.init_short_memory()
+            turns = await sm.load_turns(uid, sid)
+            counters["memory_short_reads"] = len(turns)
+            counters["memory_short_pruned"] = 0  # reads never prune
+            memory_context_block = _short_context_block(turns, await sm.load_summary(uid, sid))
+        except Exception as e:
+            _memory_debug(e)
 
     if long_enabled:
+        facts_context_block, reads, pruned = await run_in_threadpool(_long_memory_context, uid, question)
+        counters["memory_long_reads"] = reads
+        counters["memory_long_pruned"] = pruned
+
+    plan, result, rag_meta = await _aplan(question, memory_context_block, facts_context_block)
+
+    if short_enabled:
         try:
-            from app.memory.long_memory import ingest_fact
-
-            # Ingest summary
-            if plan.summary and len(plan.summary) > 50:
-                ingest_fact(uid, plan.summary)
-                memory_long_writes += 1
-
-            # Ingest suggested steps
-            for step in (plan.suggested_steps or []):
-                if len(step) > 50:
-                    ingest_fact(uid, step)
-                    memory_long_writes += 1
-
-            # Ingest feature request if present
-            if plan.feature_request and len(plan.feature_request) > 50:
-                ingest_fact(uid, plan.feature_request)
-                memory_long_writes += 1
+            from app.memory import short_memory_async as sm
+
+            await sm.save_turns(uid, sid, [("user", question), ("assistant", _assistant_turn(plan))])
+            counters["memory_short_writes"] = 2
+            counters["summary_updated"] = await sm.update_summary_if_needed(uid, sid)
         except Exception as e:
-            if os.getenv("MEMORY_DEBUG", "").lower() in ("1","true","yes","on"):
-                try:
-                    print(f"[MEMORY_DEBUG] memory op error: {e}")
-                except Exception:
-                    pass
-            pass
+            _memory_debug(e)
 
-    # 7) Build audit fields with memory counters
-    audit: Dict[str, Any] = {
-        "llm_provider": result.get("provider"),
-        "llm_model": result.get("model"),
-        "llm_tokens_prompt": result.get("tokens_prompt"),
-        "llm_tokens_completion": result.get("tokens_completion"),
-        "llm_cost_usd": result.get("cost_usd"),
-        **rag_meta,
-        "memory_short_reads": int(memory_short_reads or 0),
-        "memory_short_writes": int(memory_short_writes or 0),
-        "memory_short_pruned": int(memory_short_pruned or 0),
-        "summary_updated": bool(summary_updated),
-        "memory_long_reads": int(memory_long_reads or 0),
-        "memory_long_writes": int(memory_long_writes or 0),
-        "memory_long_pruned": int(memory_long_pruned or 0),
-    }
+    if long_enabled:
+        counters["memory_long_writes"] = await run_in_threadpool(_ingest_plan_facts, uid, plan)
 
-    return plan, audit
+    return plan, _build_audit(result, rag_meta, counters)
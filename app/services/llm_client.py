@@ -1,12 +1,24 @@
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.llm_pool import (
+    get_async_http_client,
+    get_async_openai_client,
+    get_http_client,
+    get_openai_client,
+    provider_slot,
+)
 
 # Provider-agnostic LLM client with safe offline stub by default.
 # Returns a structured dict with text and audit metadata. When providers fail
 # or are not configured, it falls back to a deterministic stub to keep tests stable.
+# HTTP connections are pooled per provider and shared by all instances (llm_pool),
+# so constructing an LLMClient per request is cheap.
+
 
+class _LLMConfig:
+    """Provider settings plus the request/response mapping shared by both clients."""
 
-class LLMClient:
     def __init__(self):
         self.provider = (os.getenv("LLM_PROVIDER", "stub") or "stub").lower()
         self.model = os.getenv("LLM_MODEL", "gpt-4o-mini")
@@ -37,100 +49,140 @@ class LLMClient:
             "cost_usd": 0.0,
         }
 
+    def _openai_kwargs(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+        }
+
+    def _openai_result(self, resp: Any) -> Dict[str, Any]:
+        choice = resp.choices[0]
+        text = getattr(choice.message, "content", "") or ""
+        tp = getattr(resp.usage, "prompt_tokens", None) or 0
+        tc = getattr(resp.usage, "completion_tokens", None) or 0
+        # Cost estimation is provider/model specific; best-effort zero unless configured elsewhere
+        return {
+            "text": text,
+            "provider": self.provider,
+            "model": self.model,
+            "tokens_prompt": tp,
+            "tokens_completion": tc,
+            "cost_usd": 0.0,
+        }
+
+    def _http_request(
+        self, messages: List[Dict[str, str]]
+    ) -> Optional[Tuple[str, Dict[str, str], Dict[str, Any], str]]:
+        """(url, headers, payload, model) for the plain-HTTP providers; None when not configured."""
+        if self.provider == "openrouter":
+            api_key = os.getenv("OPENROUTER_API_KEY")
+            if not api_key:
+                return None
+            headers = {
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            }
+            payload = {
+                "model": self.model,
+                "messages": messages,
+                "temperature": self.temperature,
+                "max_tokens": self.max_tokens,
+            }
+            return "https://openrouter.ai/api/v1/chat/completions", headers, payload, self.model
+        if self.provider == "azure":
+            # Azure OpenAI compatible API
+            api_key = os.getenv("AZURE_OPENAI_API_KEY")
+            endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+            deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT") or self.model
+            if not api_key or not endpoint:
+                return None
+            url = f"{endpoint}/openai/deployments/{deployment}/chat/completions?api-version=2024-02-15-preview"
+            headers = {
+                "api-key": api_key,
+                "Content-Type": "application/json",
+            }
+            payload = {
+                "messages": messages,
+                "temperature": self.temperature,
+                "max_tokens": self.max_tokens,
+            }
+            return url, headers, payload, deployment or self.model
+        return None
+
+    def _http_result(self, data: Dict[str, Any], model: str) -> Dict[str, Any]:
+        text = data.get("choices", [{}])[0].get("message", {}).get("content", "")
+        usage = data.get("usage", {})
+        tp = usage.get("prompt_tokens", 0)
+        tc = usage.get("completion_tokens", 0)
+        return {
+            "text": text,
+            "provider": self.provider,
+            "model": model,
+            "tokens_prompt": tp,
+            "tokens_completion": tc,
+            "cost_usd": 0.0,
+        }
+
+
+class LLMClient(_LLMConfig):
     def call(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
         provider = self.provider
         if provider == "stub":
             return self._stub_call(messages)
         try:
             if provider == "openai":
-                from openai import OpenAI  # type: ignore
-
                 api_key = os.getenv("OPENAI_API_KEY")
                 if not api_key:
                     return self._stub_call(messages)
-                client = OpenAI(api_key=api_key)
-                resp = client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens,
-                )
-                choice = resp.choices[0]
-                text = getattr(choice.message, "content", "") or ""
-                tp = getattr(resp.usage, "prompt_tokens", None) or 0
-                tc = getattr(resp.usage, "completion_tokens", None) or 0
-                # Cost estimation is provider/model specific; best-effort zero unless configured elsewhere
-                return {
-                    "text": text,
-                    "provider": provider,
-                    "model": self.model,
-                    "tokens_prompt": tp,
-                    "tokens_completion": tc,
-                    "cost_usd": 0.0,
-                }
-            if provider == "openrouter":
-                import requests  # type: ignore
-
-                api_key = os.getenv("OPENROUTER_API_KEY")
+                client = get_openai_client(api_key)
+                resp = client.chat.completions.create(**self._openai_kwargs(messages))
+                return self._openai_result(resp)
+            if provider in ("openrouter", "azure"):
+                req = self._http_request(messages)
+                if req is None:
+                    return self._stub_call(messages)
+                url, headers, payload, model = req
+                r = get_http_client(provider).post(url, json=payload, headers=headers)
+                return self._http_result(r.json(), model)
+        except Exception:
+            # Last resort: stub
+            return self._stub_call(messages)
+        # Unknown provider -> stub
+        return self._stub_call(messages)
+
+
+class AsyncLLMClient(_LLMConfig):
+    """Awaitable counterpart of LLMClient for async handlers; same result dict and stub fallback.
+
+    Requests go through the provider's pooled httpx.AsyncClient, so waiting on the
+    provider holds neither the event loop nor a threadpool thread. At most
+    LLM_MAX_CONCURRENCY requests per provider are in flight per event loop; the rest
+    wait for a slot.
+    """
+
+    async def call(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        provider = self.provider
+        if provider == "stub":
+            return self._stub_call(messages)
+        try:
+            if provider == "openai":
+                api_key = os.getenv("OPENAI_API_KEY")
                 if not api_key:
                     return self._stub_call(messages)
-                headers = {
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                }
-                payload = {
-                    "model": self.model,
-                    "messages": messages,
-                    "temperature": self.temperature,
-                    "max_tokens": self.max_tokens,
-                }
-                r = requests.post("https://openrouter.ai/api/v1/chat/completions", json=payload, headers=headers, timeout=30)
-                data = r.json()
-                text = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-                usage = data.get("usage", {})
-                tp = usage.get("prompt_tokens", 0)
-                tc = usage.get("completion_tokens", 0)
-                return {
-                    "text": text,
-                    "provider": provider,
-                    "model": self.model,
-                    "tokens_prompt": tp,
-                    "tokens_completion": tc,
-                    "cost_usd": 0.0,
-                }
-            if provider == "azure":
-                # Azure OpenAI compatible API
-                import requests  # type: ignore
-
-                api_key = os.getenv("AZURE_OPENAI_API_KEY")
-                endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-                deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT") or self.model
-                if not api_key or not endpoint:
+                client = get_async_openai_client(api_key)
+                async with provider_slot(provider):
+                    resp = await client.chat.completions.create(**self._openai_kwargs(messages))
+                return self._openai_result(resp)
+            if provider in ("openrouter", "azure"):
+                req = self._http_request(messages)
+                if req is None:
                     return self._stub_call(messages)
-                url = f"{endpoint}/openai/deployments/{deployment}/chat/completions?api-version=2024-02-15-preview"
-                headers = {
-                    "api-key": api_key,
-                    "Content-Type": "application/json",
-                }
-                payload = {
-                    "messages": messages,
-                    "temperature": self.temperature,
-                    "max_tokens": self.max_tokens,
-                }
-                r = requests.post(url, json=payload, headers=headers, timeout=30)
-                data = r.json()
-                text = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-                usage = data.get("usage", {})
-                tp = usage.get("prompt_tokens", 0)
-                tc = usage.get("completion_tokens", 0)
-                return {
-                    "text": text,
-                    "provider": provider,
-                    "model": deployment or self.model,
-                    "tokens_prompt": tp,
-                    "tokens_completion": tc,
-                    "cost_usd": 0.0,
-                }
+                url, headers, payload, model = req
+                async with provider_slot(provider):
+                    r = await get_async_http_client(provider).post(url, json=payload, headers=headers)
+                return self._http_result(r.json(), model)
         except Exception:
             # Last resort: stub
             return self._stub_call(messages)
@@ -0,0 +1,225 @@
+"""
+Process-wide HTTP clients for LLM providers.
+
+One httpx.Client per provider holds a keep-alive connection pool, so LLM calls after
+the first skip the TCP and TLS handshakes. The OpenAI SDK client is built on the same
+pooled transport. Pool size and timeouts come from LLM_POOL_* / LLM_*_TIMEOUT_SEC;
+connection reuse is exported as app_llm_http_requests_total{provider,connection}.
+
+Async callers (AsyncLLMClient) get an httpx.AsyncClient per provider and event loop,
+and provider_slot() bounds their in-flight requests per provider with a semaphore of
+LLM_MAX_CONCURRENCY (LLM_MAX_CONCURRENCY_<PROVIDER> overrides it for one provider).
+"""
+import asyncio
+import os
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Tuple
+
+import httpx
+
+from app.utils.metrics import llm_http_requests, llm_inflight, llm_slot_wait
+
+
+def get_pool_max_connections() -> int:
+    return int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "20"))
+
+
+def get_pool_max_keepalive() -> int:
+    return int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "10"))
+
+
+def get_pool_keepalive_sec() -> float:
+    return float(os.getenv("LLM_POOL_KEEPALIVE_SEC", "30"))
+
+
+def get_llm_timeout_sec() -> float:
+    return float(os.getenv("LLM_TIMEOUT_SEC", "30"))
+
+
+def get_llm_connect_timeout_sec() -> float:
+    return float(os.getenv("LLM_CONNECT_TIMEOUT_SEC", "5"))
+
+
+def get_max_concurrency(provider: str) -> int:
+    value = os.getenv(f"LLM_MAX_CONCURRENCY_{provider.upper()}") or os.getenv("LLM_MAX_CONCURRENCY", "100")
+    return max(1, int(value))
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=get_pool_max_connections(),
+        max_keepalive_connections=get_pool_max_keepalive(),
+        keepalive_expiry=get_pool_keepalive_sec(),
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(get_llm_timeout_sec(), connect=get_llm_connect_timeout_sec())
+
+
+class _ConnTrace:
+    """httpx trace hook; records whether the request had to open a connection."""
+
+    __slots__ = ("new",)
+
+    def __init__(self):
+        self.new = False
+
+    def __call__(self, name: str, info: Dict[str, Any]) -> None:
+        if name == "connection.connect_tcp.complete":
+            self.new = True
+
+
+class _AsyncConnTrace:
+    """_ConnTrace for async transports, where httpcore awaits the trace callback."""
+
+    __slots__ = ("new",)
+
+    def __init__(self):
+        self.new = False
+
+    async def __call__(self, name: str, info: Dict[str, Any]) -> None:
+        if name == "connection.connect_tcp.complete":
+            self.new = True
+
+
+def _count(provider: str, response: httpx.Response) -> None:
+    trace = response.request.extensions.get("trace")
+    if isinstance(trace, (_ConnTrace, _AsyncConnTrace)):
+        llm_http_requests.labels(provider=provider, connection="new" if trace.new else "reused").inc()
+
+
+def _hooks(provider: str) -> Dict[str, list]:
+    def on_request(request: httpx.Request) -> None:
+        request.extensions["trace"] = _ConnTrace()
+
+    def on_response(response: httpx.Response) -> None:
+        _count(provider, response)
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+def _async_hooks(provider: str) -> Dict[str, list]:
+    async def on_request(request: httpx.Request) -> None:
+        request.extensions["trace"] = _AsyncConnTrace()
+
+    async def on_response(response: httpx.Response) -> None:
+        _count(provider, response)
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+_CLIENTS: Dict[str, httpx.Client] = {}
+_OPENAI: Dict[str, Tuple[Any, httpx.Client]] = {}
+_LOCK = threading.Lock()
+
+
+class _LoopState:
+    """Async clients and semaphores of one event loop (they cannot be shared across loops)."""
+
+    def __init__(self):
+        self.clients: Dict[str, httpx.AsyncClient] = {}
+        self.openai: Dict[str, Tuple[Any, httpx.AsyncClient]] = {}
+        self.slots: Dict[str, asyncio.Semaphore] = {}
+
+
+_LOOPS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client(provider: str) -> httpx.Client:
+    """Shared pooled client for ``provider``; created on first use."""
+    with _LOCK:
+        client = _CLIENTS.get(provider)
+        if client is None or client.is_closed:
+            client = _CLIENTS[provider] = httpx.Client(
+                limits=_limits(), timeout=_timeout(), event_hooks=_hooks(provider)
+            )
+        return client
+
+
+def get_openai_client(api_key: str) -> Any:
+    """Shared OpenAI SDK client per API key, on the pooled "openai" transport."""
+    from openai import OpenAI  # type: ignore
+
+    http = get_http_client("openai")
+    with _LOCK:
+        cached = _OPENAI.get(api_key)
+        if cached is None or cached[1] is not http:
+            cached = _OPENAI[api_key] = (
+                OpenAI(api_key=api_key, http_client=http, timeout=_timeout()),
+                http,
+            )
+        return cached[0]
+
+
+def close_llm_clients() -> None:
+    with _LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+        _OPENAI.clear()
+    for client in clients:
+        client.close()
+
+
+def _loop_state() -> _LoopState:
+    loop = asyncio.get_running_loop()
+    with _LOCK:
+        state = _LOOPS.get(loop)
+        if state is None:
+            state = _LOOPS[loop] = _LoopState()
+        return state
+
+
+def get_async_http_client(provider: str) -> httpx.AsyncClient:
+    """Pooled async client for ``provider`` on the running event loop."""
+    state = _loop_state()
+    client = state.clients.get(provider)
+    if client is None or client.is_closed:
+        client = state.clients[provider] = httpx.AsyncClient(
+            limits=_limits(), timeout=_timeout(), event_hooks=_async_hooks(provider)
+        )
+    return client
+
+
+def get_async_openai_client(api_key: str) -> Any:
+    """AsyncOpenAI SDK client per API key, on the pooled async "openai" transport."""
+    from openai import AsyncOpenAI  # type: ignore
+
+    http = get_async_http_client("openai")
+    state = _loop_state()
+    cached = state.openai.get(api_key)
+    if cached is None or cached[1] is not http:
+        cached = state.openai[api_key] = (
+            AsyncOpenAI(api_key=api_key, http_client=http, timeout=_timeout()),
+            http,
+        )
+    return cached[0]
+
+
+@asynccontextmanager
+async def provider_slot(provider: str) -> AsyncIterator[None]:
+    """Hold one of the provider's LLM_MAX_CONCURRENCY in-flight slots on this loop."""
+    state = _loop_state()
+    sem = state.slots.get(provider)
+    if sem is None:
+        sem = state.slots[provider] = asyncio.Semaphore(get_max_concurrency(provider))
+    start = time.perf_counter()
+    async with sem:
+        llm_slot_wait.labels(provider=provider).observe(time.perf_counter() - start)
+        llm_inflight.labels(provider=provider).inc()
+        try:
+            yield
+        finally:
+            llm_inflight.labels(provider=provider).dec()
+
+
+async def aclose_llm_clients() -> None:
+    """Close the async clients of the running event loop."""
+    with _LOCK:
+        state = _LOOPS.pop(asyncio.get_running_loop(), None)
+    if state is not None:
+        for client in state.clients.values():
+            await client.aclose()
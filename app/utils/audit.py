@@ -1,11 +1,84 @@
 import hashlib
+import os
+import threading
+import time
+from collections import deque
 from datetime import datetime
-from typing import Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from app.utils.background import PeriodicWorker
 from app.utils.logger import get_logger
+from app.utils.metrics import (
+    audit_dropped,
+    audit_flush_latency,
+    audit_queue_delay,
+    audit_queue_depth,
+    audit_written,
+)
+from app.utils.audit_log import close_segment_logs, get_segment_log
 from db.models import Audit
+from db.partitions import get_audit_partitioning, partition_for
+from db.rollups import aggregate, upsert_usage
+
+logger = get_logger(__name__)
+
+_AUDIT_FIELDS = (
+    "request_id",
+    "endpoint",
+    "user_id",
+    "tokens_prompt",
+    "tokens_completion",
+    "cost_usd",
+    "latency_ms",
+    "prompt_hash",
+    "response_hash",
+)
+# keys of response audit dicts already stored in columns (or not worth storing)
+_BASE_KEYS = frozenset(_AUDIT_FIELDS) | {"compliance_flag", "created_at"}
+_JSON_TYPES = (str, int, float, bool, list, dict)
+
+# Async sink state: rows waiting for the writer, as (enqueued_at monotonic, row, model).
+# Flushes are serialized by _FLUSH_LOCK; _QUEUE_COND guards the queue itself.
+_QUEUE: Deque[Tuple[float, Dict[str, Any], Optional[str]]] = deque()
+_QUEUE_COND = threading.Condition()
+_FLUSH_LOCK = threading.Lock()
+_audit_worker: PeriodicWorker | None = None
+
+
+def get_audit_async_enabled() -> bool:
+    return os.getenv("AUDIT_ASYNC", "false").lower() in ("1", "true", "yes", "on")
+
+
+def get_audit_batch_size() -> int:
+    return max(1, int(os.getenv("AUDIT_BATCH_SIZE", "200")))
+
+
+def get_audit_flush_interval_ms() -> int:
+    return int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "200"))
+
+
+def get_audit_queue_max() -> int:
+    return max(1, int(os.getenv("AUDIT_QUEUE_MAX", "10000")))
+
+
+def get_audit_queue_policy() -> str:
+    policy = os.getenv("AUDIT_QUEUE_POLICY", "sync").lower()
+    return policy if policy in ("sync", "block", "drop") else "sync"
+
+
+def get_audit_block_timeout_ms() -> int:
+    return int(os.getenv("AUDIT_BLOCK_TIMEOUT_MS", "100"))
+
+
+def get_audit_backend() -> Tuple[str, Optional[str]]:
+    """("file", directory) for AUDIT_BACKEND_URL=file://<dir>, else ("sql", None) using DB_URL."""
+    url = os.getenv("AUDIT_BACKEND_URL", "").strip()
+    if url.startswith("file://"):
+        return "file", url[len("file://"):] or "./data/audit_log"
+    return "sql", None
 
 
 def make_hash(value: Optional[str]) -> Optional[str]:
@@ -16,26 +89,37 @@ def make_hash(value: Optional[str]) -> Optional[str]:
     return h.hexdigest()
 
 
-def write_audit(db: Session, **kwargs) -> Audit:
-    logger = get_logger(__name__)
+def audit_extras(audit: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Fields of a response audit dict that have no column of their own, for Audit.extras."""
+    extras = {
+        k: v
+        for k, v in audit.items()
+        if k not in _BASE_KEYS and v is not None and isinstance(v, _JSON_TYPES)
+    }
+    return extras or None
+
+
+def _audit_row(**kwargs) -> Dict[str, Any]:
     # Map incoming fields and default created_at
-    record = Audit(
-        request_id=kwargs.get("request_id"),
-        endpoint=kwargs.get("endpoint"),
-        user_id=kwargs.get("user_id"),
-        created_at=datetime.utcnow(),
-        tokens_prompt=kwargs.get("tokens_prompt"),
-        tokens_completion=kwargs.get("tokens_completion"),
-        cost_usd=kwargs.get("cost_usd"),
-        latency_ms=kwargs.get("latency_ms"),
-        compliance_flag=kwargs.get("compliance_flag", False),
-        prompt_hash=kwargs.get("prompt_hash"),
-        response_hash=kwargs.get("response_hash"),
-    )
+    row: Dict[str, Any] = {k: kwargs.get(k) for k in _AUDIT_FIELDS}
+    row["compliance_flag"] = kwargs.get("compliance_flag", False)
+    row["extras"] = kwargs.get("extras")
+    row["created_at"] = datetime.utcnow()
+    return row
+
+
+def write_audit(db: Session, **kwargs) -> Audit:
+    row = _audit_row(**kwargs)
+    record = Audit(**row)
     try:
-        db.add(record)
+        if get_audit_partitioning() == "day":
+            db.execute(insert(partition_for(db.get_bind(), row["created_at"])), [row])
+        else:
+            db.add(record)
+        # FinOps rollup in the same transaction, so usage always matches the audit rows
+        upsert_usage(db, aggregate([(row, kwargs.get("model"))]))
         db.commit()
-        db.refresh(record)
+        audit_written.inc()
     except Exception as e:  # noqa: BLE001
         db.rollback()
         # Log but do not raise, so API flow can continue
@@ -44,3 +128,161 @@ def write_audit(db: Session, **kwargs) -> Audit:
             extra={"request_id": kwargs.get("request_id"), "error": str(e)},
         )
     return record
+
+
+def _write_sync(**kwargs) -> None:
+    backend, directory = get_audit_backend()
+    if backend == "file":
+        try:
+            get_segment_log(directory).append([_audit_row(**kwargs)])
+            audit_written.inc()
+        except Exception as e:  # noqa: BLE001
+            logger.error(
+                "audit_write_failed",
+                extra={"request_id": kwargs.get("request_id"), "error": str(e)},
+            )
+        return
+    from db.session import get_session
+
+    db = get_session()
+    try:
+        write_audit(db, **kwargs)
+    finally:
+        db.close()
+
+
+def record_audit(**kwargs) -> None:
+    """Persist one audit row for a request.
+
+    With AUDIT_ASYNC on and the writer running (app lifespan), the row is queued and
+    committed in a later batch; otherwise it is written inline. When the queue holds
+    AUDIT_QUEUE_MAX rows, AUDIT_QUEUE_POLICY decides: sync writes inline, block waits
+    up to AUDIT_BLOCK_TIMEOUT_MS for room, drop discards the row.
+    """
+    worker = _audit_worker
+    if worker is None or not worker.running:
+        _write_sync(**kwargs)
+        return
+    row = _audit_row(**kwargs)
+    limit = get_audit_queue_max()
+    policy = get_audit_queue_policy()
+    with _QUEUE_COND:
+        if len(_QUEUE) >= limit and policy == "block":
+            _QUEUE_COND.wait_for(
+                lambda: len(_QUEUE) < limit, get_audit_block_timeout_ms() / 1000.0
+            )
+        full = len(_QUEUE) >= limit
+        if not full:
+            _QUEUE.append((time.monotonic(), row, kwargs.get("model")))
+            size = len(_QUEUE)
+    if full:
+        if policy == "sync":
+            _write_sync(**kwargs)
+        else:
+            audit_dropped.labels(reason="queue_full").inc()
+            logger.warning(
+                {"event": "audit_dropped", "request_id": row.get("request_id")}
+            )
+        return
+    audit_queue_depth.set(size)
+    if size >= get_audit_batch_size():
+        worker.trigger()
+
+
+def _group_by_table(db: Session, batch: List[Tuple[float, Dict[str, Any], Optional[str]]]) -> Dict[Any, List[Dict[str, Any]]]:
+    if get_audit_partitioning() != "day":
+        return {Audit.__table__: [row for _, row, _ in batch]}
+    engine = db.get_bind()
+    out: Dict[Any, List[Dict[str, Any]]] = {}
+    for _, row, _ in batch:
+        out.setdefault(partition_for(engine, row["created_at"]), []).append(row)
+    return out
+
+
+def _commit_batch(batch: List[Tuple[float, Dict[str, Any], Optional[str]]]) -> None:
+    backend, directory = get_audit_backend()
+    if backend == "file":
+        get_segment_log(directory).append([row for _, row, _ in batch])
+        return
+    from db.session import get_session
+
+    db = get_session()
+    try:
+        for table, rows in _group_by_table(db, batch).items():
+            db.execute(insert(table), rows)
+        upsert_usage(db, aggregate((row, model) for _, row, model in batch))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def flush_audit() -> int:
+    """Commit queued audit rows in batches of AUDIT_BATCH_SIZE.
+
+    Returns the number of rows written. A failed batch goes back to the head of the
+    queue and is retried on the next flush.
+    """
+    written = 0
+    batch_size = get_audit_batch_size()
+    with _FLUSH_LOCK:
+        while True:
+            with _QUEUE_COND:
+                n = min(batch_size, len(_QUEUE))
+                batch = [_QUEUE.popleft() for _ in range(n)]
+                _QUEUE_COND.notify_all()
+            if not batch:
+                break
+            start = time.perf_counter()
+            try:
+                _commit_batch(batch)
+            except Exception as e:  # noqa: BLE001
+                with _QUEUE_COND:
+                    _QUEUE.extendleft(reversed(batch))
+                logger.error({"event": "audit_flush_failed", "rows": len(batch), "error": str(e)})
+                break
+            now = time.monotonic()
+            audit_flush_latency.observe(time.perf_counter() - start)
+            for enqueued_at, _, _ in batch:
+                audit_queue_delay.observe(now - enqueued_at)
+            audit_written.inc(len(batch))
+            written += len(batch)
+    audit_queue_depth.set(len(_QUEUE))
+    return written
+
+
+def start_audit_writer() -> bool:
+    """Start the batching writer when AUDIT_ASYNC is on; until then writes are inline."""
+    global _audit_worker
+    if not get_audit_async_enabled():
+        return False
+    if _audit_worker is not None and _audit_worker.running:
+        return False
+    _audit_worker = PeriodicWorker(
+        "audit-writer",
+        get_audit_flush_interval_ms() / 1000.0,
+        flush_audit,
+        drain_on_stop=True,
+    )
+    return _audit_worker.start()
+
+
+def stop_audit_writer() -> None:
+    """Stop the writer, committing everything still queued."""
+    global _audit_worker
+    if _audit_worker is not None:
+        _audit_worker.stop()
+        _audit_worker = None
+    if _QUEUE:
+        flush_audit()
+    if _QUEUE:
+        # DB still failing on shutdown: the rows cannot be kept anywhere
+        with _QUEUE_COND:
+            lost: List[Any] = list(_QUEUE)
+            _QUEUE.clear()
+        audit_dropped.labels(reason="shutdown").inc(len(lost))
+        audit_queue_depth.set(0)
+        logger.error({"event": "audit_dropped_on_shutdown", "rows": len(lost)})
+    close_segment_logs()
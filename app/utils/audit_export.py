@@ -0,0 +1,268 @@
+"""
+Incremental Parquet export of audit rows for offline analytics.
+
+Rows are read in (created_at, id) order with keyset-paginated chunks of
+AUDIT_EXPORT_CHUNK_ROWS, so each query is short and memory stays bounded. They are
+written to hive-style day directories (day=YYYY-MM-DD/part-*.parquet) that pandas or
+pyarrow can read as one dataset. A per-table watermark records the last row exported,
+and the next run resumes after it; with the file audit backend, segments are read
+through the mmap reader and the watermark is a byte offset per segment. pyarrow is
+optional (pip install .[export]).
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, Table, and_, or_, select
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+WATERMARK_FILE = "_watermark.json"
+
+# one export at a time per process; files and watermark are not safe to share
+EXPORT_LOCK = threading.Lock()
+
+
+class ExportUnavailable(RuntimeError):
+    """Raised when pyarrow is not installed."""
+
+
+def get_export_dir() -> str:
+    return os.getenv("AUDIT_EXPORT_DIR", "./data/audit_export")
+
+
+def get_export_chunk_rows() -> int:
+    return max(1, int(os.getenv("AUDIT_EXPORT_CHUNK_ROWS", "10000")))
+
+
+def get_export_lag_sec() -> int:
+    return int(os.getenv("AUDIT_EXPORT_LAG_SEC", "60"))
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:  # pragma: no cover - depends on the environment
+        raise ExportUnavailable("pyarrow is required for audit export (pip install .[export])") from e
+    return pa, pq
+
+
+def _arrow_schema(pa, table: Table):
+    fields = []
+    for c in table.columns:
+        if isinstance(c.type, Boolean):
+            t = pa.bool_()
+        elif isinstance(c.type, Integer):
+            t = pa.int64()
+        elif isinstance(c.type, Float):
+            t = pa.float64()
+        elif isinstance(c.type, DateTime):
+            t = pa.timestamp("us")
+        else:
+            t = pa.string()
+        fields.append(pa.field(c.name, t))
+    return pa.schema(fields)
+
+
+def load_watermark(out_dir: str) -> Dict[str, Dict[str, Any]]:
+    path = os.path.join(out_dir, WATERMARK_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("tables", {})
+
+
+def _save_watermark(out_dir: str, marks: Dict[str, Dict[str, Any]]) -> None:
+    path = os.path.join(out_dir, WATERMARK_FILE)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"tables": marks}, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _source_tables(engine) -> List[Table]:
+    from db.models import Audit
+    from db.partitions import list_partitions, partition_table
+
+    return [Audit.__table__] + [partition_table(day) for day, _ in list_partitions(engine)]
+
+
+class _DayWriter:
+    """Writes one day's rows to a temp file, published by rename on close."""
+
+    def __init__(self, pq, schema, out_dir: str, day: str, run_id: str):
+        d = os.path.join(out_dir, f"day={day}")
+        os.makedirs(d, exist_ok=True)
+        self.path = os.path.join(d, f"part-{run_id}.parquet")
+        if os.path.exists(self.path):
+            # same run, another source table already wrote this day
+            self.path = os.path.join(d, f"part-{run_id}-{uuid.uuid4().hex[:6]}.parquet")
+        self.tmp = f"{self.path}.tmp"
+        self.day = day
+        self.writer = pq.ParquetWriter(self.tmp, schema)
+
+    def close(self) -> str:
+        self.writer.close()
+        os.replace(self.tmp, self.path)
+        return self.path
+
+
+def _cell(value: Any) -> Any:
+    # JSON columns (audit extras) are exported as JSON strings
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True)
+    return value
+
+
+Chunk = List[Tuple[Dict[str, Any], Dict[str, Any]]]  # (row, watermark after the row)
+
+
+def _write_chunks(
+    pa, pq, schema, out_dir: str, run_id: str, marks: Dict[str, Any], key: str,
+    chunks: Iterator[Chunk], files: List[str],
+) -> int:
+    """Write ordered chunks of rows to day files, advancing ``marks[key]`` per published file."""
+    writer: Optional[_DayWriter] = None
+    last: Optional[Dict[str, Any]] = None
+    written = 0
+
+    def _publish() -> None:
+        # the file is complete: advance the watermark to its last row
+        assert writer is not None and last is not None
+        files.append(writer.close())
+        marks[key] = last
+        _save_watermark(out_dir, marks)
+
+    try:
+        for chunk in chunks:
+            i = 0
+            # split the chunk at day boundaries (rows arrive in time order)
+            while i < len(chunk):
+                day = chunk[i][0]["created_at"].date().isoformat()
+                j = i
+                while j < len(chunk) and chunk[j][0]["created_at"].date().isoformat() == day:
+                    j += 1
+                if writer is not None and writer.day != day:
+                    _publish()
+                    writer = None
+                if writer is None:
+                    writer = _DayWriter(pq, schema, out_dir, day, run_id)
+                part = chunk[i:j]
+                cols = {n: [_cell(r.get(n)) for r, _ in part] for n in schema.names}
+                writer.writer.write_table(pa.Table.from_pydict(cols, schema=schema))
+                last = part[-1][1]
+                written += len(part)
+                i = j
+        if writer is not None:
+            _publish()
+            writer = None
+    finally:
+        if writer is not None:
+            # failed mid-file: drop it; the watermark still points before it
+            writer.writer.close()
+            if os.path.exists(writer.tmp):
+                os.remove(writer.tmp)
+    return written
+
+
+def _sql_chunks(engine, table: Table, mark: Optional[Dict[str, Any]], until: datetime, chunk_rows: int) -> Iterator[Chunk]:
+    last = (datetime.fromisoformat(mark["created_at"]), int(mark["id"])) if mark else None
+    while True:
+        stmt = select(table).where(table.c.created_at < until)
+        if last is not None:
+            ca, rid = last
+            stmt = stmt.where(
+                or_(table.c.created_at > ca, and_(table.c.created_at == ca, table.c.id > rid))
+            )
+        stmt = stmt.order_by(table.c.created_at, table.c.id).limit(chunk_rows)
+        # one short read per chunk; no long-lived cursor against the live DB
+        with engine.connect() as conn:
+            rows = [dict(r) for r in conn.execute(stmt).mappings()]
+        if not rows:
+            return
+        last = (rows[-1]["created_at"], int(rows[-1]["id"]))
+        yield [(r, {"created_at": r["created_at"].isoformat(), "id": int(r["id"])}) for r in rows]
+        if len(rows) < chunk_rows:
+            return
+
+
+def _segment_chunks(path: str, mark: Optional[Dict[str, Any]], chunk_rows: int) -> Iterator[Chunk]:
+    from app.utils.audit_log import iter_segment
+
+    chunk: Chunk = []
+    for offset, rec in iter_segment(path, int(mark["offset"]) if mark else 0):
+        chunk.append((rec, {"offset": offset}))
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def export_audit(
+    out_dir: Optional[str] = None,
+    chunk_rows: Optional[int] = None,
+    until: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Export audit rows newer than the watermark; returns rows, files and timing.
+
+    With the SQL backend, rows created within AUDIT_EXPORT_LAG_SEC of now are left for
+    the next run, so rows still queued by the async audit writer are not skipped once
+    they commit. With the file backend the watermark is a byte offset per segment.
+    """
+    pa, pq = _pyarrow()
+    from app.utils.audit import get_audit_backend
+    from db.models import Audit
+
+    out_dir = out_dir or get_export_dir()
+    chunk_rows = chunk_rows or get_export_chunk_rows()
+    until = until or datetime.utcnow() - timedelta(seconds=get_export_lag_sec())
+    os.makedirs(out_dir, exist_ok=True)
+    run_id = time.strftime("%Y%m%dT%H%M%S", time.gmtime()) + f"-{uuid.uuid4().hex[:6]}"
+    marks = load_watermark(out_dir)
+    start = time.perf_counter()
+    rows_total = 0
+    files: List[str] = []
+
+    backend, directory = get_audit_backend()
+    if backend == "file":
+        from app.utils.audit_log import get_segment_log
+
+        schema = _arrow_schema(pa, Audit.__table__)
+        names = get_segment_log(directory).segments()
+        # forget watermarks of segments removed by retention
+        for key in [k for k in marks if k.startswith("file:") and k[5:] not in names]:
+            del marks[key]
+        for name in names:
+            key = f"file:{name}"
+            rows_total += _write_chunks(
+                pa, pq, schema, out_dir, run_id, marks, key,
+                _segment_chunks(os.path.join(directory, name), marks.get(key), chunk_rows), files,
+            )
+    else:
+        from db.session import get_engine
+
+        engine = get_engine()
+        for table in _source_tables(engine):
+            rows_total += _write_chunks(
+                pa, pq, _arrow_schema(pa, table), out_dir, run_id, marks, table.name,
+                _sql_chunks(engine, table, marks.get(table.name), until, chunk_rows), files,
+            )
+
+    stats = {
+        "rows": rows_total,
+        "files": len(files),
+        "out_dir": out_dir,
+        "until": until.isoformat(),
+        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+        "watermark": marks,
+    }
+    logger.info({"event": "audit_exported", **{k: v for k, v in stats.items() if k != "watermark"}})
+    return stats
@@ -0,0 +1,201 @@
+"""
+Append-only segmented NDJSON audit log (AUDIT_BACKEND_URL=file:///path/to/dir).
+
+Audit rows are appended as one JSON object per line to the active segment,
+audit-<created>-<seq>.ndjson. The segment is sealed and a new one is started once it
+reaches AUDIT_LOG_SEGMENT_BYTES or is AUDIT_LOG_SEGMENT_SEC old. AUDIT_LOG_FSYNC
+controls durability: none (leave it to the OS), segment (fsync when a segment is
+sealed, the default) or always (fsync after every append). Readers memory-map
+segments and only consume complete lines, so they can run while the writer appends.
+"""
+import json
+import mmap
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SEGMENT_RE = re.compile(r"^audit-(\d{8}T\d{6})-(\d{6})\.ndjson$")
+
+
+def get_segment_bytes() -> int:
+    return int(os.getenv("AUDIT_LOG_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+
+
+def get_segment_sec() -> int:
+    return int(os.getenv("AUDIT_LOG_SEGMENT_SEC", "3600"))
+
+
+def get_fsync_policy() -> str:
+    policy = os.getenv("AUDIT_LOG_FSYNC", "segment").lower()
+    return policy if policy in ("none", "segment", "always") else "segment"
+
+
+def _json_default(v: Any) -> Any:
+    if isinstance(v, datetime):
+        return v.isoformat()
+    raise TypeError(f"not JSON serializable: {type(v).__name__}")
+
+
+def _parse(line: bytes) -> Dict[str, Any]:
+    rec = json.loads(line)
+    if rec.get("created_at"):
+        rec["created_at"] = datetime.fromisoformat(rec["created_at"])
+    return rec
+
+
+def iter_segment(path: str, offset: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (end offset, record) for each complete line of a segment, from ``offset``."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= offset:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = offset
+            while True:
+                end = mm.find(b"\n", pos)
+                if end < 0:
+                    break  # partial line still being written
+                if end > pos:
+                    yield end + 1, _parse(mm[pos:end])
+                pos = end + 1
+
+
+def _last_record(path: str) -> Optional[Dict[str, Any]]:
+    # only the tail is needed to decide whether a whole segment is past retention
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = mm.rfind(b"\n")
+            if end < 0:
+                return None
+            start = mm.rfind(b"\n", 0, end) + 1
+            return _parse(mm[start:end])
+
+
+def _count_lines(path: str) -> int:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            n = pos = 0
+            while True:
+                pos = mm.find(b"\n", pos) + 1
+                if pos == 0:
+                    return n
+                n += 1
+
+
+class SegmentLog:
+    """Writer for one segment directory; thread-safe, one instance per directory."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._fh = None
+        self._name: Optional[str] = None
+        self._opened_at = 0.0
+        self._size = 0
+
+    def segments(self) -> List[str]:
+        """Segment file names, oldest first (the last one may be active)."""
+        return sorted(n for n in os.listdir(self.directory) if _SEGMENT_RE.match(n))
+
+    @property
+    def active(self) -> Optional[str]:
+        return self._name
+
+    def _open_segment(self) -> None:
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        existing = self.segments()
+        seq = int(_SEGMENT_RE.match(existing[-1]).group(2)) + 1 if existing else 1
+        self._name = f"audit-{stamp}-{seq:06d}.ndjson"
+        self._fh = open(os.path.join(self.directory, self._name), "ab")
+        self._opened_at = time.monotonic()
+        self._size = 0
+
+    def _seal(self) -> None:
+        if self._fh is None:
+            return
+        self._fh.flush()
+        if get_fsync_policy() != "none":
+            os.fsync(self._fh.fileno())
+        self._fh.close()
+        self._fh = None
+        self._name = None
+
+    def append(self, rows: List[Dict[str, Any]]) -> int:
+        """Append rows as NDJSON lines; returns bytes written."""
+        if not rows:
+            return 0
+        data = b"".join(
+            json.dumps(r, default=_json_default, separators=(",", ":")).encode("utf-8") + b"\n"
+            for r in rows
+        )
+        with self._lock:
+            if self._fh is not None and (
+                self._size >= get_segment_bytes()
+                or time.monotonic() - self._opened_at >= get_segment_sec()
+            ):
+                self._seal()
+            if self._fh is None:
+                self._open_segment()
+            self._fh.write(data)
+            self._fh.flush()
+            if get_fsync_policy() == "always":
+                os.fsync(self._fh.fileno())
+            self._size += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        with self._lock:
+            self._seal()
+
+    def sweep(self, cutoff: datetime) -> Tuple[int, int]:
+        """Delete sealed segments whose newest record is older than ``cutoff``.
+
+        Returns (segments, records) removed. Segments are appended in time order, so
+        a segment is only removed when every record in it is past retention.
+        """
+        removed = records = 0
+        # never the newest segment: it may be active in this or another process
+        for name in self.segments()[:-1]:
+            if name == self._name:
+                break
+            path = os.path.join(self.directory, name)
+            last = _last_record(path)
+            if last is not None and last.get("created_at") and last["created_at"] >= cutoff:
+                break
+            records += _count_lines(path)
+            os.remove(path)
+            removed += 1
+        if removed:
+            logger.info({"event": "audit_log_swept", "segments": removed, "records": records})
+        return removed, records
+
+
+_LOGS: Dict[str, SegmentLog] = {}
+_LOGS_LOCK = threading.Lock()
+
+
+def get_segment_log(directory: str) -> SegmentLog:
+    with _LOGS_LOCK:
+        log = _LOGS.get(directory)
+        if log is None:
+            log = _LOGS[directory] = SegmentLog(directory)
+        return log
+
+
+def close_segment_logs() -> None:
+    with _LOGS_LOCK:
+        logs = list(_LOGS.values())
+        _LOGS.clear()
+    for log in logs:
+        log.close()
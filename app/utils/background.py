@@ -0,0 +1,77 @@
+import threading
+from typing import Callable
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PeriodicWorker:
+    """Run ``fn`` every ``interval`` seconds on a daemon thread.
+
+    Used for maintenance jobs (backfills, sweeps) that must stay off the request path.
+    Errors are logged and swallowed so one bad tick does not kill the worker.
+    The first tick runs right away unless ``run_at_start`` is False, for jobs that
+    only drain work queued after the worker started.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        fn: Callable[[], object],
+        drain_on_stop: bool = False,
+        run_at_start: bool = True,
+    ):
+        self.name = name
+        self.interval = float(interval)
+        self.fn = fn
+        self.drain_on_stop = drain_on_stop
+        self.run_at_start = run_at_start
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        if self.interval <= 0 or self.running:
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+        logger.info({"event": "worker_started", "worker": self.name, "interval": self.interval})
+        return True
+
+    def trigger(self) -> None:
+        # wake the worker before its next scheduled tick
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        logger.info({"event": "worker_stopped", "worker": self.name})
+
+    def run_once(self) -> object:
+        try:
+            return self.fn()
+        except Exception as e:  # noqa: BLE001
+            logger.error({"event": "worker_error", "worker": self.name, "error": str(e)})
+            return None
+
+    def _loop(self) -> None:
+        if not self.run_at_start:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+        while not self._stop.is_set():
+            self.run_once()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+        if self.drain_on_stop:
+            # final pass so queued work is not lost on shutdown
+            self.run_once()
@@ -0,0 +1,157 @@
+"""
+Idempotent replay of POST responses keyed by the client's request ID header.
+
+A client that retries with the same X-Request-ID (REQUEST_ID_HEADER) gets the response
+of the first attempt instead of paying again for retrieval and LLM tokens, and no
+second audit row is written. Completed responses are kept in a bounded LRU for
+IDEMPOTENCY_TTL_SEC; a duplicate that arrives while the first attempt is still running
+waits for it (up to IDEMPOTENCY_WAIT_SEC). Only requests that send the header take
+part; generated request IDs are unique anyway. Reusing an ID with a different payload
+is a conflict (409). Failed attempts are not cached, so a later retry runs again.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel
+
+from app.utils.metrics import idempotency_entries, idempotency_requests
+from app.utils.rbac import parse_role
+
+Key = Tuple[str, str]  # (endpoint, request id)
+
+REPLAY_HEADER = "Idempotent-Replayed"
+
+
+def get_idempotency_enabled() -> bool:
+    return os.getenv("IDEMPOTENCY_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+
+
+def get_idempotency_ttl_sec() -> float:
+    return float(os.getenv("IDEMPOTENCY_TTL_SEC", "600"))
+
+
+def get_idempotency_max_entries() -> int:
+    return int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "1024"))
+
+
+def get_idempotency_wait_sec() -> float:
+    return float(os.getenv("IDEMPOTENCY_WAIT_SEC", "30"))
+
+
+class _Flight:
+    __slots__ = ("fingerprint", "done", "value", "error")
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class IdempotencyCache:
+    """TTL LRU of completed responses plus the computations still in flight."""
+
+    def __init__(self):
+        self._done: "OrderedDict[Key, Tuple[float, str, Any]]" = OrderedDict()
+        self._inflight: Dict[Key, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def run(self, key: Key, fingerprint: str, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return (value, replayed). Runs ``compute`` only for the first caller of ``key``."""
+        now = time.monotonic()
+        with self._lock:
+            hit = self._done.get(key)
+            if hit is not None and hit[0] <= now:
+                del self._done[key]
+                hit = None
+            if hit is not None:
+                self._done.move_to_end(key)
+                return self._replay(hit[1], fingerprint, hit[2]), True
+            flight = self._inflight.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._inflight[key] = _Flight(fingerprint)
+        assert flight is not None
+        if not owner:
+            if flight.fingerprint != fingerprint:
+                idempotency_requests.labels(result="conflict").inc()
+                raise HTTPException(status_code=409, detail="request id reused with a different payload")
+            idempotency_requests.labels(result="wait").inc()
+            if not flight.done.wait(get_idempotency_wait_sec()):
+                raise HTTPException(status_code=409, detail="request with this id is still in progress")
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, True
+
+        idempotency_requests.labels(result="miss").inc()
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            self._store(key, fingerprint, flight.value)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+        return flight.value, False
+
+    def _replay(self, stored: str, fingerprint: str, value: Any) -> Any:
+        if stored != fingerprint:
+            idempotency_requests.labels(result="conflict").inc()
+            raise HTTPException(status_code=409, detail="request id reused with a different payload")
+        idempotency_requests.labels(result="hit").inc()
+        return value
+
+    def _store(self, key: Key, fingerprint: str, value: Any) -> None:
+        ttl = get_idempotency_ttl_sec()
+        cap = get_idempotency_max_entries()
+        if ttl <= 0 or cap <= 0:
+            return
+        with self._lock:
+            self._done[key] = (time.monotonic() + ttl, fingerprint, value)
+            self._done.move_to_end(key)
+            while len(self._done) > cap:
+                self._done.popitem(last=False)
+            idempotency_entries.set(len(self._done))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._done.clear()
+            idempotency_entries.set(0)
+
+
+_CACHE = IdempotencyCache()
+
+
+def get_idempotency_cache() -> IdempotencyCache:
+    return _CACHE
+
+
+def _fingerprint(req: Request, payload: BaseModel) -> str:
+    h = hashlib.sha256()
+    # the role changes what a handler may return, so it is part of the request identity
+    h.update(parse_role(req).encode("utf-8"))
+    h.update(b"\0")
+    h.update(payload.model_dump_json().encode("utf-8"))
+    return h.hexdigest()
+
+
+def idempotent(req: Request, response: Response, endpoint: str, payload: BaseModel, handler: Callable[[], Any]) -> Any:
+    """Run ``handler`` at most once per client request ID; replays set Idempotent-Replayed."""
+    request_id = req.headers.get(os.getenv("REQUEST_ID_HEADER", "X-Request-ID"))
+    if not request_id or not get_idempotency_enabled():
+        return handler()
+    value, replayed = _CACHE.run((endpoint, request_id), _fingerprint(req, payload), handler)
+    if replayed:
+        response.headers[REPLAY_HEADER] = "true"
+    return value
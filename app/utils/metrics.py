@@ -1,4 +1,4 @@
-from prometheus_client import CollectorRegistry, Counter, Histogram
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
 
 registry = CollectorRegistry()
 
@@ -30,3 +30,133 @@ cost_usd_total = Counter(
     labelnames=("endpoint",),
     registry=registry,
 )
+
+memory_long_embedding_backlog = Gauge(
+    "app_memory_long_embedding_backlog",
+    "Long-term memory facts stored without an embedding, awaiting backfill",
+    registry=registry,
+)
+
+memory_long_embeddings_backfilled = Counter(
+    "app_memory_long_embeddings_backfilled_total",
+    "Long-term memory facts embedded by the background backfill worker",
+    registry=registry,
+)
+
+memory_long_dedup_merged = Counter(
+    "app_memory_long_dedup_merged_total",
+    "Long-term memory ingests merged into an existing near-duplicate fact",
+    registry=registry,
+)
+
+memory_long_export_facts = Counter(
+    "app_memory_long_export_facts_total",
+    "Long-term memory facts streamed by the NDJSON export",
+    registry=registry,
+)
+
+memory_long_import_facts = Counter(
+    "app_memory_long_import_facts_total",
+    "Long-term memory facts ingested by the NDJSON import",
+    registry=registry,
+)
+
+memory_short_pruned = Counter(
+    "app_memory_short_pruned_total",
+    "Short-term memory turns deleted by the background sweeper",
+    labelnames=("reason",),
+    registry=registry,
+)
+
+memory_short_write_buffer = Gauge(
+    "app_memory_short_write_buffer",
+    "Short-term memory turns buffered by write-behind mode, not yet committed",
+    registry=registry,
+)
+
+memory_short_flushed_turns = Counter(
+    "app_memory_short_flushed_turns_total",
+    "Short-term memory turns committed by the write-behind flusher",
+    registry=registry,
+)
+
+memory_short_cache_requests = Counter(
+    "app_memory_short_cache_requests_total",
+    "Short-term memory session cache lookups",
+    labelnames=("result",),
+    registry=registry,
+)
+
+memory_short_cache_bytes = Gauge(
+    "app_memory_short_cache_bytes",
+    "Approximate bytes held by the short-term memory session cache",
+    registry=registry,
+)
+
+audit_queue_depth = Gauge(
+    "app_audit_queue_depth",
+    "Audit rows queued by the async audit writer, not yet committed",
+    registry=registry,
+)
+
+audit_written = Counter(
+    "app_audit_written_total",
+    "Audit rows committed to the audit database",
+    registry=registry,
+)
+
+audit_dropped = Counter(
+    "app_audit_dropped_total",
+    "Audit rows discarded by the async audit writer",
+    labelnames=("reason",),
+    registry=registry,
+)
+
+audit_flush_latency = Histogram(
+    "app_audit_flush_seconds",
+    "Time to commit one batch of audit rows",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2),
+    registry=registry,
+)
+
+audit_queue_delay = Histogram(
+    "app_audit_queue_delay_seconds",
+    "Time from enqueue to commit for audit rows written by the async writer",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10),
+    registry=registry,
+)
+
+idempotency_requests = Counter(
+    "app_idempotency_requests_total",
+    "Requests with a client request ID seen by the idempotency cache",
+    labelnames=("result",),
+    registry=registry,
+)
+
+idempotency_entries = Gauge(
+    "app_idempotency_entries",
+    "Completed responses held by the idempotency cache",
+    registry=registry,
+)
+
+llm_http_requests = Counter(
+    "app_llm_http_requests_total",
+    "LLM provider HTTP requests by whether they opened a new connection or reused a pooled one",
+    labelnames=("provider", "connection"),
+    registry=registry,
+)
+
+llm_inflight = Gauge(
+    "app_llm_inflight",
+    "Async LLM requests in flight per provider",
+    labelnames=("provider",),
+    registry=registry,
+)
+
+llm_slot_wait = Histogram(
+    "app_llm_slot_wait_seconds",
+    "Time async LLM requests waited for a provider concurrency slot",
+    labelnames=("provider",),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10),
+    registry=registry,
+)
@@ -1,20 +1,85 @@
 import os
+import time
 from datetime import datetime, timedelta
+from typing import Any, Dict
 
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
 from db.models import Audit
+from db.partitions import drop_partitions_before
 
 
-def sweep_audit(db: Session, days: int | None = None) -> int:
-    if days is None:
-        try:
-            days = int(os.getenv("LOG_RETENTION_DAYS", "30"))
-        except ValueError:
-            days = 30
+def get_retention_days() -> int:
+    try:
+        return int(os.getenv("LOG_RETENTION_DAYS", "30"))
+    except ValueError:
+        return 30
+
+
+def get_sweep_batch_size() -> int:
+    return max(1, int(os.getenv("AUDIT_SWEEP_BATCH", "5000")))
+
+
+def sweep_audit_stats(
+    db: Session, days: int | None = None, batch_size: int | None = None
+) -> Dict[str, Any]:
+    """Remove audit rows older than ``days`` and report what it took.
+
+    Day partitions that end before the cutoff are dropped whole. Rows in the base
+    audit table (unpartitioned mode, or written before partitioning was enabled)
+    are deleted in id-ordered chunks of ``batch_size``, one short transaction each,
+    so concurrent audit writes never wait behind one long delete.
+    """
+    days = get_retention_days() if days is None else days
+    batch_size = batch_size or get_sweep_batch_size()
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    start = time.perf_counter()
+
+    # a partition holds one UTC day, so only days entirely before the cutoff go
+    partitions, partition_rows = drop_partitions_before(db.get_bind(), cutoff.date())
+
+    deleted = batches = 0
+    while True:
+        ids = select(Audit.id).where(Audit.created_at < cutoff).order_by(Audit.id).limit(batch_size)
+        n = db.execute(delete(Audit).where(Audit.id.in_(ids))).rowcount or 0
+        db.commit()
+        if n == 0:
+            break
+        deleted += n
+        batches += 1
+        if n < batch_size:
+            break
+
+    duration = time.perf_counter() - start
+    total = deleted + partition_rows
+    return {
+        "deleted": total,
+        "rows_deleted": deleted,
+        "batches": batches,
+        "partitions_dropped": partitions,
+        "partition_rows": partition_rows,
+        "duration_ms": round(duration * 1000, 3),
+        "rows_per_sec": round(total / duration, 1) if duration > 0 else None,
+    }
+
+
+def sweep_audit_log(directory: str, days: int | None = None) -> Dict[str, Any]:
+    """Retention for the file audit backend: remove segments entirely past the cutoff."""
+    from app.utils.audit_log import get_segment_log
+
+    days = get_retention_days() if days is None else days
     cutoff = datetime.utcnow() - timedelta(days=days)
-    q = db.query(Audit).filter(Audit.created_at < cutoff)
-    count = q.count()
-    q.delete(synchronize_session=False)
-    db.commit()
-    return count
+    start = time.perf_counter()
+    segments, records = get_segment_log(directory).sweep(cutoff)
+    duration = time.perf_counter() - start
+    return {
+        "deleted": records,
+        "segments_removed": segments,
+        "duration_ms": round(duration * 1000, 3),
+        "rows_per_sec": round(records / duration, 1) if duration > 0 else None,
+    }
+
+
+def sweep_audit(db: Session, days: int | None = None) -> int:
+    return int(sweep_audit_stats(db, days)["deleted"])
@@ -0,0 +1,132 @@
+"""
+Versioned schema migrations for the audit database.
+
+Applied versions are recorded in the schema_migrations table. Migrations run once
+per engine (app startup, scripts/migrate_db.py), never on the request path, and
+each one must be safe to run against a database created by a newer create_all.
+"""
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Engine, text
+from sqlalchemy.engine import Connection
+
+from .session import Base
+
+
+def _migration_1_base_tables(conn: Connection) -> None:
+    from . import models  # noqa: F401  (registers the tables on Base.metadata)
+
+    Base.metadata.create_all(bind=conn)
+
+
+def _migration_2_audit_created_at_index(conn: Connection) -> None:
+    # retention and exports range-scan created_at
+    from .models import Audit
+
+    for index in Audit.__table__.indexes:
+        if index.name == "ix_audit_created_at":
+            index.create(bind=conn, checkfirst=True)
+
+
+def _migration_3_usage_daily(conn: Connection) -> None:
+    # FinOps rollup table, backfilled from the audit rows already stored (model unknown)
+    from sqlalchemy import func, select
+
+    from .models import Audit, UsageDaily
+    from .partitions import list_partitions, partition_table
+    from .rollups import upsert_usage
+
+    UsageDaily.__table__.create(bind=conn, checkfirst=True)
+    tables = [Audit.__table__] + [partition_table(day) for day, _ in list_partitions(conn)]
+    for t in tables:
+        day = func.date(t.c.created_at)
+        stmt = select(
+            day.label("day"),
+            func.coalesce(t.c.user_id, "").label("user_id"),
+            t.c.endpoint,
+            func.count().label("requests"),
+            func.sum(func.coalesce(t.c.tokens_prompt, 0)).label("tokens_prompt"),
+            func.sum(func.coalesce(t.c.tokens_completion, 0)).label("tokens_completion"),
+            func.sum(func.coalesce(t.c.cost_usd, 0.0)).label("cost_usd"),
+            func.sum(func.coalesce(t.c.latency_ms, 0)).label("latency_ms_total"),
+        ).group_by(day, func.coalesce(t.c.user_id, ""), t.c.endpoint)
+        agg = {
+            (str(r["day"]), r["user_id"], r["endpoint"], ""): {
+                "requests": int(r["requests"]),
+                "tokens_prompt": int(r["tokens_prompt"] or 0),
+                "tokens_completion": int(r["tokens_completion"] or 0),
+                "cost_usd": float(r["cost_usd"] or 0.0),
+                "latency_ms_total": int(r["latency_ms_total"] or 0),
+            }
+            for r in conn.execute(stmt).mappings()
+        }
+        upsert_usage(conn, agg)
+
+
+def _migration_4_audit_extras(conn: Connection) -> None:
+    # extras JSON column plus (user_id, created_at) / (endpoint, created_at) indexes,
+    # on the base audit table and on every existing day partition
+    from sqlalchemy import inspect
+
+    from .models import Audit
+    from .partitions import list_partitions, partition_table
+
+    tables = [Audit.__table__] + [partition_table(day) for day, _ in list_partitions(conn)]
+    for t in tables:
+        columns = {c["name"] for c in inspect(conn).get_columns(t.name)}
+        if "extras" not in columns:
+            col = t.c.extras.type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {t.name} ADD COLUMN extras {col}"))
+        for index in t.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+
+# Ordered (version, name, fn); append new migrations, never reorder or edit old ones
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "base_tables", _migration_1_base_tables),
+    (2, "audit_created_at_index", _migration_2_audit_created_at_index),
+    (3, "usage_daily", _migration_3_usage_daily),
+    (4, "audit_extras", _migration_4_audit_extras),
+]
+
+
+def _ensure_version_table(conn: Connection) -> None:
+    conn.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, applied_at TIMESTAMP NOT NULL)"
+        )
+    )
+
+
+def current_version(engine: Engine) -> int:
+    with engine.begin() as conn:
+        _ensure_version_table(conn)
+        v = conn.execute(text("SELECT MAX(version) FROM schema_migrations")).scalar()
+    return int(v or 0)
+
+
+def pending_migrations(engine: Engine) -> List[Tuple[int, str]]:
+    version = current_version(engine)
+    return [(v, name) for v, name, _ in MIGRATIONS if v > version]
+
+
+def migrate(engine: Engine) -> List[int]:
+    """Apply pending migrations in order, each in its own transaction; returns versions applied."""
+    applied: List[int] = []
+    version = current_version(engine)
+    for v, name, fn in MIGRATIONS:
+        if v <= version:
+            continue
+        with engine.begin() as conn:
+            fn(conn)
+            conn.execute(
+                text(
+                    "INSERT INTO schema_migrations (version, name, applied_at) "
+                    "VALUES (:v, :n, :t)"
+                ),
+                {"v": v, "n": name, "t": datetime.utcnow()},
+            )
+        applied.append(v)
+    return applied
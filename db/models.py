@@ -1,18 +1,23 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, Index, Integer, String
 
 from .session import Base
 
 
 class Audit(Base):
     __tablename__ = "audit"
+    # operational queries filter by user or endpoint over a time range
+    __table_args__ = (
+        Index("ix_audit_user_id_created_at", "user_id", "created_at"),
+        Index("ix_audit_endpoint_created_at", "endpoint", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     request_id = Column(String, index=True, nullable=False)
     endpoint = Column(String, index=True, nullable=False)
     user_id = Column(String, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     tokens_prompt = Column(Integer, nullable=True)
     tokens_completion = Column(Integer, nullable=True)
     cost_usd = Column(Float, nullable=True)
@@ -20,3 +25,26 @@ class Audit(Base):
     compliance_flag = Column(Boolean, default=False)
     prompt_hash = Column(String, nullable=True)
     response_hash = Column(String, nullable=True)
+    # per-endpoint fields (router intent, RAG flags, PII counts, LLM provider, memory counters)
+    extras = Column(JSON, nullable=True)
+
+
+class UsageDaily(Base):
+    """FinOps rollup: audit totals per UTC day, user, endpoint and model.
+
+    Maintained by the audit writer in the same transaction as the audit row;
+    missing user_id/model are stored as "" so they stay part of the key.
+    """
+
+    __tablename__ = "usage_daily"
+    __table_args__ = (Index("ix_usage_daily_user_day", "user_id", "day"),)
+
+    day = Column(String, primary_key=True)  # YYYY-MM-DD
+    user_id = Column(String, primary_key=True, default="")
+    endpoint = Column(String, primary_key=True)
+    model = Column(String, primary_key=True, default="")
+    requests = Column(Integer, nullable=False, default=0)
+    tokens_prompt = Column(Integer, nullable=False, default=0)
+    tokens_completion = Column(Integer, nullable=False, default=0)
+    cost_usd = Column(Float, nullable=False, default=0.0)
+    latency_ms_total = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,97 @@
+"""
+Day partitions for the audit table (AUDIT_PARTITIONING=day).
+
+Each UTC day gets its own table, audit_YYYYMMDD, with the columns of the base audit
+table. Partitions are created on first write for their day, and retention drops
+whole tables instead of deleting rows. Table-per-day is plain DDL, so it works the
+same on SQLite and server databases.
+"""
+import os
+import re
+import threading
+from datetime import date, datetime
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import Column, Engine, Index, MetaData, Table, func, inspect, select
+from sqlalchemy.engine import Connection
+
+from .models import Audit
+
+_PARTITION_RE = re.compile(r"^audit_(\d{8})$")
+
+_METADATA = MetaData()
+_TABLES: Dict[str, Table] = {}
+# (engine url, table name) pairs known to exist, so writes skip the existence check
+_CREATED: Set[Tuple[str, str]] = set()
+_LOCK = threading.Lock()
+
+
+def get_audit_partitioning() -> str:
+    mode = os.getenv("AUDIT_PARTITIONING", "none").lower()
+    return mode if mode in ("none", "day") else "none"
+
+
+def partition_name(day: date) -> str:
+    return f"audit_{day:%Y%m%d}"
+
+
+def partition_table(day: date) -> Table:
+    """Table object for the partition of ``day`` (not created in the DB)."""
+    name = partition_name(day)
+    with _LOCK:
+        table = _TABLES.get(name)
+        if table is None:
+            base = Audit.__table__
+            cols = [
+                Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable)
+                for c in base.columns
+            ]
+            # index names are schema-wide on SQLite, so they carry the partition name
+            indexes = [
+                Index(ix.name.replace(f"ix_{base.name}_", f"ix_{name}_", 1), *[c.name for c in ix.columns])
+                for ix in base.indexes
+                if not all(c.primary_key for c in ix.columns)
+            ]
+            table = Table(name, _METADATA, *cols, *indexes)
+            _TABLES[name] = table
+    return table
+
+
+def ensure_partition(engine: Engine, day: date) -> Table:
+    table = partition_table(day)
+    key = (str(engine.url), table.name)
+    if key not in _CREATED:
+        table.create(bind=engine, checkfirst=True)
+        with _LOCK:
+            _CREATED.add(key)
+    return table
+
+
+def partition_for(engine: Engine, created_at: datetime) -> Table:
+    return ensure_partition(engine, created_at.date())
+
+
+def list_partitions(bind: Engine | Connection) -> List[Tuple[date, str]]:
+    """Existing day partitions, oldest first."""
+    out: List[Tuple[date, str]] = []
+    for name in inspect(bind).get_table_names():
+        m = _PARTITION_RE.match(name)
+        if m:
+            out.append((datetime.strptime(m.group(1), "%Y%m%d").date(), name))
+    return sorted(out)
+
+
+def drop_partitions_before(engine: Engine, cutoff: date) -> Tuple[int, int]:
+    """Drop partitions for days strictly before ``cutoff``; returns (tables, rows) dropped."""
+    tables = rows = 0
+    for day, name in list_partitions(engine):
+        if day >= cutoff:
+            break
+        table = partition_table(day)
+        with engine.begin() as conn:
+            rows += int(conn.execute(select(func.count()).select_from(table)).scalar() or 0)
+            table.drop(bind=conn, checkfirst=True)
+        with _LOCK:
+            _CREATED.discard((str(engine.url), name))
+        tables += 1
+    return tables, rows
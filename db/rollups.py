@@ -0,0 +1,99 @@
+"""
+FinOps usage rollups (usage_daily) maintained alongside audit writes.
+
+Every audit write adds its request, tokens, cost and latency to the row for
+(day, user_id, endpoint, model) with an upsert in the same transaction, so usage
+queries read a few pre-aggregated rows instead of scanning the audit table.
+"""
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .models import UsageDaily
+
+Key = Tuple[str, str, str, str]
+
+KEY_COLUMNS = ("day", "user_id", "endpoint", "model")
+METRIC_COLUMNS = ("requests", "tokens_prompt", "tokens_completion", "cost_usd", "latency_ms_total")
+
+
+def _zero() -> Dict[str, Any]:
+    return {"requests": 0, "tokens_prompt": 0, "tokens_completion": 0, "cost_usd": 0.0, "latency_ms_total": 0}
+
+
+def aggregate(items: Iterable[Tuple[Dict[str, Any], Optional[str]]]) -> Dict[Key, Dict[str, Any]]:
+    """Fold (audit row, model) pairs into per-key deltas."""
+    agg: Dict[Key, Dict[str, Any]] = {}
+    for row, model in items:
+        key = (
+            row["created_at"].date().isoformat(),
+            row.get("user_id") or "",
+            row.get("endpoint") or "",
+            model or "",
+        )
+        a = agg.setdefault(key, _zero())
+        a["requests"] += 1
+        a["tokens_prompt"] += int(row.get("tokens_prompt") or 0)
+        a["tokens_completion"] += int(row.get("tokens_completion") or 0)
+        a["cost_usd"] += float(row.get("cost_usd") or 0.0)
+        a["latency_ms_total"] += int(row.get("latency_ms") or 0)
+    return agg
+
+
+def upsert_usage(conn: Any, agg: Dict[Key, Dict[str, Any]]) -> None:
+    """Add deltas to usage_daily; ``conn`` is a Connection or Session inside a transaction."""
+    if not agg:
+        return
+    table = UsageDaily.__table__
+    rows = [dict(zip(KEY_COLUMNS, key), **vals) for key, vals in agg.items()]
+    dialect = (getattr(conn, "dialect", None) or conn.get_bind().dialect).name
+    if dialect in ("sqlite", "postgresql"):
+        ins = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(table)
+        stmt = ins.on_conflict_do_update(
+            index_elements=list(KEY_COLUMNS),
+            set_={c: table.c[c] + ins.excluded[c] for c in METRIC_COLUMNS},
+        )
+        conn.execute(stmt, rows)
+        return
+    # portable fallback: increment, insert the keys that did not exist yet
+    for r in rows:
+        where = [table.c[c] == r[c] for c in KEY_COLUMNS]
+        res = conn.execute(
+            update(table).where(*where).values({c: table.c[c] + r[c] for c in METRIC_COLUMNS})
+        )
+        if not res.rowcount:
+            conn.execute(table.insert(), [r])
+
+
+def query_usage(
+    conn: Any,
+    start: date,
+    end: date,
+    user_id: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    model: Optional[str] = None,
+    group_by: Sequence[str] = ("day", "user_id"),
+    limit: int = 1000,
+) -> List[Dict[str, Any]]:
+    """Usage between ``start`` and ``end`` (inclusive), summed over the ``group_by`` columns."""
+    table = UsageDaily.__table__
+    keys = [table.c[c] for c in group_by]
+    stmt = select(*keys, *(func.sum(table.c[c]).label(c) for c in METRIC_COLUMNS)).where(
+        table.c.day >= start.isoformat(), table.c.day <= end.isoformat()
+    )
+    for col, value in (("user_id", user_id), ("endpoint", endpoint), ("model", model)):
+        if value is not None:
+            stmt = stmt.where(table.c[col] == value)
+    if keys:
+        stmt = stmt.group_by(*keys).order_by(*keys)
+    out: List[Dict[str, Any]] = []
+    for r in conn.execute(stmt.limit(limit)).mappings():
+        if r["requests"] is None:
+            continue  # aggregate over no rows
+        item: Dict[str, Any] = {c: (r[c] or None) for c in group_by}
+        item.update({c: r[c] or 0 for c in METRIC_COLUMNS})
+        item["cost_usd"] = round(float(item["cost_usd"]), 6)
+        out.append(item)
+    return out
@@ -1,4 +1,6 @@
 import os
+import threading
+from typing import Any, Dict
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
@@ -6,26 +8,69 @@ from sqlalchemy.orm import Session, declarative_base, sessionmaker
 Base = declarative_base()
 _engine = None
 _SessionLocal = None
+_ENGINE_LOCK = threading.Lock()
 
 
-def get_engine():
-    global _engine
-    db_url = os.getenv("DB_URL", "sqlite:///./audit.db")
+def get_db_url() -> str:
+    return os.getenv("DB_URL", "sqlite:///./audit.db")
+
+
+def _pool_kwargs(db_url: str) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes", "on"),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE_SEC", "1800")),
+    }
+    # in-memory SQLite uses a single-connection pool without size/overflow knobs
+    if not (db_url.startswith("sqlite") and (":memory:" in db_url or db_url.rstrip("/") == "sqlite:")):
+        kwargs["pool_size"] = int(os.getenv("DB_POOL_SIZE", "5"))
+        kwargs["max_overflow"] = int(os.getenv("DB_POOL_MAX_OVERFLOW", "10"))
+    return kwargs
+
+
+def make_engine(db_url: str):
+    """A pooled engine for db_url, without touching its schema."""
     connect_args = {"check_same_thread": False} if db_url.startswith("sqlite") else {}
-    # Recreate engine if DB_URL changed
-    if _engine is None or str(getattr(_engine, "url", "")) != db_url:
-        _engine = create_engine(db_url, connect_args=connect_args)
+    return create_engine(db_url, connect_args=connect_args, **_pool_kwargs(db_url))
+
+
+def _configure(db_url: str):
+    """Build the engine and sessionmaker for db_url and bring its schema up to date."""
+    global _engine, _SessionLocal
+    from .migrations import migrate
+
+    engine = make_engine(db_url)
+    migrate(engine)
+    old = _engine
+    _engine = engine
+    _SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    if old is not None:
+        old.dispose()
+    return engine
+
+
+def get_engine():
+    # Built once from DB_URL; init_db() rebinds it when DB_URL changes
+    if _engine is None:
+        with _ENGINE_LOCK:
+            if _engine is None:
+                _configure(get_db_url())
     return _engine
 
 
 def get_session() -> Session:
-    global _SessionLocal
-    engine = get_engine()
-    if _SessionLocal is None or getattr(_SessionLocal, "kw", {}).get("bind") is not engine:
-        _SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    if _SessionLocal is None:
+        get_engine()
     return _SessionLocal()
 
 
 def init_db():
-    engine = get_engine()
-    Base.metadata.create_all(bind=engine)
+    """Create or migrate the schema for DB_URL once (app startup, scripts, tests).
+
+    The engine is rebuilt only when DB_URL differs from the one it was built for;
+    otherwise this is a no-op.
+    """
+    db_url = get_db_url()
+    with _ENGINE_LOCK:
+        if _engine is None or _engine.url.render_as_string(hide_password=False) != db_url:
+            _configure(db_url)
+    return _engine
@@ -0,0 +1,74 @@
+"""
+Benchmark audit sinks: inline SQL, batched SQL and the segmented file log.
+
+Writes N synthetic audit rows through each path into a temporary directory and
+prints rows/s. Example: python scripts/bench_audit_sink.py --rows 20000 --batch 200
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _kwargs(i: int):
+    return {
+        "request_id": f"bench-{i}",
+        "endpoint": "/query",
+        "user_id": f"user-{i % 50}",
+        "tokens_prompt": 120,
+        "tokens_completion": 80,
+        "cost_usd": 0.0004,
+        "latency_ms": 35,
+        "compliance_flag": False,
+        "prompt_hash": "p" * 64,
+        "response_hash": "r" * 64,
+        "model": "gpt-4o-mini",
+    }
+
+
+def _batches(audit, n: int, size: int):
+    for start in range(0, n, size):
+        yield [(0.0, audit._audit_row(**_kwargs(i)), "gpt-4o-mini") for i in range(start, min(n, start + size))]
+
+
+def _timed(label: str, n: int, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    took = time.perf_counter() - start
+    print(f"{label:<28} {n:>8} rows  {took * 1000:>10.1f} ms  {n / took:>12.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=200)
+    parser.add_argument("--fsync", default="segment", choices=("none", "segment", "always"))
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="audit-bench-")
+    os.environ["DB_URL"] = f"sqlite:///{os.path.join(tmp, 'audit.db')}"
+    os.environ["AUDIT_LOG_FSYNC"] = args.fsync
+    os.environ.pop("AUDIT_BACKEND_URL", None)
+
+    # imported after the environment points at the temp DB
+    from app.utils import audit
+    from db.session import init_db
+
+    init_db()
+    n = args.rows
+    _timed("sql inline (per request)", n, lambda: [audit.record_audit(**_kwargs(i)) for i in range(n)])
+    _timed(f"sql batched ({args.batch}/tx)", n, lambda: [audit._commit_batch(b) for b in _batches(audit, n, args.batch)])
+
+    os.environ["AUDIT_BACKEND_URL"] = f"file://{os.path.join(tmp, 'log')}"
+    _timed(f"file inline (fsync={args.fsync})", n, lambda: [audit.record_audit(**_kwargs(i)) for i in range(n)])
+    _timed(f"file batched ({args.batch}/append)", n, lambda: [audit._commit_batch(b) for b in _batches(audit, n, args.batch)])
+    audit.stop_audit_writer()
+    print(f"artifacts in {tmp}")
+
+
+if __name__ == "__main__":
+    main()
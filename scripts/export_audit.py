@@ -0,0 +1,30 @@
+import argparse
+import sys
+
+from dotenv import load_dotenv
+
+from app.utils.audit_export import ExportUnavailable, export_audit
+
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export audit rows added since the last run to day-partitioned Parquet"
+    )
+    parser.add_argument("--out", default=None, help="output directory (default: AUDIT_EXPORT_DIR)")
+    parser.add_argument("--chunk", type=int, default=None, help="rows per read chunk (default: AUDIT_EXPORT_CHUNK_ROWS)")
+    args = parser.parse_args()
+
+    try:
+        stats = export_audit(out_dir=args.out, chunk_rows=args.chunk)
+    except ExportUnavailable as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(2)
+    rate = stats["rows"] / (stats["duration_ms"] / 1000) if stats["duration_ms"] else 0.0
+    print(f"Exported {stats['rows']} audit rows into {stats['files']} file(s) under {stats['out_dir']}")
+    print(f"  rows created before {stats['until']}; took {stats['duration_ms']} ms ({rate:.1f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import argparse
+
+from dotenv import load_dotenv
+
+from db.migrations import MIGRATIONS, current_version, migrate, pending_migrations
+from db.session import get_db_url, make_engine
+
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create or migrate the audit database schema")
+    parser.add_argument("--status", action="store_true", help="only list pending migrations")
+    args = parser.parse_args()
+
+    db_url = get_db_url()
+    engine = make_engine(db_url)
+    try:
+        if args.status:
+            pending = pending_migrations(engine)
+            latest = MIGRATIONS[-1][0] if MIGRATIONS else 0
+            print(f"{db_url}: version {current_version(engine)} of {latest}, {len(pending)} pending")
+            for v, name in pending:
+                print(f"  {v:>3} {name}")
+            return
+        applied = migrate(engine)
+        print(f"Applied {len(applied)} migration(s)" + (f": {applied}" if applied else ""))
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,40 @@
+import argparse
+
 from dotenv import load_dotenv
 
-from app.utils.retention import sweep_audit
+from app.utils.audit import get_audit_backend
+from app.utils.retention import sweep_audit_log, sweep_audit_stats
 from db.session import get_session, init_db
 
 load_dotenv()
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Delete audit rows older than the retention window")
+    parser.add_argument("--days", type=int, default=None, help="retention in days (default: LOG_RETENTION_DAYS)")
+    parser.add_argument("--batch", type=int, default=None, help="rows per delete chunk (default: AUDIT_SWEEP_BATCH)")
+    args = parser.parse_args()
+
+    backend, directory = get_audit_backend()
+    if backend == "file":
+        stats = sweep_audit_log(directory, days=args.days)
+        print(f"Deleted {stats['deleted']} old audit rows")
+        print(
+            f"  segments removed: {stats['segments_removed']}\n"
+            f"  took {stats['duration_ms']} ms ({stats['rows_per_sec']} rows/s)"
+        )
+        return
+
     init_db()
     db = get_session()
     try:
-        deleted = sweep_audit(db)
-        print(f"Deleted {deleted} old audit rows")
+        stats = sweep_audit_stats(db, days=args.days, batch_size=args.batch)
+        print(f"Deleted {stats['deleted']} old audit rows")
+        print(
+            f"  partitions dropped: {stats['partitions_dropped']} ({stats['partition_rows']} rows)\n"
+            f"  chunked deletes: {stats['rows_deleted']} rows in {stats['batches']} batch(es)\n"
+            f"  took {stats['duration_ms']} ms ({stats['rows_per_sec']} rows/s)"
+        )
     finally:
         db.close()
 
@@ -0,0 +1,87 @@
+from app.utils import audit as audit_mod
+from db.models import Audit
+from db.session import get_session, init_db
+
+
+def _rows():
+    db = get_session()
+    try:
+        return sorted(r.request_id for r in db.query(Audit).all())
+    finally:
+        db.close()
+
+
+def _setup(tmp_path, monkeypatch, **env):
+    monkeypatch.setenv("DB_URL", f"sqlite:///{tmp_path / 'audit.db'}")
+    monkeypatch.setenv("AUDIT_ASYNC", "true")
+    # long interval: rows are only written by size triggers or the shutdown drain
+    monkeypatch.setenv("AUDIT_FLUSH_INTERVAL_MS", "60000")
+    for k, v in env.items():
+        monkeypatch.setenv(k, v)
+    init_db()
+
+
+def test_record_audit_writes_inline_without_writer(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_URL", f"sqlite:///{tmp_path / 'audit.db'}")
+    monkeypatch.delenv("AUDIT_ASYNC", raising=False)
+    init_db()
+    assert audit_mod.start_audit_writer() is False
+    audit_mod.record_audit(request_id="r1", endpoint="/query", compliance_flag=False)
+    assert _rows() == ["r1"]
+
+
+def test_async_writer_batches_and_drains(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch, AUDIT_BATCH_SIZE="1000")
+    assert audit_mod.start_audit_writer() is True
+    try:
+        for i in range(5):
+            audit_mod.record_audit(request_id=f"r{i}", endpoint="/query", latency_ms=i)
+    finally:
+        audit_mod.stop_audit_writer()
+    assert _rows() == [f"r{i}" for i in range(5)]
+    assert not audit_mod._QUEUE
+
+
+def test_full_queue_policies(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch, AUDIT_BATCH_SIZE="1000", AUDIT_QUEUE_MAX="2")
+    assert audit_mod.start_audit_writer() is True
+    try:
+        # hold off the writer so the queue stays full
+        with audit_mod._FLUSH_LOCK:
+            # sync policy: overflow rows are written inline, nothing is lost
+            for i in range(4):
+                audit_mod.record_audit(request_id=f"s{i}", endpoint="/query")
+            monkeypatch.setenv("AUDIT_QUEUE_POLICY", "drop")
+            dropped = audit_mod.audit_dropped.labels(reason="queue_full")._value.get()
+            audit_mod.record_audit(request_id="d0", endpoint="/query")
+            assert audit_mod.audit_dropped.labels(reason="queue_full")._value.get() == dropped + 1
+    finally:
+        audit_mod.stop_audit_writer()
+    assert _rows() == [f"s{i}" for i in range(4)]
+
+
+class _FailingSession:
+    def execute(self, *args, **kwargs):
+        raise RuntimeError("DB down")
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_failed_batch_is_requeued(tmp_path, monkeypatch):
+    import db.session as db_session
+
+    _setup(tmp_path, monkeypatch)
+    audit_mod._QUEUE.append((0.0, audit_mod._audit_row(request_id="x", endpoint="/q"), None))
+    try:
+        with monkeypatch.context() as m:
+            m.setattr(db_session, "get_session", lambda: _FailingSession())
+            assert audit_mod.flush_audit() == 0
+        assert len(audit_mod._QUEUE) == 1
+        assert audit_mod.flush_audit() == 1
+    finally:
+        audit_mod._QUEUE.clear()
+    assert _rows() == ["x"]
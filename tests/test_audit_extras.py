@@ -0,0 +1,90 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect, text
+
+from app.main import app
+from db import session as db_session
+from db.migrations import migrate
+from db.models import Audit
+from db.partitions import ensure_partition, partition_name
+from db.session import get_session, init_db
+
+
+def test_query_persists_extras(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_URL", f"sqlite:///{tmp_path / 'audit.db'}")
+    init_db()
+    client = TestClient(app)
+    r = client.post("/query", json={"question": "what is the risk?", "intent": "risk_score"},
+                    headers={"X-Request-ID": "extras-1"})
+    assert r.status_code == 200
+    body_audit = r.json()["audit"]
+
+    db = get_session()
+    try:
+        row = db.query(Audit).filter(Audit.request_id == "extras-1").one()
+    finally:
+        db.close()
+    assert row.extras["router_intent"] == body_audit["router_intent"]
+    assert row.extras["rag_backend"] == body_audit["rag_backend"]
+    # base columns are not duplicated into extras
+    assert "request_id" not in row.extras and "latency_ms" not in row.extras
+
+
+def test_operational_queries_use_composite_indexes(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_URL", f"sqlite:///{tmp_path / 'audit.db'}")
+    engine = init_db()
+    with engine.connect() as conn:
+        plan = " ".join(
+            str(r[-1]) for r in conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT avg(latency_ms) FROM audit "
+                "WHERE user_id = 'u1' AND created_at >= '2026-01-01'"
+            ))
+        )
+        assert "ix_audit_user_id_created_at" in plan
+        plan = " ".join(
+            str(r[-1]) for r in conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT count(*) FROM audit "
+                "WHERE endpoint = '/query' AND created_at >= '2026-01-01'"
+            ))
+        )
+        assert "ix_audit_endpoint_created_at" in plan
+
+    name = partition_name(datetime.utcnow().date())
+    ensure_partition(engine, datetime.utcnow().date())
+    indexes = {ix["name"] for ix in inspect(engine).get_indexes(name)}
+    assert {f"ix_{name}_user_id_created_at", f"ix_{name}_endpoint_created_at"} <= indexes
+
+
+def test_migration_adds_extras_to_existing_tables(tmp_path):
+    engine = db_session.make_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    try:
+        with engine.begin() as conn:
+            # audit table and day partition as created before migration 4
+            for t in ("audit", "audit_20260101"):
+                conn.execute(text(
+                    f"CREATE TABLE {t} (id INTEGER PRIMARY KEY, request_id VARCHAR NOT NULL, "
+                    "endpoint VARCHAR NOT NULL, user_id VARCHAR, created_at DATETIME NOT NULL, "
+                    "tokens_prompt INTEGER, tokens_completion INTEGER, cost_usd FLOAT, latency_ms INTEGER, "
+                    "compliance_flag BOOLEAN, prompt_hash VARCHAR, response_hash VARCHAR)"
+                ))
+            conn.execute(text(
+                "INSERT INTO audit (request_id, endpoint, created_at) VALUES ('old', '/query', '2026-01-01')"
+            ))
+            conn.execute(text(
+                "CREATE TABLE schema_migrations (version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+                "applied_at TIMESTAMP NOT NULL)"
+            ))
+            conn.execute(text(
+                "INSERT INTO schema_migrations VALUES (1, 'base_tables', '2026-01-01'), "
+                "(2, 'audit_created_at_index', '2026-01-01'), (3, 'usage_daily', '2026-01-01')"
+            ))
+        assert 4 in migrate(engine)
+        insp = inspect(engine)
+        for t in ("audit", "audit_20260101"):
+            assert "extras" in {c["name"] for c in insp.get_columns(t)}
+            assert f"ix_{t}_user_id_created_at" in {ix["name"] for ix in insp.get_indexes(t)}
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT extras FROM audit")).scalar() is None
+    finally:
+        engine.dispose()
@@ -0,0 +1,81 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.utils.audit import record_audit
+from app.utils.audit_log import SegmentLog, close_segment_logs, get_segment_log, iter_segment
+from app.utils.retention import sweep_audit_log
+
+
+def _row(i, created_at=None):
+    return {"request_id": f"r{i}", "endpoint": "/query", "created_at": created_at or datetime.utcnow()}
+
+
+def test_segments_roll_over_by_size_and_reader_skips_partial_line(tmp_path, monkeypatch):
+    monkeypatch.setenv("AUDIT_LOG_SEGMENT_BYTES", "200")
+    log = SegmentLog(str(tmp_path))
+    for i in range(6):
+        log.append([_row(i)])
+    log.close()
+    names = log.segments()
+    assert len(names) > 1
+    ids = [rec["request_id"] for n in names for _, rec in iter_segment(str(tmp_path / n))]
+    assert ids == [f"r{i}" for i in range(6)]
+
+    # a line still being written is not returned until its newline lands
+    path = str(tmp_path / names[-1])
+    with open(path, "ab") as f:
+        f.write(b'{"request_id":"half"')
+    end = [off for off, _ in iter_segment(path)][-1]
+    assert list(iter_segment(path, end)) == []
+    assert isinstance(next(iter_segment(path))[1]["created_at"], datetime)
+
+
+def test_sweep_removes_old_segments_but_keeps_newest(tmp_path, monkeypatch):
+    monkeypatch.setenv("AUDIT_LOG_SEGMENT_BYTES", "1")
+    old = datetime.utcnow() - timedelta(days=40)
+    log = get_segment_log(str(tmp_path))
+    log.append([_row(0, old), _row(1, old)])
+    log.append([_row(2, old)])
+    log.append([_row(3)])
+    log.append([_row(4, old)])  # newest segment is never removed
+    close_segment_logs()
+    assert len(log.segments()) == 4
+
+    stats = sweep_audit_log(str(tmp_path), days=30)
+    assert stats["segments_removed"] == 2
+    assert stats["deleted"] == 3
+    remaining = [rec["request_id"] for n in log.segments() for _, rec in iter_segment(str(tmp_path / n))]
+    assert remaining == ["r3", "r4"]
+
+
+def test_record_audit_with_file_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("AUDIT_BACKEND_URL", f"file://{tmp_path}")
+    record_audit(request_id="f1", endpoint="/query", user_id="u1", tokens_prompt=3, model="m")
+    record_audit(request_id="f2", endpoint="/risk")
+    close_segment_logs()
+    names = sorted(os.listdir(tmp_path))
+    assert len(names) == 1
+    recs = [rec for _, rec in iter_segment(str(tmp_path / names[0]))]
+    assert [r["request_id"] for r in recs] == ["f1", "f2"]
+    assert recs[0]["user_id"] == "u1" and recs[0]["tokens_prompt"] == 3
+
+
+def test_export_reads_segments_incrementally(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from app.utils.audit_export import export_audit
+
+    log_dir = tmp_path / "log"
+    out = tmp_path / "out"
+    monkeypatch.setenv("AUDIT_BACKEND_URL", f"file://{log_dir}")
+    for i in range(5):
+        record_audit(request_id=f"e{i}", endpoint="/query")
+    stats = export_audit(out_dir=str(out), chunk_rows=2)
+    assert stats["rows"] == 5
+    assert len(pq.read_table(str(out)).column("request_id")) == 5
+
+    record_audit(request_id="e5", endpoint="/query")
+    assert export_audit(out_dir=str(out))["rows"] == 1
+    assert export_audit(out_dir=str(out))["rows"] == 0
+    close_segment_logs()
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, inspect, select
+
+from app.utils.audit import record_audit
+from app.utils.retention import sweep_audit_stats
+from db.models import Audit
+from db.partitions import ensure_partition, list_partitions, partition_name
+from db.session import get_session, init_db
+
+
+def test_day_partitions_written_and_dropped(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_URL", f"sqlite:///{tmp_path / 'audit.db'}")
+    monkeypatch.setenv("AUDIT_PARTITIONING", "day")
+    engine = init_db()
+
+    record_audit(request_id="today", endpoint="/query")
+    today = datetime.utcnow()
+    old_day = today - timedelta(days=40)
+    old = ensure_partition(engine, old_day.date())
+    with engine.begin() as conn:
+        conn.execute(
+            insert(old),
+            [{"request_id": f"o{i}", "endpoint": "/query", "created_at": old_day} for i in range(3)],
+        )
+
+    names = [name for _, name in list_partitions(engine)]
+    assert names == [partition_name(old_day.date()), partition_name(today.date())]
+    # partitioned writes leave the base table alone
+    db = get_session()
+    try:
+        assert db.query(Audit).count() == 0
+        stats = sweep_audit_stats(db, days=30)
+    finally:
+        db.close()
+    assert stats["partitions_dropped"] == 1
+    assert stats["deleted"] == 3
+    assert [name for _, name in list_partitions(engine)] == [partition_name(today.date())]
+    with engine.connect() as conn:
+        today_rows = conn.execute(
+            select(func.count()).select_from(ensure_partition(engine, today.date()))
+        ).scalar()
+    assert today_rows == 1
+
+
+def test_chunked_delete_on_base_table(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_URL", f"sqlite:///{tmp_path / 'audit.db'}")
+    monkeypatch.delenv("AUDIT_PARTITIONING", raising=False)
+    engine = init_db()
+    assert "ix_audit_created_at" in {ix["name"] for ix in inspect(engine).get_indexes("audit")}
+
+    db = get_session()
+    try:
+        old = datetime.utcnow() - timedelta(days=90)
+        db.add_all([Audit(request_id=f"o{i}", endpoint="/q", created_at=old) for i in range(7)])
+        db.add(Audit(request_id="new", endpoint="/q", created_at=datetime.utcnow()))
+        db.commit()
+        stats = sweep_audit_stats(db, days=30, batch_size=3)
+        assert stats["deleted"] == stats["rows_deleted"] == 7
+        assert stats["batches"] == 3
+        assert stats["partitions_dropped"] == 0
+        assert [r.request_id for r in db.query(Audit).all()] == ["new"]
+    finally:
+        db.close()
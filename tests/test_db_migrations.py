@@ -0,0 +1,33 @@
+from sqlalchemy import inspect
+
+from db import session as db_session
+from db.migrations import MIGRATIONS, current_version, migrate, pending_migrations
+
+
+def test_init_db_builds_engine_once_per_url(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_URL", f"sqlite:///{tmp_path / 'a.db'}")
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    engine = db_session.init_db()
+    assert db_session.init_db() is engine
+    assert db_session.get_engine() is engine
+    assert engine.pool.size() == 3
+    assert "audit" in inspect(engine).get_table_names()
+    assert current_version(engine) == MIGRATIONS[-1][0]
+    assert pending_migrations(engine) == []
+    # already applied: nothing to do
+    assert migrate(engine) == []
+
+    monkeypatch.setenv("DB_URL", f"sqlite:///{tmp_path / 'b.db'}")
+    other = db_session.init_db()
+    assert other is not engine
+    assert db_session.get_session().bind is other
+
+
+def test_migrate_fresh_database(tmp_path):
+    engine = db_session.make_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    try:
+        assert pending_migrations(engine) == [(v, n) for v, n, _ in MIGRATIONS]
+        assert migrate(engine) == [v for v, _, _ in MIGRATIONS]
+        assert "audit" in inspect(engine).get_table_names()
+    finally:
+        engine.dispose()
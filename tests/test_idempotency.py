@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.idempotency import IdempotencyCache
+from db.models import Audit
+from db.session import get_session, init_db
+
+
+def test_query_retry_replays_first_response(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_URL", f"sqlite:///{tmp_path / 'audit.db'}")
+    init_db()
+    client = TestClient(app)
+    body = {"question": "what is the retention policy?"}
+    headers = {"X-Request-ID": "idem-retry-1"}
+
+    first = client.post("/query", json=body, headers=headers)
+    second = client.post("/query", json=body, headers=headers)
+    assert first.status_code == second.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.json() == first.json()
+    db = get_session()
+    try:
+        assert db.query(Audit).filter(Audit.request_id == "idem-retry-1").count() == 1
+    finally:
+        db.close()
+
+    # same id, different payload
+    r = client.post("/query", json={"question": "something else entirely"}, headers=headers)
+    assert r.status_code == 409
+    # no client request id: every call runs
+    r = client.post("/query", json=body)
+    assert "Idempotent-Replayed" not in r.headers
+
+
+def test_concurrent_duplicates_compute_once():
+    cache = IdempotencyCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"answer": 42}
+
+    results = []
+
+    def worker():
+        results.append(cache.run(("/query", "dup"), "fp", compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    started.wait(5)
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert len(calls) == 1
+    assert sorted(replayed for _, replayed in results) == [False, True, True, True]
+    assert all(value == {"answer": 42} for value, _ in results)
+
+
+def test_failures_are_not_cached_and_entries_are_bounded(monkeypatch):
+    cache = IdempotencyCache()
+
+    def fail():
+        raise HTTPException(status_code=503, detail="llm down")
+
+    with pytest.raises(HTTPException):
+        cache.run(("/query", "f"), "fp", fail)
+    assert cache.run(("/query", "f"), "fp", lambda: "ok") == ("ok", False)
+
+    monkeypatch.setenv("IDEMPOTENCY_MAX_ENTRIES", "2")
+    for i in range(3):
+        cache.run(("/query", f"k{i}"), "fp", lambda: i)
+    assert len(cache) == 2
+    assert cache.run(("/query", "k0"), "fp", lambda: "again") == ("again", False)
+
+    monkeypatch.setenv("IDEMPOTENCY_TTL_SEC", "0")
+    cache.clear()
+    cache.run(("/query", "t"), "fp", lambda: 1)
+    assert cache.run(("/query", "t"), "fp", lambda: 2) == (2, False)
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import architect_agent, llm_pool
+from app.services.llm_client import AsyncLLMClient, LLMClient
+from app.utils.metrics import llm_http_requests
+
+
+class _ChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    delay = 0.0
+    active = peak = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(cls.delay)
+        with cls.lock:
+            cls.active -= 1
+        body = json.dumps({
+            "choices": [{"message": {"content": "pooled"}}],
+            "usage": {"prompt_tokens": 3, "completion_tokens": 1},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def chat_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    llm_pool.close_llm_clients()
+
+
+def _count(connection):
+    return llm_http_requests.labels(provider="azure", connection=connection)._value.get()
+
+
+def test_llm_calls_reuse_pooled_connection(chat_server, monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "azure")
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", chat_server)
+    llm_pool.close_llm_clients()
+    new, reused = _count("new"), _count("reused")
+
+    # a fresh LLMClient per call, as routers do, still shares the provider pool
+    for _ in range(3):
+        out = LLMClient().call([{"role": "user", "content": "hi"}])
+        assert out["text"] == "pooled"
+        assert out["tokens_prompt"] == 3
+    assert _count("new") - new == 1
+    assert _count("reused") - reused == 2
+    assert llm_pool.get_http_client("azure") is llm_pool.get_http_client("azure")
+
+
+def test_pool_settings_and_close(monkeypatch):
+    monkeypatch.setenv("LLM_TIMEOUT_SEC", "12")
+    monkeypatch.setenv("LLM_CONNECT_TIMEOUT_SEC", "2")
+    llm_pool.close_llm_clients()
+    client = llm_pool.get_http_client("azure")
+    assert client.timeout.read == 12 and client.timeout.connect == 2
+    llm_pool.close_llm_clients()
+    assert client.is_closed
+    assert llm_pool.get_http_client("azure") is not client
+    llm_pool.close_llm_clients()
+
+
+def test_async_client_bounds_in_flight_requests_per_provider(chat_server, monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "azure")
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", chat_server)
+    monkeypatch.setenv("LLM_MAX_CONCURRENCY_AZURE", "2")
+    monkeypatch.setattr(_ChatHandler, "delay", 0.05)
+    monkeypatch.setattr(_ChatHandler, "peak", 0)
+    reused = _count("reused")
+
+    async def scenario():
+        try:
+            return await asyncio.gather(
+                *(AsyncLLMClient().call([{"role": "user", "content": f"q{i}"}]) for i in range(8))
+            )
+        finally:
+            await llm_pool.aclose_llm_clients()
+
+    results = asyncio.run(scenario())
+    assert [r["text"] for r in results] == ["pooled"] * 8
+    assert results[0]["provider"] == "azure" and results[0]["tokens_prompt"] == 3
+    assert _ChatHandler.peak == 2
+    assert _count("reused") - reused >= 6
+
+
+def test_async_client_stub_matches_sync():
+    messages = [{"role": "user", "content": "hello there"}]
+    assert asyncio.run(AsyncLLMClient().call(messages)) == LLMClient().call(messages)
+    # not interchangeable: code expecting LLMClient.call must never get a coroutine
+    assert not issubclass(AsyncLLMClient, LLMClient)
+
+
+def test_async_architect_agent_awaits_async_llm(monkeypatch):
+    async def fake_call(self, messages):
+        return {"text": '{"summary": "async plan"}', "provider": "stub", "model": "async-unit",
+                "tokens_prompt": 4, "tokens_completion": 2, "cost_usd": 0.0}
+
+    def sync_call(self, messages):
+        raise AssertionError("sync LLM client used from the async agent")
+
+    monkeypatch.setattr(AsyncLLMClient, "call", fake_call)
+    monkeypatch.setattr(LLMClient, "call", sync_call)
+    plan, audit = asyncio.run(architect_agent.arun_architect_agent("How do I deploy this?"))
+    assert plan.summary == "async plan"
+    assert audit["llm_model"] == "async-unit"
@@ -0,0 +1,54 @@
+import pytest
+
+from app.memory.fact_store import Fact, UserFactStore
+
+
+def _vec(i: int, dim: int = 8):
+    v = [0.0] * dim
+    v[i % dim] = 1.0
+    return v
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_scores_rank_matching_vector_first(dtype):
+    store = UserFactStore(dtype=dtype)
+    for i in range(4):
+        store.append(Fact(f"id{i}", f"text {i}", float(i)), _vec(i))
+    sims = store.scores(_vec(2))
+    best_row = max(sims, key=sims.get)
+    assert store.get("id2").row == best_row
+    assert sims[best_row] == pytest.approx(1.0, abs=0.02)
+    assert store.vector(store.get("id2")) == pytest.approx(_vec(2), abs=0.02)
+
+
+def test_removed_rows_are_reused_and_not_scored():
+    store = UserFactStore()
+    for i in range(20):  # forces the matrix to grow past its initial capacity
+        store.append(Fact(f"id{i}", "t", float(i)), _vec(i))
+    oldest = store.pop_oldest(2)
+    assert [f.id for f in oldest] == ["id0", "id1"]
+    assert all(f.row is None for f in oldest)
+    assert len(store.scores(_vec(0))) == 18
+    store.append(Fact("new", "t", 99.0), _vec(3))
+    assert store.get("new").row in (0, 1)
+    assert store._high == 20
+
+
+def test_vectorless_fact_and_dimension_mismatch():
+    store = UserFactStore()
+    f = Fact("a", "t", 0.0, {})
+    store.append(f)
+    assert f.row is None and f.metadata is None
+    assert store.set_vector(f, _vec(0)) is True
+    g = Fact("b", "t", 1.0)
+    store.append(g)
+    assert store.set_vector(g, [1.0, 2.0]) is False
+    assert f.to_dict(store.vector(f))["metadata"] == {}
+
+
+def test_embedding_matrix_is_compact():
+    store = UserFactStore()
+    for i in range(1000):
+        store.append(Fact(f"id{i}", "t", float(i)), [0.1] * 384)
+    # 384 float32 per row, capacity rounded up to a power of two
+    assert store.nbytes() <= 1024 * (384 * 4 + 1)
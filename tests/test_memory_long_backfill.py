@@ -0,0 +1,54 @@
+from app.memory import long_memory
+from app.memory.long_memory import (
+    backfill_embeddings,
+    clear_long_memory,
+    ingest_fact,
+    retrieve_facts,
+)
+from app.utils.metrics import memory_long_embedding_backlog
+
+
+class FailingEmbeddings:
+    def embed(self, texts):
+        raise RuntimeError("embedder down")
+
+
+class CountingEmbeddings:
+    def __init__(self):
+        self.calls = 0
+
+    def embed(self, texts):
+        self.calls += 1
+        return [[1.0] * 4 for _ in texts]
+
+
+def test_backfill_attaches_vectors_off_request_path(monkeypatch):
+    uid = "backfill_user"
+    clear_long_memory(uid)
+    monkeypatch.setattr(long_memory, "_get_embedder", lambda: FailingEmbeddings())
+    ingest_fact(uid, "fact stored while the embedder was unavailable")
+    ingest_fact(uid, "another fact stored without a vector")
+    assert memory_long_embedding_backlog._value.get() >= 2
+
+    # retrieval must not embed stored facts inline
+    counting = CountingEmbeddings()
+    monkeypatch.setattr(long_memory, "_get_embedder", lambda: counting)
+    facts = retrieve_facts(uid, "query")
+    assert len(facts) == 2
+    assert counting.calls == 1  # query vector only
+
+    attached = backfill_embeddings(batch_size=10)
+    assert attached == 2
+    assert all(f.row is not None for f in long_memory._FACT_STORE[uid])
+    assert (uid, facts[0]["id"]) not in long_memory._PENDING_EMBEDDINGS
+    clear_long_memory(uid)
+
+
+def test_backfill_skips_cleared_facts(monkeypatch):
+    uid = "backfill_cleared"
+    monkeypatch.setattr(long_memory, "_get_embedder", lambda: FailingEmbeddings())
+    ingest_fact(uid, "fact that is cleared before the worker runs")
+    clear_long_memory(uid)
+    monkeypatch.setattr(long_memory, "_get_embedder", lambda: CountingEmbeddings())
+    assert backfill_embeddings() == 0
+    assert not any(u == uid for u, _ in long_memory._PENDING_EMBEDDINGS)
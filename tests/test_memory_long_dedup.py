@@ -0,0 +1,68 @@
+from app.memory import long_memory
+from app.memory.long_memory import clear_long_memory, ingest_fact
+from app.services.rag_retriever import StubEmbeddings
+
+
+class KeywordEmbeddings:
+    """Vectors from keyword presence so paraphrases land close together."""
+
+    KEYS = ("docker", "deploy", "chroma", "rag", "kubernetes")
+
+    def embed(self, texts):
+        return [[1.0 if k in t.lower() else 0.0 for k in self.KEYS] + [0.1] for t in texts]
+
+
+def test_near_duplicate_refreshes_existing_fact(monkeypatch):
+    monkeypatch.setattr(long_memory, "_get_embedder", lambda: KeywordEmbeddings())
+    monkeypatch.setenv("MEMORY_LONG_DEDUP_THRESHOLD", "0.98")
+    uid = "dedup_user"
+    clear_long_memory(uid)
+    ingest_fact(uid, "Deploy the service with Docker compose", {"source": "plan-1"})
+    ingest_fact(uid, "Configure RAG with the Chroma backend")
+    ingest_fact(uid, "Use docker to deploy the API service", {"session": "s2"})
+    store = long_memory._FACT_STORE[uid]
+    assert len(store) == 2
+    assert ingest_fact._last_merged == 1
+    # the newer text replaces the old fact, metadata is merged, and it becomes the newest
+    newest = store.facts[-1]
+    assert newest.text == "Use docker to deploy the API service"
+    assert newest.metadata == {"source": "plan-1", "session": "s2"}
+    assert store.get(newest.id) is newest and newest.row is not None
+    assert [f.text for f in store.facts] == [
+        "Configure RAG with the Chroma backend",
+        "Use docker to deploy the API service",
+    ]
+    clear_long_memory(uid)
+
+
+def test_constant_vectors_and_unrelated_text_are_not_merged(monkeypatch):
+    monkeypatch.setattr(long_memory, "_get_embedder", lambda: StubEmbeddings())
+    monkeypatch.setenv("MEMORY_LONG_DEDUP_THRESHOLD", "0.5")
+    uid = "dedup_stub"
+    clear_long_memory(uid)
+    # stub vectors are identical after normalization
+    ingest_fact(uid, "Deploy the service with Docker compose")
+    ingest_fact(uid, "Rotate the audit logs every night")
+    assert len(long_memory._FACT_STORE[uid]) == 2
+    assert ingest_fact._last_merged == 0
+
+    monkeypatch.setattr(long_memory, "_get_embedder", lambda: KeywordEmbeddings())
+    clear_long_memory(uid)
+    # same keyword vector, but no word in common
+    ingest_fact(uid, "Kubernetes")
+    ingest_fact(uid, "mykubernetes-cluster runbook")
+    assert len(long_memory._FACT_STORE[uid]) == 2
+    assert ingest_fact._last_merged == 0
+    clear_long_memory(uid)
+
+
+def test_dedup_disabled_by_default(monkeypatch):
+    monkeypatch.setattr(long_memory, "_get_embedder", lambda: KeywordEmbeddings())
+    monkeypatch.delenv("MEMORY_LONG_DEDUP_THRESHOLD", raising=False)
+    uid = "dedup_off"
+    clear_long_memory(uid)
+    ingest_fact(uid, "Deploy the service with Docker compose")
+    ingest_fact(uid, "Use docker to deploy the API service")
+    assert len(long_memory._FACT_STORE[uid]) == 2
+    assert ingest_fact._last_merged == 0
+    clear_long_memory(uid)
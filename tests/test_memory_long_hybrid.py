@@ -0,0 +1,55 @@
+from app.memory import long_memory
+from app.memory.fact_store import tokenize
+from app.memory.long_memory import clear_long_memory, ingest_fact, retrieve_facts
+
+
+def test_tokenize_keeps_ticket_ids_and_parts():
+    toks = tokenize("Fixed in PROJ-1234 by the on-call team.")
+    assert {"proj-1234", "proj", "1234", "fixed", "call"} <= toks
+    assert "the" not in toks and "in" not in toks
+
+
+def test_keyword_fact_ranks_first_with_stub_embeddings(monkeypatch):
+    # stub vectors only depend on text length, so dense scores cannot tell these apart
+    monkeypatch.setenv("EMBEDDINGS_PROVIDER", "stub")
+    uid = "hybrid_user"
+    clear_long_memory(uid)
+    ingest_fact(uid, "Outage postmortem is tracked in OPS-4821 for review")
+    for i in range(20):
+        ingest_fact(uid, f"Unrelated architecture note number {i:02d} about caching")
+    facts = retrieve_facts(uid, "what happened in OPS-4821?", top_k=3)
+    assert facts[0]["text"].startswith("Outage postmortem")
+    clear_long_memory(uid)
+
+
+def test_dense_scoring_limited_to_shortlist(monkeypatch):
+    monkeypatch.setenv("EMBEDDINGS_PROVIDER", "stub")
+    monkeypatch.setenv("MEMORY_LONG_HYBRID_SHORTLIST", "5")
+    uid = "hybrid_shortlist"
+    clear_long_memory(uid)
+    for i in range(50):
+        ingest_fact(uid, f"fact body {i}")
+    seen = []
+    store = long_memory._FACT_STORE[uid]
+    orig = store.scores_for
+
+    def spy(facts, qvec):
+        seen.append(len(facts))
+        return orig(facts, qvec)
+
+    monkeypatch.setattr(store, "scores_for", spy, raising=False)
+    facts = retrieve_facts(uid, "body 7", top_k=3)
+    assert seen == [5]
+    assert len(facts) == 3
+    clear_long_memory(uid)
+
+
+def test_vector_mode_scores_all_facts(monkeypatch):
+    monkeypatch.setenv("EMBEDDINGS_PROVIDER", "stub")
+    monkeypatch.setenv("MEMORY_LONG_SEARCH_MODE", "vector")
+    uid = "hybrid_vector"
+    clear_long_memory(uid)
+    for i in range(12):
+        ingest_fact(uid, f"fact body {i}")
+    assert len(retrieve_facts(uid, "anything", top_k=20)) == 12
+    clear_long_memory(uid)
@@ -0,0 +1,126 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.memory import long_memory
+from app.memory.long_memory import clear_long_memory, ingest_fact
+
+client = TestClient(app)
+HEADERS = {"X-User-Role": "analyst"}
+
+
+def _lines(resp):
+    return [json.loads(line) for line in resp.text.splitlines() if line.strip()]
+
+
+def test_ndjson_export_streams_facts_with_base64_embeddings(monkeypatch):
+    monkeypatch.setenv("MEMORY_LONG_ENABLED", "true")
+    monkeypatch.setenv("EMBEDDINGS_PROVIDER", "stub")
+    uid = "ndjson_export"
+    clear_long_memory(uid)
+    for i in range(3):
+        ingest_fact(uid, f"exported fact number {i}", {"n": i})
+    r = client.get(
+        "/memory/long/export/ndjson",
+        params={"user_id": uid, "embeddings": "base64"},
+        headers=HEADERS,
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = _lines(r)
+    facts, trailer = rows[:-1], rows[-1]
+    assert [f["text"] for f in facts] == [f"exported fact number {i}" for i in range(3)]
+    assert facts[0]["embedding_encoding"] == "base64-float32"
+    assert len(long_memory.decode_embedding(facts[0]["embedding"])) == 384
+    assert trailer["audit"]["memory_long_reads"] == 3
+    clear_long_memory(uid)
+
+
+def test_ndjson_import_roundtrip_in_batches(monkeypatch):
+    monkeypatch.setenv("MEMORY_LONG_ENABLED", "true")
+    monkeypatch.setenv("EMBEDDINGS_PROVIDER", "stub")
+    monkeypatch.setenv("MEMORY_LONG_IMPORT_BATCH", "2")
+    src, dst = "ndjson_src", "ndjson_dst"
+    clear_long_memory(src)
+    clear_long_memory(dst)
+    for i in range(5):
+        ingest_fact(src, f"roundtrip fact {i}")
+    exported = client.get(
+        "/memory/long/export/ndjson",
+        params={"user_id": src, "embeddings": "base64"},
+        headers=HEADERS,
+    ).content
+    # precomputed vectors are reused instead of re-embedding
+    monkeypatch.setattr(long_memory, "_get_embedder", lambda: None)
+    body = exported + b"not json\n"
+    r = client.post(
+        "/memory/long/import/ndjson",
+        params={"user_id": dst},
+        content=body,
+        headers={**HEADERS, "Content-Type": "application/x-ndjson"},
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["imported"] == 5
+    assert data["batches"] == 3
+    assert data["skipped"] == 1
+    assert data["audit"]["memory_long_writes"] == 5
+    assert all(f.row is not None for f in long_memory._FACT_STORE[dst])
+    clear_long_memory(src)
+    clear_long_memory(dst)
+
+
+def test_ndjson_import_skips_overlong_lines(monkeypatch):
+    monkeypatch.setenv("MEMORY_LONG_ENABLED", "true")
+    monkeypatch.setenv("EMBEDDINGS_PROVIDER", "stub")
+    monkeypatch.setenv("MEMORY_LONG_IMPORT_MAX_LINE_BYTES", "64")
+    dst = "ndjson_overlong"
+    clear_long_memory(dst)
+    long_line = json.dumps({"text": "x" * 500}).encode()
+
+    def body():
+        yield b'{"text": "short fact one"}\n' + long_line[:100]
+        yield long_line[100:300]  # still inside the overlong line
+        yield long_line[300:] + b'\n{"text": "short fact two"}\n'
+        yield json.dumps({"text": "y" * 200}).encode() + b'\n{"text": "tail'
+        yield b' fact"}' + b"z" * 100  # unterminated and overlong at EOF
+
+    r = client.post("/memory/long/import/ndjson", params={"user_id": dst}, content=body(), headers=HEADERS)
+    assert r.status_code == 200
+    data = r.json()
+    assert data["imported"] == 2
+    assert data["skipped"] == 3
+    assert sorted(f.text for f in long_memory._FACT_STORE[dst]) == ["short fact one", "short fact two"]
+    clear_long_memory(dst)
+
+
+def test_ndjson_import_skips_mistyped_records(monkeypatch):
+    monkeypatch.setenv("MEMORY_LONG_ENABLED", "true")
+    monkeypatch.setenv("EMBEDDINGS_PROVIDER", "stub")
+    dst = "ndjson_types"
+    clear_long_memory(dst)
+    body = b"\n".join(
+        [
+            b'{"text": 123}',
+            b'{"text": "x", "metadata": "oops"}',
+            b'{"text": ["a"]}',
+            b'{"text": "kept", "metadata": {"k": "v"}}',
+        ]
+    )
+    r = client.post("/memory/long/import/ndjson", params={"user_id": dst}, content=body, headers=HEADERS)
+    assert r.status_code == 200
+    assert r.json()["imported"] == 1 and r.json()["skipped"] == 3
+    # the user's export still works end to end
+    r = client.get("/memory/long/export/ndjson", params={"user_id": dst}, headers=HEADERS)
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [rec["text"] for rec in lines if "text" in rec] == ["kept"]
+    assert "audit" in lines[-1]
+    clear_long_memory(dst)
+
+
+def test_ndjson_endpoints_require_role():
+    r = client.get("/memory/long/export/ndjson", params={"user_id": "u"})
+    assert r.status_code == 403
+    r = client.post("/memory/long/import/ndjson", params={"user_id": "u"}, content=b"")
+    assert r.status_code == 403
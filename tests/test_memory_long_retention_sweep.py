@@ -0,0 +1,77 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.memory import long_memory
+from app.memory.long_memory import (
+    clear_long_memory,
+    get_sweep_stats,
+    ingest_fact,
+    retrieve_facts,
+    sweep_expired_facts,
+)
+
+client = TestClient(app)
+
+
+def _age(user_id: str, days: float) -> None:
+    # rewrite timestamps in order so the store stays time-ordered
+    store = long_memory._FACT_STORE[user_id]
+    base = time.time() - days * 86400
+    for i, f in enumerate(store.facts):
+        f.created_at = base + i
+
+
+def test_reads_skip_expired_facts_without_pruning(monkeypatch):
+    monkeypatch.setenv("EMBEDDINGS_PROVIDER", "stub")
+    uid = "sweep_read"
+    clear_long_memory(uid)
+    for i in range(3):
+        ingest_fact(uid, f"an old fact number {i} that should expire soon")
+    _age(uid, 10)
+    ingest_fact(uid, "a fresh fact that stays within retention")
+    monkeypatch.setenv("MEMORY_LONG_RETENTION_DAYS", "1")
+
+    facts = retrieve_facts(uid, "fact")
+    assert [f["text"] for f in facts] == ["a fresh fact that stays within retention"]
+    # read path does not mutate the store
+    assert len(long_memory._FACT_STORE[uid]) == 4
+    clear_long_memory(uid)
+
+
+def test_sweeper_prunes_prefix_and_reports_status(monkeypatch):
+    monkeypatch.setenv("EMBEDDINGS_PROVIDER", "stub")
+    uid = "sweep_status"
+    clear_long_memory(uid)
+    for i in range(5):
+        ingest_fact(uid, f"sweepable fact {i}")
+    _age(uid, 30)
+    ingest_fact(uid, "sweepable fact that is recent")
+    monkeypatch.setenv("MEMORY_LONG_RETENTION_DAYS", "7")
+
+    before = get_sweep_stats()["pruned_total"]
+    assert sweep_expired_facts() >= 5
+    assert [f.text for f in long_memory._FACT_STORE[uid]] == ["sweepable fact that is recent"]
+    stats = get_sweep_stats()
+    assert stats["pruned_total"] - before >= 5
+    assert stats["last_duration_ms"] is not None
+
+    r = client.get("/memory/status", headers={"X-User-Role": "admin"})
+    assert r.status_code == 200
+    sweep = r.json()["long_memory"]["retention_sweep"]
+    assert sweep["sweeps"] >= 1 and sweep["last_run_at"]
+    clear_long_memory(uid)
+
+
+def test_reingest_moves_fact_to_end_of_time_order(monkeypatch):
+    monkeypatch.setenv("EMBEDDINGS_PROVIDER", "stub")
+    uid = "sweep_order"
+    clear_long_memory(uid)
+    ingest_fact(uid, "first")
+    ingest_fact(uid, "second")
+    ingest_fact(uid, "first")
+    store = long_memory._FACT_STORE[uid]
+    assert [f.text for f in store] == ["second", "first"]
+    assert store.facts[0].created_at <= store.facts[1].created_at
+    clear_long_memory(uid)
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.memory import short_memory_async as sm
+from app.memory.short_memory import load_turns
+from app.services import architect_agent
+from app.services.architect_agent import arun_architect_agent
+
+
+def test_async_api_runs_on_dedicated_db_thread(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "async.db"))
+    threads = []
+    real = sm.short_memory.save_turn
+    monkeypatch.setattr(
+        sm.short_memory,
+        "save_turn",
+        lambda *a: threads.append(threading.current_thread().name) or real(*a),
+    )
+
+    async def scenario():
+        await sm.init_short_memory()
+        await sm.save_turn("u", "s", "user", "hello")
+        await sm.save_turns("u", "s", [("assistant", "hi"), ("user", "again")])
+        turns = await sm.load_turns("u", "s")
+        await sm.clear_short_memory("u", "s")
+        return turns, await sm.load_turns("u", "s")
+
+    turns, after_clear = asyncio.run(scenario())
+    assert turns == [("user", "hello"), ("assistant", "hi"), ("user", "again")]
+    assert after_clear == []
+    assert threads and all(t.startswith("short-memory-db") for t in threads)
+    sm.shutdown_async_short_memory()
+
+
+def test_event_loop_stays_responsive_during_memory_io(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "loop.db"))
+    release = threading.Event()
+    monkeypatch.setattr(sm.short_memory, "load_turns", lambda u, s: release.wait(5) and [])
+
+    async def scenario():
+        pending = asyncio.ensure_future(sm.load_turns("u", "s"))
+        # the loop keeps running other tasks while the DB thread is busy
+        await asyncio.sleep(0.01)
+        ticked = not pending.done()
+        release.set()
+        await pending
+        return ticked
+
+    assert asyncio.run(scenario()) is True
+    sm.shutdown_async_short_memory()
+
+
+def test_arun_architect_agent_matches_sync_audit_and_persists(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "arch.db"))
+    monkeypatch.setenv("MEMORY_SHORT_ENABLED", "true")
+    plan, audit = asyncio.run(
+        arun_architect_agent("How do I deploy this?", session_id="s", user_id="async_u")
+    )
+    assert audit["memory_short_writes"] == 2
+    assert load_turns("async_u", "s")[0] == ("user", "How do I deploy this?")
+    _, sync_audit = architect_agent.run_architect_agent("How do I deploy this?", "s2", "async_u")
+    assert set(audit) == set(sync_audit)
+
+
+def test_stream_handler_uses_async_agent(monkeypatch):
+    monkeypatch.setenv("PROJECT_GUIDE_ENABLED", "true")
+    called = []
+    real = architect_agent.arun_architect_agent
+
+    async def spy(*a, **k):
+        called.append(a)
+        return await real(*a, **k)
+
+    monkeypatch.setattr("app.routers.architect_stream.arun_architect_agent", spy)
+    r = TestClient(app).get("/architect/stream", params={"question": "how does memory work?"})
+    assert r.status_code == 200 and "event: audit" in r.text
+    assert called
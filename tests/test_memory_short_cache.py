@@ -0,0 +1,72 @@
+from app.memory import short_memory
+from app.memory.session_cache import SessionCache
+from app.memory.short_memory import (
+    clear_short_memory,
+    load_summary,
+    load_turns,
+    save_turn,
+    update_summary_if_needed,
+)
+from app.utils.metrics import memory_short_cache_requests
+
+
+def _hits() -> float:
+    return memory_short_cache_requests.labels(result="hit")._value.get()
+
+
+def _no_db(*a, **k):
+    raise AssertionError("expected a cache hit")
+
+
+def test_hot_session_is_served_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "cache.db"))
+    monkeypatch.setenv("MEMORY_SHORT_MAX_TURNS", "2")
+    save_turn("u", "s", "user", "q1")
+    assert load_turns("u", "s") == [("user", "q1")]
+    assert load_summary("u", "s") == ""
+
+    hits = _hits()
+    monkeypatch.setattr(short_memory, "_load_turns", _no_db)
+    save_turn("u", "s", "assistant", "a1")
+    save_turn("u", "s", "user", "q2")
+    assert load_turns("u", "s") == [("user", "q1"), ("assistant", "a1"), ("user", "q2")]
+    assert update_summary_if_needed("u", "s") is True
+    assert "q2" in load_summary("u", "s")
+    # two explicit reads plus the turns/summary seeding the summary state
+    assert _hits() - hits == 4
+
+
+def test_clear_invalidates_and_budget_evicts_lru(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "evict.db"))
+    save_turn("u", "a", "user", "x" * 600)
+    save_turn("u", "b", "user", "y" * 600)
+    load_turns("u", "a")
+    clear_short_memory("u", "a")
+    assert load_turns("u", "a") == []
+
+    monkeypatch.setenv("MEMORY_SHORT_CACHE_BYTES", "1500")
+    short_memory._SESSION_CACHE.clear()
+    load_turns("u", "a")
+    load_turns("u", "b")
+    load_turns("u", "a")  # touch a so b becomes least recently used
+    save_turn("u", "c", "user", "z" * 600)
+    load_turns("u", "c")
+    keys = [k[2] for k in short_memory._SESSION_CACHE._entries]
+    assert "b" not in keys and keys[-1] == "c"
+    assert short_memory._SESSION_CACHE.nbytes() <= 1500
+
+
+def test_loader_racing_a_write_does_not_cache_stale_turns():
+    cache = SessionCache()
+    key = ("db", "u", "s")
+    epoch = cache.epoch(key)  # loader starts, reads DB without the new turn
+    token = cache.begin_append(key, ("user", "new", 1))
+    cache.end_write(key, token)  # writer commits
+    cache.put_turns(key, [("user", "old", 0)], 0, epoch)
+    assert cache.get_turns(key, None, 0) is None
+
+    # loader populating between begin_append and end_write is dropped too
+    token = cache.begin_append(key, ("user", "newer", 2))
+    cache.put_turns(key, [("user", "old", 0)], 0, cache.epoch(key))
+    cache.end_write(key, token)
+    assert cache.get_turns(key, None, 0) is None
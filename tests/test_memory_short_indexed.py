@@ -0,0 +1,56 @@
+import sqlite3
+import time
+
+from app.memory.short_memory import close_short_memory, get_conn, load_turns, save_turn
+
+
+def _plan(conn, sql, params):
+    return " ".join(r[-1] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+
+def test_legacy_db_is_migrated_and_ts_backfilled(tmp_path, monkeypatch):
+    path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(path)
+    legacy.execute(
+        "CREATE TABLE turns (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT,"
+        " session_id TEXT, role TEXT, content TEXT, timestamp TEXT)"
+    )
+    legacy.execute(
+        "INSERT INTO turns (user_id, session_id, role, content, timestamp)"
+        " VALUES ('u', 's', 'user', 'old', '2020-01-01T00:00:00')"
+    )
+    legacy.commit()
+    legacy.close()
+    monkeypatch.setenv("MEMORY_DB_PATH", str(path))
+    close_short_memory()
+
+    conn = get_conn()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] >= 1
+    assert conn.execute("SELECT ts FROM turns").fetchone()[0] == 1577836800
+    indexes = {r[1] for r in conn.execute("PRAGMA index_list(turns)")}
+    assert {"idx_turns_session", "idx_turns_ts"} <= indexes
+
+    # retention now filters on the backfilled epoch column
+    monkeypatch.setenv("SHORT_MEMORY_RETENTION_DAYS", "1")
+    save_turn("u", "s", "user", "new")
+    assert load_turns("u", "s") == [("user", "new")]
+
+
+def test_reads_return_newest_turns_in_order_via_index(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "idx.db"))
+    monkeypatch.setenv("SHORT_MEMORY_MAX_TURNS_PER_SESSION", "3")
+    for i in range(6):
+        save_turn("u", "s", "user", f"m{i}")
+    save_turn("u", "other", "user", "x")
+    assert [c for _, c in load_turns("u", "s")] == ["m3", "m4", "m5"]
+
+    conn = get_conn()
+    assert conn.execute("SELECT ts FROM turns WHERE content='m5'").fetchone()[0] >= int(
+        time.time()
+    ) - 5
+    plan = _plan(
+        conn,
+        "SELECT id FROM turns WHERE user_id=? AND session_id=? ORDER BY id DESC LIMIT 3",
+        ("u", "s"),
+    )
+    assert "idx_turns_session" in plan and "TEMP B-TREE" not in plan
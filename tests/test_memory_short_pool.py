@@ -0,0 +1,76 @@
+import threading
+
+from app.memory import short_memory
+from app.memory.short_memory import (
+    close_short_memory,
+    get_conn,
+    load_turns,
+    save_turn,
+)
+
+
+def test_connection_reused_per_thread_with_wal(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "pool.db"))
+    c1 = get_conn()
+    c2 = get_conn()
+    assert c1 is c2
+    assert c1.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert c1.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    other = []
+    t = threading.Thread(target=lambda: other.append(get_conn()))
+    t.start()
+    t.join()
+    assert other[0] is not c1
+
+
+def test_schema_initialized_once_and_no_connect_on_hot_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "hot.db"))
+    save_turn("u", "s", "user", "hello")
+    calls = []
+    real_connect = short_memory.sqlite3.connect
+    monkeypatch.setattr(
+        short_memory.sqlite3,
+        "connect",
+        lambda *a, **k: calls.append(a) or real_connect(*a, **k),
+    )
+    monkeypatch.setattr(short_memory, "_create_schema", lambda conn: calls.append("ddl"))
+    save_turn("u", "s", "assistant", "hi")
+    assert load_turns("u", "s") == [("user", "hello"), ("assistant", "hi")]
+    assert calls == []
+
+
+def test_close_drops_stale_connections(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "close.db"))
+    save_turn("u", "s", "user", "before close")
+    old = get_conn()
+    close_short_memory()
+    assert get_conn() is not old
+    assert load_turns("u", "s") == [("user", "before close")]
+
+
+def test_connections_closed_when_thread_exits(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "exit.db"))
+    monkeypatch.setenv("SHORT_MEMORY_MAX_TURNS_PER_SESSION", "0")  # read back every turn
+    get_conn()
+    before = len(short_memory._ALL_CONNS)
+    opened = []
+
+    def work():
+        save_turn("u", "s", "user", "from a short-lived thread")
+        opened.append(get_conn())
+
+    for _ in range(5):
+        t = threading.Thread(target=work)
+        t.start()
+        t.join()
+    # each exited thread released and closed its connection
+    assert len(short_memory._ALL_CONNS) == before
+    for conn in opened:
+        try:
+            conn.execute("SELECT 1")
+        except Exception as e:
+            assert "closed" in str(e)
+        else:
+            raise AssertionError("connection of an exited thread is still open")
+    assert len(load_turns("u", "s")) == 5
@@ -0,0 +1,85 @@
+import sqlite3
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def _headers(role="analyst"):
+    return {"X-User-Role": role}
+
+
+def test_search_turns_ranks_and_filters(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "mem.db"))
+    monkeypatch.setenv("MEMORY_SHORT_CACHE_BYTES", "0")
+    from app.memory.short_memory import (
+        clear_short_memory,
+        init_short_memory,
+        save_turn,
+        search_turns,
+    )
+
+    init_short_memory()
+    save_turn("u1", "s1", "user", "How do I rotate the kafka credentials?")
+    save_turn("u1", "s1", "assistant", "Rotate kafka secrets through the vault and restart kafka consumers.")
+    save_turn("u1", "s2", "user", "What is our postgres backup policy?")
+    save_turn("u2", "s1", "user", "kafka kafka kafka")
+
+    hits = search_turns("u1", "kafka")
+    assert [h["session_id"] for h in hits] == ["s1", "s1"]
+    assert hits[0]["score"] >= hits[1]["score"]
+    assert "[kafka]" in hits[0]["snippet"].lower()
+
+    assert [h["content"] for h in search_turns("u1", "postgres", session_id="s2")] == [
+        "What is our postgres backup policy?"
+    ]
+    assert search_turns("u1", "postgres", session_id="s1") == []
+    # FTS5 syntax in user input is treated as plain words
+    assert len(search_turns("u1", 'kafka" OR NEAR(*')) == 2
+    assert search_turns("u1", "  ** ") == []
+
+    # triggers keep the index in sync with deletes
+    clear_short_memory("u1", "s1")
+    assert search_turns("u1", "kafka") == []
+
+
+def test_fts_backfilled_on_migration(tmp_path, monkeypatch):
+    db = tmp_path / "old.db"
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE turns (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT, "
+        "session_id TEXT, role TEXT, content TEXT, timestamp TEXT)"
+    )
+    conn.execute(
+        "INSERT INTO turns (user_id, session_id, role, content, timestamp) VALUES "
+        "('u', 's', 'user', 'legacy terraform question', '2030-01-01T00:00:00Z')"
+    )
+    conn.commit()
+    conn.close()
+    monkeypatch.setenv("MEMORY_DB_PATH", str(db))
+    from app.memory.short_memory import init_short_memory, search_turns
+
+    init_short_memory()
+    assert [h["content"] for h in search_turns("u", "terraform")] == ["legacy terraform question"]
+
+
+def test_search_endpoint(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "mem.db"))
+    monkeypatch.setenv("MEMORY_SHORT_ENABLED", "true")
+    from app.memory.short_memory import init_short_memory, save_turn
+
+    init_short_memory()
+    save_turn("u1", "s1", "user", "latency budget for the gateway")
+    client = TestClient(app)
+
+    r = client.get("/memory/short/search", params={"user_id": "u1", "q": "gateway"}, headers=_headers())
+    assert r.status_code == 200
+    body = r.json()
+    assert len(body["results"]) == 1
+    assert body["results"][0]["role"] == "user"
+    assert body["audit"]["memory_short_reads"] == 1
+
+    r = client.get("/memory/short/search", params={"user_id": "u1", "q": "gateway"}, headers=_headers("viewer"))
+    assert r.status_code == 403
+    r = client.get("/memory/short/search", params={"user_id": "u1", "q": ""}, headers=_headers())
+    assert r.status_code == 422
@@ -0,0 +1,105 @@
+
+from app.memory import short_memory
+from app.memory.short_memory import (
+    clear_short_memory,
+    compact_summaries,
+    load_summary,
+    save_turn,
+    start_compaction_worker,
+    stop_compaction_worker,
+    summarize_context,
+    update_summary_if_needed,
+)
+
+
+def _no_reload(*a, **k):
+    raise AssertionError("summary update must not reload the session")
+
+
+def test_rolling_summary_is_incremental_and_writes_only_on_change(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "sum.db"))
+    monkeypatch.setenv("MEMORY_SHORT_MAX_TURNS", "2")
+    monkeypatch.setenv("MEMORY_SHORT_SUMMARY_CHARS", "40")
+    turns = [("user", "first question"), ("assistant", "first answer")]
+    for role, content in turns:
+        save_turn("u", "s", role, content)
+    assert update_summary_if_needed("u", "s") is False  # threshold not passed yet
+
+    writes = []
+    real_write = short_memory._write_summary
+    monkeypatch.setattr(
+        short_memory, "_write_summary", lambda k, t: writes.append(t) or real_write(k, t)
+    )
+    monkeypatch.setattr(short_memory, "load_turns", _no_reload)
+    save_turn("u", "s", "user", "second question")
+    turns.append(("user", "second question"))
+    assert update_summary_if_needed("u", "s") is True
+    assert writes == [summarize_context(turns[-2:])]
+    assert len(writes[0]) <= 40 and writes[0].endswith("user: second question")
+    # no new turn -> unchanged summary is not rewritten
+    assert update_summary_if_needed("u", "s") is False
+    assert len(writes) == 1
+    assert load_summary("u", "s") == writes[0]
+
+
+def test_threshold_counts_only_turns_load_turns_returns(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "kept.db"))
+    monkeypatch.setenv("MEMORY_SHORT_MAX_TURNS", "2")
+    # the per-session cap keeps the session at the threshold however many turns are saved
+    monkeypatch.setenv("SHORT_MEMORY_MAX_TURNS_PER_SESSION", "2")
+    for i in range(4):
+        save_turn("u", "capped", "user", f"m{i}")
+    assert update_summary_if_needed("u", "capped") is False
+    assert load_summary("u", "capped") == ""
+
+    # turns past the retention window do not count either
+    monkeypatch.setenv("SHORT_MEMORY_MAX_TURNS_PER_SESSION", "0")
+    monkeypatch.setenv("SHORT_MEMORY_RETENTION_DAYS", "1")
+    conn = short_memory.get_conn()
+    old = ("u", "old", "user", "expired", "2000-01-01T00:00:00", 946684800)
+    conn.executemany(short_memory._INSERT_TURN, [old] * 3)
+    conn.commit()
+    save_turn("u", "old", "user", "new 1")
+    assert update_summary_if_needed("u", "old") is False
+    save_turn("u", "old", "assistant", "new 2")
+    save_turn("u", "old", "user", "new 3")
+    assert update_summary_if_needed("u", "old") is True
+    assert load_summary("u", "old") == "assistant: new 2\nuser: new 3"
+
+
+def test_clear_resets_summary_state(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "reset.db"))
+    monkeypatch.setenv("MEMORY_SHORT_MAX_TURNS", "1")
+    save_turn("u", "c", "user", "a")
+    save_turn("u", "c", "user", "b")
+    assert update_summary_if_needed("u", "c") is True
+    clear_short_memory("u", "c")
+    save_turn("u", "c", "user", "c")
+    assert update_summary_if_needed("u", "c") is False
+    assert load_summary("u", "c") == ""
+
+
+def test_llm_mode_compacts_off_the_request_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "llm.db"))
+    monkeypatch.setenv("MEMORY_SHORT_MAX_TURNS", "1")
+    monkeypatch.setenv("MEMORY_SHORT_SUMMARY_MODE", "llm")
+    monkeypatch.setenv("MEMORY_SHORT_COMPACTION_INTERVAL_SEC", "3600")
+    calls = []
+    monkeypatch.setattr(
+        short_memory,
+        "compact_summary",
+        lambda prev, window: calls.append((prev, window)) or f"compacted {len(calls)}",
+    )
+    # no startup tick: the worker stays idle for the whole interval
+    assert start_compaction_worker() is True
+    try:
+        save_turn("u", "l", "user", "hello")
+        save_turn("u", "l", "assistant", "hi there")
+        assert update_summary_if_needed("u", "l") is False
+        assert load_summary("u", "l") == ""
+        assert compact_summaries() == 1
+        assert calls == [("", "assistant: hi there")]
+        assert load_summary("u", "l") == "compacted 1"
+        assert compact_summaries() == 0  # nothing queued
+    finally:
+        stop_compaction_worker()
@@ -0,0 +1,79 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.memory.short_memory import (
+    get_conn,
+    get_sweep_stats,
+    load_turns,
+    save_turn,
+    sweep_short_memory,
+)
+from app.utils.metrics import memory_short_pruned
+
+client = TestClient(app)
+
+
+def _count(user_id: str, session_id: str) -> int:
+    return get_conn().execute(
+        "SELECT COUNT(1) FROM turns WHERE user_id=? AND session_id=?",
+        (user_id, session_id),
+    ).fetchone()[0]
+
+
+def test_reads_filter_without_deleting(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "read.db"))
+    monkeypatch.setenv("SHORT_MEMORY_MAX_TURNS_PER_SESSION", "2")
+    for i in range(4):
+        save_turn("u", "s", "user", f"m{i}")
+    assert [c for _, c in load_turns("u", "s")] == ["m2", "m3"]
+    assert load_turns._last_pruned == 0
+    assert _count("u", "s") == 4
+
+
+def test_sweeper_prunes_in_batches_and_counts_by_reason(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "sweep.db"))
+    for i in range(7):
+        save_turn("u", "a", "user", f"a{i}")
+    save_turn("u", "b", "user", "b0")
+    conn = get_conn()
+    # age the first two turns of session a past the retention window
+    old = int(time.time()) - 3 * 86400
+    conn.execute("UPDATE turns SET ts=? WHERE content IN ('a0', 'a1')", (old,))
+    conn.commit()
+    monkeypatch.setenv("SHORT_MEMORY_RETENTION_DAYS", "1")
+    monkeypatch.setenv("SHORT_MEMORY_MAX_TURNS_PER_SESSION", "3")
+
+    retention_before = memory_short_pruned.labels(reason="retention")._value.get()
+    cap_before = memory_short_pruned.labels(reason="cap")._value.get()
+    pruned = sweep_short_memory(batch_size=1)
+    assert pruned == {"retention": 2, "cap": 2}
+    assert [c for _, c in load_turns("u", "a")] == ["a4", "a5", "a6"]
+    assert _count("u", "a") == 3 and _count("u", "b") == 1
+    assert memory_short_pruned.labels(reason="retention")._value.get() - retention_before == 2
+    assert memory_short_pruned.labels(reason="cap")._value.get() - cap_before == 2
+    assert sweep_short_memory() == {"retention": 0, "cap": 0}
+
+    r = client.get("/memory/status", headers={"X-User-Role": "admin"})
+    sweep = r.json()["short_memory"]["retention_sweep"]
+    assert sweep == get_sweep_stats() and sweep["sweeps"] >= 2
+
+
+def test_lifespan_skips_workers_of_disabled_memory(tmp_path, monkeypatch):
+    from app.memory import long_memory, short_memory
+
+    monkeypatch.setenv("MEMORY_SHORT_ENABLED", "false")
+    monkeypatch.setenv("MEMORY_LONG_ENABLED", "false")
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "short.db"))
+    monkeypatch.setenv("DB_URL", f"sqlite:///{tmp_path / 'audit.db'}")
+    with TestClient(app):
+        for worker in (
+            short_memory._sweep_worker,
+            short_memory._flush_worker,
+            short_memory._compaction_worker,
+            long_memory._backfill_worker,
+            long_memory._sweep_worker,
+        ):
+            assert worker is None or not worker.running
+    assert not (tmp_path / "short.db").exists()
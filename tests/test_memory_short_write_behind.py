@@ -0,0 +1,79 @@
+import time
+
+from app.memory import short_memory
+from app.memory.short_memory import (
+    clear_short_memory,
+    flush_short_memory,
+    get_conn,
+    load_turns,
+    save_turn,
+    start_write_behind,
+    stop_write_behind,
+)
+
+
+def _committed(session_id: str) -> int:
+    return get_conn().execute(
+        "SELECT COUNT(1) FROM turns WHERE session_id=?", (session_id,)
+    ).fetchone()[0]
+
+
+def _enable(monkeypatch, tmp_path, interval_ms="60000", max_rows="256"):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "wb.db"))
+    monkeypatch.setenv("MEMORY_SHORT_WRITE_BEHIND", "true")
+    monkeypatch.setenv("MEMORY_SHORT_FLUSH_INTERVAL_MS", interval_ms)
+    monkeypatch.setenv("MEMORY_SHORT_FLUSH_MAX_ROWS", max_rows)
+    # the flusher's first tick is a full interval away, so flushes below are explicit
+    assert start_write_behind() is True
+
+
+def test_buffered_turns_are_read_back_and_flushed_in_one_batch(tmp_path, monkeypatch):
+    _enable(monkeypatch, tmp_path)
+    try:
+        save_turn("u", "s", "user", "hello")
+        save_turn("u", "s", "assistant", "hi")
+        assert _committed("s") == 0
+        assert load_turns("u", "s") == [("user", "hello"), ("assistant", "hi")]
+        assert flush_short_memory() == 2
+        assert _committed("s") == 2
+        assert load_turns("u", "s") == [("user", "hello"), ("assistant", "hi")]
+    finally:
+        stop_write_behind()
+
+
+def test_cap_applies_across_db_and_buffer_and_clear_drops_buffer(tmp_path, monkeypatch):
+    _enable(monkeypatch, tmp_path)
+    monkeypatch.setenv("SHORT_MEMORY_MAX_TURNS_PER_SESSION", "3")
+    try:
+        for i in range(2):
+            save_turn("u", "c", "user", f"m{i}")
+        flush_short_memory()
+        for i in range(2, 4):
+            save_turn("u", "c", "user", f"m{i}")
+        assert [c for _, c in load_turns("u", "c")] == ["m1", "m2", "m3"]
+        clear_short_memory("u", "c")
+        assert load_turns("u", "c") == []
+        assert flush_short_memory() == 0
+    finally:
+        stop_write_behind()
+
+
+def test_max_rows_triggers_flush_and_stop_drains(tmp_path, monkeypatch):
+    _enable(monkeypatch, tmp_path, max_rows="2")
+    save_turn("u", "m", "user", "a")
+    save_turn("u", "m", "user", "b")  # reaches the threshold and wakes the flusher
+    deadline = time.time() + 5
+    while _committed("m") < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert _committed("m") == 2
+    save_turn("u", "m", "user", "c")
+    stop_write_behind()
+    assert _committed("m") == 3
+    assert not short_memory._PENDING_TURNS
+
+
+def test_writes_through_without_running_flusher(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "wt.db"))
+    monkeypatch.setenv("MEMORY_SHORT_WRITE_BEHIND", "true")
+    save_turn("u", "w", "user", "direct")
+    assert _committed("w") == 1
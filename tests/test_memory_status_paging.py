@@ -0,0 +1,84 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.memory import short_memory, status
+from app.memory.short_memory import list_sessions, save_turn, update_summary_if_needed
+from app.memory.status import invalidate_status_snapshot
+
+client = TestClient(app)
+ADMIN = {"X-User-Role": "admin"}
+
+
+def _seed(monkeypatch, tmp_path):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "status.db"))
+    monkeypatch.setenv("MEMORY_SHORT_MAX_TURNS", "1")
+    for u in ("a", "b"):
+        for s in ("s1", "s2", "s3"):
+            save_turn(u, s, "user", "q")
+    for _ in range(4):
+        save_turn("b", "s2", "assistant", "more")
+    save_turn("a", "s1", "assistant", "a")
+    assert update_summary_if_needed("a", "s1") is True
+    invalidate_status_snapshot()
+
+
+def test_status_paginates_sessions_with_cursor(tmp_path, monkeypatch):
+    _seed(monkeypatch, tmp_path)
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 4}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get("/memory/status", params=params, headers=ADMIN)
+        assert r.status_code == 200
+        short = r.json()["short_memory"]
+        seen.extend((x["user_id"], x["session_id"], x["turns"], x["summary"]) for x in short["sessions"])
+        cursor = short["next_cursor"]
+        if not cursor:
+            break
+    assert [(u, s) for u, s, _, _ in seen] == [(u, s) for u in "ab" for s in ("s1", "s2", "s3")]
+    assert ("a", "s1", 2, True) in seen and ("b", "s2", 5, False) in seen
+
+    short = r.json()["short_memory"]
+    assert short["sessions_total"] == 6 and short["turns_total"] == 11
+    assert short["heavy_sessions"][0] == {"user_id": "b", "session_id": "s2", "turns": 5}
+
+    assert client.get("/memory/status", params={"cursor": "!!"}, headers=ADMIN).status_code == 400
+
+
+def test_status_aggregates_are_cached_within_ttl(tmp_path, monkeypatch):
+    _seed(monkeypatch, tmp_path)
+    monkeypatch.setenv("MEMORY_STATUS_TTL_SEC", "3600")
+    first = client.get("/memory/status", headers=ADMIN).json()
+    save_turn("c", "s1", "user", "new session")
+    second = client.get("/memory/status", headers=ADMIN).json()
+    # the page is live, the whole-store aggregates come from the cached snapshot
+    assert len(second["short_memory"]["sessions"]) == 7
+    assert second["short_memory"]["sessions_total"] == first["short_memory"]["sessions_total"]
+    assert second["snapshot"]["computed_at"] == first["snapshot"]["computed_at"]
+
+    # past the TTL the stale snapshot is served while one rebuild runs off the request path
+    monkeypatch.setattr(status, "_SNAPSHOT_AT", status._SNAPSHOT_AT - 7200)
+    third = client.get("/memory/status", headers=ADMIN).json()
+    assert third["short_memory"]["sessions_total"] == 6
+    assert third["snapshot"]["computed_at"] == first["snapshot"]["computed_at"]
+    status._refresh_thread.join(5)
+    fourth = client.get("/memory/status", headers=ADMIN).json()
+    assert fourth["short_memory"]["sessions_total"] == 7
+    assert fourth["snapshot"]["age_sec"] < 3600
+
+
+def test_session_page_is_one_aggregate_query(tmp_path, monkeypatch):
+    _seed(monkeypatch, tmp_path)
+    statements = []
+    short_memory.get_conn().set_trace_callback(statements.append)
+    try:
+        page = list_sessions(2, after=("a", "s2"))
+    finally:
+        short_memory.get_conn().set_trace_callback(None)
+    assert [(p["user_id"], p["session_id"]) for p in page] == [("a", "s3"), ("b", "s1")]
+    assert len(statements) == 1 and "LEFT JOIN summaries" in statements[0]
+    # the cursor page seeks on the index instead of scanning from the first session
+    plan = short_memory.get_conn().execute("EXPLAIN QUERY PLAN " + statements[0]).fetchall()
+    assert any("SEARCH t USING COVERING INDEX idx_turns_session" in row[-1] for row in plan)